@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable, Tuple, TypeVar
+
+from app.cloud_services.database import SQLiteDatabase, get_database_client
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class AsyncDatabase:
+    """
+    Awaitable facade over SQLiteDatabase.
+
+    Every call runs on a dedicated, bounded thread pool so a slow query never
+    blocks the event loop. Each worker thread gets its own pooled read
+    connection; writes still serialize on the database's single writer.
+    """
+
+    def __init__(self, db: SQLiteDatabase, max_workers: int = 4, max_pending: int = 256):
+        self.db = db
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sqlite")
+        # Callers beyond max_pending wait here instead of growing the executor queue
+        self._slots = asyncio.Semaphore(max_pending)
+
+        self._stats_lock = threading.Lock()
+        self._waiting = 0
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._busy_total = 0.0
+
+    async def _submit(self, fn: Callable[..., T], *args) -> T:
+        """Run fn(*args) on the database pool and record queueing metrics"""
+        submitted = time.perf_counter()
+        with self._stats_lock:
+            self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            with self._stats_lock:
+                self._waiting -= 1
+
+        started_call = False
+
+        def call():
+            nonlocal started_call
+            started = time.perf_counter()
+            wait = started - submitted
+            with self._stats_lock:
+                started_call = True
+                self._queued -= 1
+                self._active += 1
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+            ok = False
+            try:
+                result = fn(*args)
+                ok = True
+                return result
+            finally:
+                with self._stats_lock:
+                    self._active -= 1
+                    self._completed += 1
+                    self._failed += 0 if ok else 1
+                    self._busy_total += time.perf_counter() - started
+
+        loop = asyncio.get_running_loop()
+
+        def done(_):
+            # Runs when the call finishes, or when it is cancelled before starting
+            with self._stats_lock:
+                if not started_call:
+                    self._queued -= 1
+            try:
+                loop.call_soon_threadsafe(self._slots.release)
+            except RuntimeError:
+                pass  # loop already closed at shutdown
+
+        with self._stats_lock:
+            self._queued += 1
+        try:
+            future = self._executor.submit(call)
+        except BaseException:
+            with self._stats_lock:
+                self._queued -= 1
+            self._slots.release()
+            raise
+        # The slot is held until the call itself ends, not until this awaiter leaves
+        future.add_done_callback(done)
+        return await asyncio.wrap_future(future)
+
+    async def run_read(self, fn: Callable[..., T], *args) -> T:
+        """Run fn(conn, *args) with a pooled read connection"""
+        def call():
+            with self.db.reader() as conn:
+                return fn(conn, *args)
+        return await self._submit(call)
+
+    async def run_write(self, fn: Callable[..., T], *args) -> T:
+        """Run fn(conn, *args) inside a single write transaction"""
+        def call():
+            with self.db.writer() as conn:
+                return fn(conn, *args)
+        return await self._submit(call)
+
+    async def get_document(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Get a document by ID"""
+        return await self._submit(self.db.get_document, collection, doc_id)
+
+    async def set_document(self, collection: str, doc_id: str, data: Dict[str, Any]):
+        """Set a document"""
+        return await self._submit(self.db.set_document, collection, doc_id, data)
+
+    async def update_document(self, collection: str, doc_id: str, updates: Dict[str, Any]):
+        """Update a document"""
+        return await self._submit(self.db.update_document, collection, doc_id, updates)
+
+    async def set_documents(self, collection: str, docs: List[Dict[str, Any]]):
+        """Upsert many documents in one transaction"""
+        return await self._submit(self.db.set_documents, collection, docs)
+    
+    async def update_document_returning(
+        self,
+        collection: str,
+        doc_id: str,
+        updates: Dict[str, Any],
+        conditions: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Conditionally update a document and return the new row"""
+        return await self._submit(self.db.update_document_returning, collection, doc_id, updates, conditions)
+    
+    async def update_documents(
+        self,
+        collection: str,
+        updates: List[Tuple[str, Dict[str, Any]]],
+        conditions: Optional[Dict[str, Dict[str, Any]]] = None,
+        match: Optional[Dict[str, Any]] = None
+    ) -> set:
+        """Apply many partial updates in one transaction"""
+        return await self._submit(self.db.update_documents, collection, updates, conditions, match)
+    
+    async def query_collection(
+        self,
+        collection: str,
+        where_clause: str = "",
+        params: tuple = (),
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        columns: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Query a collection"""
+        return await self._submit(
+            self.db.query_collection, collection, where_clause, params, order_by, limit, offset, columns
+        )
+
+    async def count_collection(self, collection: str, where_clause: str = "", params: tuple = ()) -> int:
+        """Count documents matching a filter"""
+        return await self._submit(self.db.count_collection, collection, where_clause, params)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool sizing metrics: queue depth, in-flight work and wait times"""
+        with self._stats_lock:
+            completed = self._completed
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "queue_depth": self._waiting + self._queued,
+                "waiting_for_slot": self._waiting,
+                "queued": self._queued,
+                "active": self._active,
+                "completed": completed,
+                "failed": self._failed,
+                "avg_wait_ms": (self._wait_total / completed * 1000) if completed else 0.0,
+                "max_wait_ms": self._wait_max * 1000,
+                "avg_run_ms": (self._busy_total / completed * 1000) if completed else 0.0,
+            }
+
+    def shutdown(self):
+        """Wait for in-flight queries and stop the worker threads"""
+        self._executor.shutdown(wait=True)
+
+# Global async database instance
+async_db = AsyncDatabase(
+    get_database_client(),
+    max_workers=settings.DB_POOL_WORKERS,
+    max_pending=settings.DB_POOL_MAX_PENDING,
+)
+
+def get_async_database_client() -> AsyncDatabase:
+    """Returns the awaitable database client"""
+    return async_db
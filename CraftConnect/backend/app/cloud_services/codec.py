@@ -0,0 +1,103 @@
+import json
+import logging
+import sqlite3
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Sequence
+
+from app.config.settings import settings
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+class StdlibJSONCodec:
+    """json module codec; datetimes are handled by the default hook instead of a pre-walk"""
+
+    name = "json"
+
+    @staticmethod
+    def _default(value: Any) -> Any:
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value, default=self._default)
+
+    def loads(self, text: str) -> Any:
+        return json.loads(text)
+
+class OrjsonCodec:
+    """orjson codec; serializes datetimes natively in the same ISO format"""
+
+    name = "orjson"
+
+    def __init__(self):
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, value: Any) -> str:
+        # Stored as TEXT so SQLite's json functions keep working on the columns
+        return orjson.dumps(value, option=self._options).decode()
+
+    def loads(self, text: str) -> Any:
+        return orjson.loads(text)
+
+def _select_codec(name: str):
+    """Pick a codec by name; 'auto' prefers orjson when it is installed"""
+    if name in ("auto", "orjson") and orjson is not None:
+        return OrjsonCodec()
+    if name == "orjson":
+        logger.warning("DB_JSON_CODEC=orjson but orjson is not installed, using json")
+    elif name not in ("auto", "json"):
+        raise ValueError(f"Unknown DB_JSON_CODEC: {name}")
+    return StdlibJSONCodec()
+
+codec = _select_codec(settings.DB_JSON_CODEC)
+
+def encode_value(value: Any) -> Any:
+    """Convert a Python value to what is stored in a column"""
+    if isinstance(value, (list, dict)):
+        return codec.dumps(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def encode_values(data: Dict[str, Any]) -> Dict[str, Any]:
+    """encode_value applied to every field of a document"""
+    return {key: encode_value(value) for key, value in data.items()}
+
+def row_decoder(columns: Sequence[str], json_fields: Iterable[str]) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+    """
+    Build a row -> dict function for a fixed result shape.
+
+    The set of JSON columns to parse is worked out once per query from the
+    selected columns, so a projection only pays for the fields it returns.
+    Values that fail to parse are returned as stored.
+    """
+    names = tuple(columns)
+    wanted = set(json_fields)
+    positions = tuple(i for i, name in enumerate(names) if name in wanted)
+    loads = codec.loads
+
+    if not positions:
+        return lambda row: dict(zip(names, row))
+
+    def decode(row: Sequence[Any]) -> Dict[str, Any]:
+        values = list(row)
+        for i in positions:
+            raw = values[i]
+            if raw:
+                try:
+                    values[i] = loads(raw)
+                except (ValueError, TypeError):
+                    pass
+        return dict(zip(names, values))
+
+    return decode
+
+def cursor_decoder(cursor: sqlite3.Cursor, json_fields: Iterable[str]) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+    """row_decoder for the result shape of an executed cursor"""
+    return row_decoder([column[0] for column in cursor.description], json_fields)
@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from app.cloud_services.async_database import AsyncDatabase, get_async_database_client
+from app.cloud_services.codec import codec
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Legacy rows recompressed per compaction pass
+RECOMPRESS_BATCH = 500
+
+def compress_text(text: str) -> bytes:
+    """Compress serialized JSON for the SQLite tier"""
+    return zlib.compress(text.encode("utf-8"))
+
+def payload_text(data: Any, encoding: str) -> str:
+    """Serialized JSON of a stored payload, compressed or legacy plain text"""
+    if encoding == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    return data if isinstance(data, str) else bytes(data).decode("utf-8")
+
+class MemoryTier:
+    """
+    LRU of decoded analyses bounded by entry count and bytes, where an
+    entry's size is the length of its serialized JSON.
+
+    Each entry carries its own expiry, so a value promoted from SQLite
+    never outlives its row's TTL. Used from the event loop thread only.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, int, dict]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, size, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: dict, size: int, ttl: float):
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, size, value)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+class CopilotCache:
+    """
+    Two-tier cache for /copilot/analyze results keyed by image hash.
+
+    Lookups try the in-memory LRU first, then the copilot_cache table;
+    SQLite hits are promoted into memory. Writes go to both tiers. A
+    background task deletes expired rows, recompresses legacy plain-JSON
+    rows and evicts the oldest rows beyond the entry and byte limits.
+    """
+
+    def __init__(
+        self,
+        db: AsyncDatabase,
+        ttl_seconds: float = 7 * 24 * 3600,
+        memory_max_entries: int = 1024,
+        memory_max_bytes: int = 16 * 1024 * 1024,
+        db_max_entries: int = 100000,
+        db_max_bytes: int = 256 * 1024 * 1024,
+        compact_interval: float = 600.0
+    ):
+        self.db = db
+        self.ttl_seconds = ttl_seconds
+        self.db_max_entries = db_max_entries
+        self.db_max_bytes = db_max_bytes
+        self.compact_interval = compact_interval
+        self.memory = MemoryTier(memory_max_entries, memory_max_bytes)
+        self._db_hits = 0
+        self._db_misses = 0
+        self._db_writes = 0
+        self._last_compaction: Dict[str, Any] = {}
+        self._task: asyncio.Task = None
+
+    def _cutoff(self) -> str:
+        return (datetime.utcnow() - timedelta(seconds=self.ttl_seconds)).isoformat()
+
+    async def get(self, image_hash: str) -> Optional[dict]:
+        """Cached analysis for an image hash, or None"""
+        value = self.memory.get(image_hash)
+        if value is not None:
+            return value
+
+        def _fetch(conn):
+            return conn.execute(
+                "SELECT data, encoding, created_at FROM copilot_cache WHERE image_hash = ? AND created_at >= ?",
+                (image_hash, self._cutoff())
+            ).fetchone()
+
+        row = await self.db.run_read(_fetch)
+        if row is None:
+            self._db_misses += 1
+            return None
+        self._db_hits += 1
+
+        text = payload_text(row["data"], row["encoding"])
+        value = codec.loads(text)
+        age = (datetime.utcnow() - datetime.fromisoformat(row["created_at"])).total_seconds()
+        self.memory.put(image_hash, value, len(text), self.ttl_seconds - age)
+        return value
+
+    async def set(self, image_hash: str, data: dict):
+        """Store an analysis in both tiers"""
+        text = codec.dumps(data)
+        payload = compress_text(text)
+
+        def _write(conn):
+            conn.execute("""
+                INSERT OR REPLACE INTO copilot_cache (image_hash, data, encoding, size, created_at)
+                VALUES (?, ?, 'zlib', ?, ?)
+            """, (image_hash, payload, len(payload), datetime.utcnow().isoformat()))
+
+        await self.db.run_write(_write)
+        self._db_writes += 1
+        self.memory.put(image_hash, data, len(text), self.ttl_seconds)
+
+    def _compact(self, conn, cutoff: str) -> Dict[str, int]:
+        expired = conn.execute("DELETE FROM copilot_cache WHERE created_at < ?", (cutoff,)).rowcount
+
+        legacy = conn.execute(
+            "SELECT image_hash, data FROM copilot_cache WHERE encoding != 'zlib' LIMIT ?", (RECOMPRESS_BATCH,)
+        ).fetchall()
+        recompressed = []
+        for row in legacy:
+            payload = compress_text(payload_text(row["data"], "json"))
+            recompressed.append((payload, len(payload), row["image_hash"]))
+        conn.executemany(
+            "UPDATE copilot_cache SET data = ?, encoding = 'zlib', size = ? WHERE image_hash = ?", recompressed
+        )
+
+        # Oldest first: keep the newest rows that fit both limits
+        evicted = conn.execute("""
+            DELETE FROM copilot_cache WHERE image_hash IN (
+                SELECT image_hash FROM (
+                    SELECT image_hash,
+                           ROW_NUMBER() OVER newest AS position,
+                           SUM(size) OVER newest AS kept_bytes
+                    FROM copilot_cache
+                    WINDOW newest AS (ORDER BY created_at DESC, image_hash)
+                )
+                WHERE position > ? OR kept_bytes > ?
+            )
+        """, (self.db_max_entries, self.db_max_bytes)).rowcount
+
+        return {"expired": expired, "recompressed": len(recompressed), "evicted": evicted}
+
+    async def compact(self) -> Dict[str, int]:
+        """Run one compaction pass over the SQLite tier"""
+        result = await self.db.run_write(self._compact, self._cutoff())
+        self._last_compaction = {**result, "at": datetime.utcnow().isoformat()}
+        if any(result.values()):
+            logger.info(
+                f"copilot_cache compacted: {result['expired']} expired, "
+                f"{result['recompressed']} recompressed, {result['evicted']} evicted"
+            )
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics for both tiers"""
+        db_lookups = self._db_hits + self._db_misses
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "memory": self.memory.stats(),
+            "sqlite": {
+                "hits": self._db_hits,
+                "misses": self._db_misses,
+                "hit_rate": round(self._db_hits / db_lookups, 4) if db_lookups else 0.0,
+                "writes": self._db_writes,
+                "max_entries": self.db_max_entries,
+                "max_bytes": self.db_max_bytes,
+                "last_compaction": self._last_compaction,
+            },
+        }
+
+    async def _run(self):
+        while True:
+            try:
+                await self.compact()
+            except Exception as e:
+                logger.error(f"copilot_cache compaction failed: {e}", exc_info=True)
+            await asyncio.sleep(self.compact_interval)
+
+    async def start(self):
+        """Start the periodic compaction task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("copilot_cache compactor started")
+
+    async def stop(self):
+        """Stop the compaction task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+# Create singleton instance
+copilot_cache = CopilotCache(
+    get_async_database_client(),
+    ttl_seconds=settings.COPILOT_CACHE_TTL_SECONDS,
+    memory_max_entries=settings.COPILOT_CACHE_MEMORY_MAX_ENTRIES,
+    memory_max_bytes=settings.COPILOT_CACHE_MEMORY_MAX_BYTES,
+    db_max_entries=settings.COPILOT_CACHE_DB_MAX_ENTRIES,
+    db_max_bytes=settings.COPILOT_CACHE_DB_MAX_BYTES,
+    compact_interval=settings.COPILOT_CACHE_COMPACT_INTERVAL_SECONDS,
+)
+
+async def set_cached_analysis(image_hash: str, data: dict):
+    """Saves analysis data to the cache"""
+    await copilot_cache.set(image_hash, data)
+
+async def get_cached_analysis(image_hash: str) -> Optional[dict]:
+    """Retrieves analysis data from the cache"""
+    return await copilot_cache.get(image_hash)
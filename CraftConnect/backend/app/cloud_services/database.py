@@ -1,118 +1,180 @@
 import sqlite3
-import json
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Iterator, Tuple
 from datetime import datetime
 from pathlib import Path
 
+from app.cloud_services.codec import encode_values, row_decoder, cursor_decoder
+from app.cloud_services.migrations import apply_migrations
+
 logger = logging.getLogger(__name__)
 
+# Connection tuning applied once per pooled connection
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KB = 16000          # page cache per connection (negative PRAGMA value = KiB)
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+
+JSON_FIELDS = ['materials', 'colors', 'tags', 'images', 'pricing', 'dimensions']
+
+# Product list fields mirrored into indexed junction tables: field -> (table, column)
+ATTRIBUTE_TABLES = {
+    'tags': ('product_tags', 'tag'),
+    'materials': ('product_materials', 'material'),
+    'colors': ('product_colors', 'color'),
+}
+
+# Column order shared by the single and bulk product upserts
+PRODUCT_COLUMNS = (
+    'product_id', 'user_id', 'title', 'description', 'category', 'materials', 'colors', 'tags',
+    'story', 'images', 'pricing', 'dimensions', 'status', 'created_at', 'updated_at',
+    'views_count', 'likes_count',
+)
+
+# Upsert rather than REPLACE: REPLACE deletes the old row without firing
+# delete triggers, which would desync products_fts
+PRODUCT_UPSERT_SQL = f"""
+    INSERT INTO products ({", ".join(PRODUCT_COLUMNS)})
+    VALUES ({", ".join("?" * len(PRODUCT_COLUMNS))})
+    ON CONFLICT (product_id) DO UPDATE SET
+        {", ".join(f"{c} = excluded.{c}" for c in PRODUCT_COLUMNS[1:])},
+        version = products.version + 1
+"""
+
+def _set_clause(collection: str, keys) -> str:
+    """SET clause for a partial update; product edits also bump the row version"""
+    clause = ", ".join(f"{key} = ?" for key in keys)
+    if collection == "products":
+        clause += ", version = version + 1"
+    return clause
+
+def _product_row(processed: Dict[str, Any]) -> tuple:
+    """Bind values for PRODUCT_UPSERT_SQL from an encoded product document"""
+    row = [processed.get(column) for column in PRODUCT_COLUMNS]
+    row[-2] = processed.get('views_count', 0)
+    row[-1] = processed.get('likes_count', 0)
+    return tuple(row)
+
+def normalize_attribute(value: str) -> str:
+    """Canonical form of a tag/material/color for storage and filtering"""
+    return value.strip().lower()
+
+def decode_document(row: sqlite3.Row) -> Dict[str, Any]:
+    """Convert a result row to a dict, parsing its JSON fields"""
+    return row_decoder(row.keys(), JSON_FIELDS)(row)
+
 class SQLiteDatabase:
     def __init__(self, db_path: str = "craftconnect.db"):
         self.db_path = db_path
+        # One long-lived read connection per thread plus a single shared writer.
+        # WAL lets readers proceed while the writer holds its lock.
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
         self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection and apply the per-connection PRAGMAs"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,  # explicit BEGIN/COMMIT in writer()
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """Return this thread's read connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow the calling thread's pooled read connection"""
+        yield self._reader()
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run a block inside a write transaction on the shared writer connection.
+
+        Nested calls on the same thread join the outer transaction, so helpers
+        like set_document can be composed into a larger atomic unit.
+        """
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            conn = self._writer
+            if self._write_depth:
+                self._write_depth += 1
+                try:
+                    yield conn
+                finally:
+                    self._write_depth -= 1
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            self._write_depth = 1
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+            finally:
+                self._write_depth = 0
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        self._local = threading.local()
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
     
     def _init_database(self):
-        """Initialize SQLite database with required tables"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id TEXT PRIMARY KEY,
-                    email TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    name TEXT NOT NULL,
-                    phone TEXT,
-                    location TEXT,
-                    bio TEXT,
-                    avatar_url TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS products (
-                    product_id TEXT PRIMARY KEY,
-                    user_id TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    description TEXT NOT NULL,
-                    category TEXT NOT NULL,
-                    materials TEXT,
-                    colors TEXT,
-                    tags TEXT,
-                    story TEXT,
-                    images TEXT,
-                    pricing TEXT,
-                    dimensions TEXT,
-                    status TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    views_count INTEGER DEFAULT 0,
-                    likes_count INTEGER DEFAULT 0,
-                    FOREIGN KEY (user_id) REFERENCES users (user_id)
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS copilot_cache (
-                    image_hash TEXT PRIMARY KEY,
-                    data TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS product_likes (
-                    product_id TEXT,
-                    user_id TEXT,
-                    liked_at TEXT,
-                    PRIMARY KEY (product_id, user_id)
-                )
-            """)
-            
-            conn.commit()
+        """Bring the database schema up to date by applying pending migrations"""
+        with self._write_lock:
+            self._writer = self._connect()
+            # journal_mode is persistent in the database file, so set it once here
+            self._writer.execute("PRAGMA journal_mode=WAL")
+            apply_migrations(self._writer)
     
     def get_document(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
         """Get a document by ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.reader() as conn:
             cursor = conn.execute(f"SELECT * FROM {collection} WHERE {collection[:-1]}_id = ?", (doc_id,))
             row = cursor.fetchone()
             if row:
-                data = dict(row)
-                # Parse JSON fields
-                for field in ['materials', 'colors', 'tags', 'images', 'pricing', 'dimensions']:
-                    if field in data and data[field]:
-                        try:
-                            data[field] = json.loads(data[field])
-                        except:
-                            pass
-                return data
+                return cursor_decoder(cursor, JSON_FIELDS)(row)
             return None
     
     def set_document(self, collection: str, doc_id: str, data: Dict[str, Any]):
         """Set a document"""
-        def serialize_value(value):
-            """Recursively serialize values, converting datetime to ISO format"""
-            if isinstance(value, datetime):
-                return value.isoformat()
-            elif isinstance(value, dict):
-                return {k: serialize_value(v) for k, v in value.items()}
-            elif isinstance(value, list):
-                return [serialize_value(item) for item in value]
-            else:
-                return value
+        # Lists/dicts become JSON strings; datetimes become ISO strings
+        processed_data = encode_values(data)
         
-        # Convert lists/dicts to JSON strings, handling datetime objects
-        processed_data = {}
-        for key, value in data.items():
-            serialized = serialize_value(value)
-            if isinstance(serialized, (list, dict)):
-                processed_data[key] = json.dumps(serialized)
-            else:
-                processed_data[key] = serialized
-        
-        with sqlite3.connect(self.db_path) as conn:
+        with self.writer() as conn:
             if collection == "users":
                 conn.execute("""
                     INSERT OR REPLACE INTO users 
@@ -131,85 +193,223 @@ class SQLiteDatabase:
                     processed_data.get('updated_at')
                 ))
             elif collection == "products":
-                conn.execute("""
-                    INSERT OR REPLACE INTO products 
-                    (product_id, user_id, title, description, category, materials, colors, tags, 
-                     story, images, pricing, dimensions, status, created_at, updated_at, views_count, likes_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    processed_data.get('product_id'),
-                    processed_data.get('user_id'),
-                    processed_data.get('title'),
-                    processed_data.get('description'),
-                    processed_data.get('category'),
-                    processed_data.get('materials'),
-                    processed_data.get('colors'),
-                    processed_data.get('tags'),
-                    processed_data.get('story'),
-                    processed_data.get('images'),
-                    processed_data.get('pricing'),
-                    processed_data.get('dimensions'),
-                    processed_data.get('status'),
-                    processed_data.get('created_at'),
-                    processed_data.get('updated_at'),
-                    processed_data.get('views_count', 0),
-                    processed_data.get('likes_count', 0)
-                ))
-            conn.commit()
+                conn.execute(PRODUCT_UPSERT_SQL, _product_row(processed_data))
+                self._sync_attributes(conn, doc_id, data)
     
     def update_document(self, collection: str, doc_id: str, updates: Dict[str, Any]):
         """Update a document"""
         if not updates:
             return
         
-        def serialize_value(value):
-            """Recursively serialize values, converting datetime to ISO format"""
-            if isinstance(value, datetime):
-                return value.isoformat()
-            elif isinstance(value, dict):
-                return {k: serialize_value(v) for k, v in value.items()}
-            elif isinstance(value, list):
-                return [serialize_value(item) for item in value]
-            else:
-                return value
-        
         # Convert lists/dicts to JSON strings
-        processed_updates = {}
-        for key, value in updates.items():
-            serialized = serialize_value(value)
-            if isinstance(serialized, (list, dict)):
-                processed_updates[key] = json.dumps(serialized)
-            else:
-                processed_updates[key] = serialized
+        processed_updates = encode_values(updates)
         
-        set_clause = ", ".join([f"{key} = ?" for key in processed_updates.keys()])
+        set_clause = _set_clause(collection, processed_updates)
         values = list(processed_updates.values()) + [doc_id]
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self.writer() as conn:
             conn.execute(f"UPDATE {collection} SET {set_clause} WHERE {collection[:-1]}_id = ?", values)
-            conn.commit()
+            if collection == "products":
+                self._sync_attributes(conn, doc_id, updates)
+    
+    def update_document_returning(
+        self,
+        collection: str,
+        doc_id: str,
+        updates: Dict[str, Any],
+        conditions: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Conditionally update a document and return the new row
+        
+        A single UPDATE ... RETURNING statement: the row only changes when
+        every column in conditions matches, e.g. {"user_id": owner,
+        "version": 3}.
+        
+        Returns:
+            The updated document, or None if no row matched
+        """
+        processed_updates = encode_values(updates)
+        conditions = conditions or {}
+        where_clause = " AND ".join([f"{collection[:-1]}_id = ?"] + [f"{key} = ?" for key in conditions])
+        values = list(processed_updates.values()) + [doc_id] + list(conditions.values())
+        
+        with self.writer() as conn:
+            cursor = conn.execute(
+                f"UPDATE {collection} SET {_set_clause(collection, processed_updates)} "
+                f"WHERE {where_clause} RETURNING *",
+                values
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return None
+            if collection == "products":
+                self._sync_attributes(conn, doc_id, updates)
+            return cursor_decoder(cursor, JSON_FIELDS)(rows[0])
+    
+    def set_documents(self, collection: str, docs: List[Dict[str, Any]]):
+        """
+        Upsert many products in one transaction with executemany
+        
+        Args:
+            collection: Table name (only "products" supports bulk writes)
+            docs: Documents keyed like set_document's data, each with product_id
+        """
+        if collection != "products":
+            raise ValueError(f"Bulk writes are not supported for {collection}")
+        if not docs:
+            return
+        
+        rows = [_product_row(encode_values(doc)) for doc in docs]
+        with self.writer() as conn:
+            conn.executemany(PRODUCT_UPSERT_SQL, rows)
+            self._sync_attributes_many(conn, [(doc['product_id'], doc) for doc in docs])
+    
+    def update_documents(
+        self,
+        collection: str,
+        updates: List[Tuple[str, Dict[str, Any]]],
+        conditions: Optional[Dict[str, Dict[str, Any]]] = None,
+        match: Optional[Dict[str, Any]] = None
+    ) -> set:
+        """
+        Apply many partial updates in one transaction
+        
+        Updates touching the same set of fields share one executemany call,
+        limited to the documents that exist and satisfy match when the
+        transaction starts. Documents listed in conditions are guarded (e.g.
+        by version) and run as individual statements in the same transaction
+        so each outcome is known.
+        
+        Args:
+            collection: Table name
+            updates: (doc_id, fields) pairs
+            conditions: doc_id -> columns that must match for that update
+            match: Columns every document must match (e.g. the owner)
+            
+        Returns:
+            IDs of the documents that were updated
+        """
+        conditions = conditions or {}
+        match = encode_values(match or {})
+        groups: Dict[Tuple[str, ...], List[tuple]] = {}
+        guarded: List[Tuple[str, Dict[str, Any], Dict[str, Any]]] = []
+        for doc_id, fields in updates:
+            if not fields:
+                continue
+            processed = encode_values(fields)
+            if doc_id in conditions:
+                guarded.append((doc_id, processed, conditions[doc_id]))
+                continue
+            keys = tuple(sorted(processed))
+            groups.setdefault(keys, []).append(tuple(processed[k] for k in keys) + (doc_id,))
+        
+        id_column = f"{collection[:-1]}_id"
+        applied: set = set()
+        if not groups and not guarded:
+            return applied
+        
+        match_clause = "".join(f" AND {key} = ?" for key in match)
+        with self.writer() as conn:
+            # BEGIN IMMEDIATE holds the write lock, so rows matched here are the rows updated below
+            doc_ids = [row[-1] for rows in groups.values() for row in rows]
+            if doc_ids:
+                placeholders = ", ".join("?" * len(doc_ids))
+                applied = {row[0] for row in conn.execute(
+                    f"SELECT {id_column} FROM {collection} WHERE {id_column} IN ({placeholders}){match_clause}",
+                    doc_ids + list(match.values())
+                )}
+            for keys, rows in groups.items():
+                rows = [row + tuple(match.values()) for row in rows if row[-1] in applied]
+                if rows:
+                    conn.executemany(
+                        f"UPDATE {collection} SET {_set_clause(collection, keys)} "
+                        f"WHERE {id_column} = ?{match_clause}", rows
+                    )
+            for doc_id, processed, checks in guarded:
+                checks = {**match, **checks}
+                where_clause = " AND ".join([f"{id_column} = ?"] + [f"{key} = ?" for key in checks])
+                cursor = conn.execute(
+                    f"UPDATE {collection} SET {_set_clause(collection, processed)} WHERE {where_clause}",
+                    list(processed.values()) + [doc_id] + list(checks.values())
+                )
+                if cursor.rowcount:
+                    applied.add(doc_id)
+            if collection == "products":
+                self._sync_attributes_many(conn, [(doc_id, fields) for doc_id, fields in updates if doc_id in applied])
+        return applied
     
-    def query_collection(self, collection: str, where_clause: str = "", params: tuple = ()) -> List[Dict[str, Any]]:
-        """Query a collection"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            query = f"SELECT * FROM {collection}"
+    def _sync_attributes(self, conn: sqlite3.Connection, product_id: str, data: Dict[str, Any]):
+        """Rewrite the junction rows for every attribute list present in data"""
+        self._sync_attributes_many(conn, [(product_id, data)])
+    
+    def _sync_attributes_many(self, conn: sqlite3.Connection, items: List[Tuple[str, Dict[str, Any]]]):
+        """Batched _sync_attributes: one DELETE and one INSERT executemany per table"""
+        for field, (table, column) in ATTRIBUTE_TABLES.items():
+            touched = [(product_id, data[field]) for product_id, data in items if field in data]
+            if not touched:
+                continue
+            conn.executemany(
+                f"DELETE FROM {table} WHERE product_id = ?",
+                [(product_id,) for product_id, _ in touched]
+            )
+            rows = []
+            for product_id, values in touched:
+                normalized = {normalize_attribute(v) for v in values or [] if isinstance(v, str)}
+                normalized.discard("")
+                rows.extend((product_id, value) for value in normalized)
+            if rows:
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO {table} (product_id, {column}) VALUES (?, ?)", rows
+                )
+    
+    def query_collection(
+        self,
+        collection: str,
+        where_clause: str = "",
+        params: tuple = (),
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        columns: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Query a collection
+        
+        Args:
+            collection: Table name
+            where_clause: SQL filter using ? placeholders
+            params: Values for the placeholders
+            order_by: SQL ORDER BY expression, e.g. "created_at DESC"
+            limit: Maximum rows to return (None for all)
+            offset: Rows to skip before the first returned row
+            columns: Columns to select (None for all)
+            
+        Returns:
+            List of documents with JSON fields decoded
+        """
+        with self.reader() as conn:
+            select = ", ".join(columns) if columns else "*"
+            query = f"SELECT {select} FROM {collection}"
             if where_clause:
                 query += f" WHERE {where_clause}"
+            if order_by:
+                query += f" ORDER BY {order_by}"
+            if limit is not None:
+                query += " LIMIT ? OFFSET ?"
+                params = tuple(params) + (limit, offset)
             
             cursor = conn.execute(query, params)
-            results = []
-            for row in cursor.fetchall():
-                data = dict(row)
-                # Parse JSON fields
-                for field in ['materials', 'colors', 'tags', 'images', 'pricing', 'dimensions']:
-                    if field in data and data[field]:
-                        try:
-                            data[field] = json.loads(data[field])
-                        except:
-                            pass
-                results.append(data)
-            return results
+            decode = cursor_decoder(cursor, JSON_FIELDS)
+            return [decode(row) for row in cursor.fetchall()]
+    
+    def count_collection(self, collection: str, where_clause: str = "", params: tuple = ()) -> int:
+        """Count documents matching a filter"""
+        with self.reader() as conn:
+            query = f"SELECT COUNT(*) FROM {collection}"
+            if where_clause:
+                query += f" WHERE {where_clause}"
+            return conn.execute(query, params).fetchone()[0]
 
 # Global database instance
 db = SQLiteDatabase()
@@ -218,30 +418,6 @@ def get_database_client():
     """Returns the database client"""
     return db
 
-# Cache functions for compatibility
-async def set_cached_analysis(image_hash: str, data: dict):
-    """Saves analysis data to database"""
-    cache_data = {
-        'image_hash': image_hash,
-        'data': json.dumps(data),
-        'created_at': datetime.utcnow().isoformat()
-    }
-    with sqlite3.connect(db.db_path) as conn:
-        conn.execute("""
-            INSERT OR REPLACE INTO copilot_cache (image_hash, data, created_at)
-            VALUES (?, ?, ?)
-        """, (image_hash, cache_data['data'], cache_data['created_at']))
-        conn.commit()
-
-async def get_cached_analysis(image_hash: str) -> Optional[dict]:
-    """Retrieves analysis data from database"""
-    with sqlite3.connect(db.db_path) as conn:
-        cursor = conn.execute("SELECT data FROM copilot_cache WHERE image_hash = ?", (image_hash,))
-        row = cursor.fetchone()
-        if row:
-            return json.loads(row[0])
-    return None
-
 async def get_artisan_glossary(artisan_id: str, language_code: str) -> dict:
     """Placeholder for artisan glossary"""
     return {}
\ No newline at end of file
@@ -0,0 +1,62 @@
+-- Baseline schema. Uses IF NOT EXISTS so databases created before the
+-- migration runner existed are adopted without changes.
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    email TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    name TEXT NOT NULL,
+    phone TEXT,
+    location TEXT,
+    bio TEXT,
+    avatar_url TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS products (
+    product_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    category TEXT NOT NULL,
+    materials TEXT,
+    colors TEXT,
+    tags TEXT,
+    story TEXT,
+    images TEXT,
+    pricing TEXT,
+    dimensions TEXT,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    views_count INTEGER DEFAULT 0,
+    likes_count INTEGER DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES users (user_id)
+);
+
+CREATE TABLE IF NOT EXISTS copilot_cache (
+    image_hash TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS product_likes (
+    product_id TEXT,
+    user_id TEXT,
+    liked_at TEXT,
+    PRIMARY KEY (product_id, user_id)
+);
+
+-- Previously created lazily by SalesService.record_sale
+CREATE TABLE IF NOT EXISTS sales (
+    sale_id TEXT PRIMARY KEY,
+    seller_id TEXT NOT NULL,
+    product_id TEXT NOT NULL,
+    buyer_email TEXT NOT NULL,
+    amount REAL NOT NULL,
+    currency TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
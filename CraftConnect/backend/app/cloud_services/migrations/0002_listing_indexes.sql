@@ -0,0 +1,19 @@
+-- Indexes for product listings, seller sales and per-user likes.
+
+-- Public catalog: WHERE status = ? [AND category = ?] ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_products_status_category_created
+    ON products (status, category, created_at);
+CREATE INDEX IF NOT EXISTS idx_products_status_created
+    ON products (status, created_at);
+
+-- Owner listings and per-user stats: WHERE user_id = ? ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_products_user_created
+    ON products (user_id, created_at);
+
+-- Seller analytics and dashboard: WHERE seller_id = ?
+CREATE INDEX IF NOT EXISTS idx_sales_seller_created
+    ON sales (seller_id, created_at);
+
+-- "Products I liked"; the primary key only covers (product_id, user_id)
+CREATE INDEX IF NOT EXISTS idx_product_likes_user
+    ON product_likes (user_id);
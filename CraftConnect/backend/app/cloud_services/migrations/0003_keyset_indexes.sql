@@ -0,0 +1,15 @@
+-- Extend listing indexes with product_id so keyset pagination
+-- (ORDER BY created_at DESC, product_id DESC with a row-value bound)
+-- is a single index seek with no temp sort.
+
+DROP INDEX IF EXISTS idx_products_status_category_created;
+CREATE INDEX idx_products_status_category_created
+    ON products (status, category, created_at, product_id);
+
+DROP INDEX IF EXISTS idx_products_status_created;
+CREATE INDEX idx_products_status_created
+    ON products (status, created_at, product_id);
+
+DROP INDEX IF EXISTS idx_products_user_created;
+CREATE INDEX idx_products_user_created
+    ON products (user_id, created_at, product_id);
@@ -0,0 +1,36 @@
+-- Full-text index over product text, kept in sync with products by triggers.
+-- External-content table: the text lives only in products; products_fts
+-- stores the inverted index keyed by products.rowid.
+
+CREATE VIRTUAL TABLE products_fts USING fts5(
+    title,
+    description,
+    tags,
+    materials,
+    story,
+    content = 'products',
+    content_rowid = 'rowid',
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+CREATE TRIGGER products_fts_insert AFTER INSERT ON products BEGIN
+    INSERT INTO products_fts (rowid, title, description, tags, materials, story)
+    VALUES (new.rowid, new.title, new.description, new.tags, new.materials, new.story);
+END;
+
+CREATE TRIGGER products_fts_delete AFTER DELETE ON products BEGIN
+    INSERT INTO products_fts (products_fts, rowid, title, description, tags, materials, story)
+    VALUES ('delete', old.rowid, old.title, old.description, old.tags, old.materials, old.story);
+END;
+
+-- Only text columns: view/like counter updates must not touch the index
+CREATE TRIGGER products_fts_update AFTER UPDATE OF title, description, tags, materials, story ON products BEGIN
+    INSERT INTO products_fts (products_fts, rowid, title, description, tags, materials, story)
+    VALUES ('delete', old.rowid, old.title, old.description, old.tags, old.materials, old.story);
+    INSERT INTO products_fts (rowid, title, description, tags, materials, story)
+    VALUES (new.rowid, new.title, new.description, new.tags, new.materials, new.story);
+END;
+
+-- Index products that existed before this migration
+INSERT INTO products_fts (products_fts) VALUES ('rebuild');
@@ -0,0 +1,6 @@
+-- Covering index for per-user like lookups on listing pages:
+-- WHERE user_id = ? AND product_id IN (...)
+
+DROP INDEX IF EXISTS idx_product_likes_user;
+CREATE INDEX idx_product_likes_user
+    ON product_likes (user_id, product_id);
@@ -0,0 +1,41 @@
+-- Junction tables for product tags, materials and colors so attribute
+-- filters and shared-tag scoring are index lookups instead of JSON scans.
+-- Values are stored trimmed and lower-cased. SQLiteDatabase.set_document
+-- and update_document keep them in sync with the JSON columns.
+
+CREATE TABLE product_tags (
+    product_id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (product_id, tag)
+) WITHOUT ROWID;
+CREATE INDEX idx_product_tags_tag ON product_tags (tag, product_id);
+
+CREATE TABLE product_materials (
+    product_id TEXT NOT NULL,
+    material TEXT NOT NULL,
+    PRIMARY KEY (product_id, material)
+) WITHOUT ROWID;
+CREATE INDEX idx_product_materials_material ON product_materials (material, product_id);
+
+CREATE TABLE product_colors (
+    product_id TEXT NOT NULL,
+    color TEXT NOT NULL,
+    PRIMARY KEY (product_id, color)
+) WITHOUT ROWID;
+CREATE INDEX idx_product_colors_color ON product_colors (color, product_id);
+
+-- Backfill from the JSON columns of existing products
+INSERT OR IGNORE INTO product_tags (product_id, tag)
+SELECT p.product_id, lower(trim(j.value))
+FROM products p, json_each(p.tags) j
+WHERE json_valid(p.tags) AND j.type = 'text' AND trim(j.value) != '';
+
+INSERT OR IGNORE INTO product_materials (product_id, material)
+SELECT p.product_id, lower(trim(j.value))
+FROM products p, json_each(p.materials) j
+WHERE json_valid(p.materials) AND j.type = 'text' AND trim(j.value) != '';
+
+INSERT OR IGNORE INTO product_colors (product_id, color)
+SELECT p.product_id, lower(trim(j.value))
+FROM products p, json_each(p.colors) j
+WHERE json_valid(p.colors) AND j.type = 'text' AND trim(j.value) != '';
@@ -0,0 +1,4 @@
+-- Row version for optimistic concurrency on product edits. Every content
+-- write bumps it; view and like counters leave it alone.
+
+ALTER TABLE products ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
@@ -0,0 +1,62 @@
+-- Sales: add the buyer/quantity/payment columns SaleRecordRequest carries
+-- (buyer_email becomes optional), plus daily and monthly rollups that
+-- /sales/analytics reads instead of scanning every sale.
+
+CREATE TABLE sales_new (
+    sale_id TEXT PRIMARY KEY,
+    seller_id TEXT NOT NULL,
+    product_id TEXT NOT NULL,
+    buyer_name TEXT NOT NULL DEFAULT '',
+    buyer_email TEXT,
+    buyer_phone TEXT,
+    amount REAL NOT NULL,
+    currency TEXT NOT NULL,
+    quantity INTEGER NOT NULL DEFAULT 1,
+    payment_method TEXT,
+    status TEXT NOT NULL,
+    notes TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+INSERT INTO sales_new (sale_id, seller_id, product_id, buyer_email, amount, currency, status, created_at, updated_at)
+SELECT sale_id, seller_id, product_id, buyer_email, amount, currency, status, created_at, updated_at
+FROM sales;
+DROP TABLE sales;
+ALTER TABLE sales_new RENAME TO sales;
+CREATE INDEX idx_sales_seller_created ON sales (seller_id, created_at);
+
+-- Completed sales per seller, currency, UTC day/month and product. Updated
+-- in the same transaction as the sale insert (SalesService.record_sale).
+CREATE TABLE sales_daily (
+    seller_id TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    day TEXT NOT NULL,              -- YYYY-MM-DD
+    product_id TEXT NOT NULL,
+    sales_count INTEGER NOT NULL DEFAULT 0,
+    items_sold INTEGER NOT NULL DEFAULT 0,
+    revenue REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (seller_id, currency, day, product_id)
+) WITHOUT ROWID;
+
+CREATE TABLE sales_monthly (
+    seller_id TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    month TEXT NOT NULL,            -- YYYY-MM
+    product_id TEXT NOT NULL,
+    sales_count INTEGER NOT NULL DEFAULT 0,
+    items_sold INTEGER NOT NULL DEFAULT 0,
+    revenue REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (seller_id, currency, month, product_id)
+) WITHOUT ROWID;
+
+-- Backfill from existing sales
+INSERT INTO sales_daily (seller_id, currency, day, product_id, sales_count, items_sold, revenue)
+SELECT seller_id, currency, substr(created_at, 1, 10), product_id, COUNT(*), SUM(quantity), SUM(amount)
+FROM sales
+WHERE status = 'completed'
+GROUP BY seller_id, currency, substr(created_at, 1, 10), product_id;
+
+INSERT INTO sales_monthly (seller_id, currency, month, product_id, sales_count, items_sold, revenue)
+SELECT seller_id, currency, substr(day, 1, 7), product_id, SUM(sales_count), SUM(items_sold), SUM(revenue)
+FROM sales_daily
+GROUP BY seller_id, currency, substr(day, 1, 7), product_id;
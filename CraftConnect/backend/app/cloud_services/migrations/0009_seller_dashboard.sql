@@ -0,0 +1,269 @@
+-- Per-seller dashboard summary, one row per seller, kept current by
+-- triggers so every write path (single and bulk product writes, like
+-- toggles, view flushes, sales) updates it in its own transaction.
+-- /dashboard/{user_id} reads it with a primary-key lookup.
+--
+-- The *_30d counters are incremented alongside the totals. Once a day
+-- DashboardService re-derives them from the daily tables (window_day
+-- records when) so old days fall out of the window.
+
+CREATE TABLE seller_dashboard (
+    seller_id TEXT PRIMARY KEY,
+    total_products INTEGER NOT NULL DEFAULT 0,
+    products_by_status TEXT NOT NULL DEFAULT '{}',
+    products_by_category TEXT NOT NULL DEFAULT '{}',
+    total_views INTEGER NOT NULL DEFAULT 0,
+    total_likes INTEGER NOT NULL DEFAULT 0,
+    total_sales INTEGER NOT NULL DEFAULT 0,
+    total_items_sold INTEGER NOT NULL DEFAULT 0,
+    revenue_by_currency TEXT NOT NULL DEFAULT '{}',
+    window_day TEXT NOT NULL DEFAULT '',
+    views_30d INTEGER NOT NULL DEFAULT 0,
+    likes_30d INTEGER NOT NULL DEFAULT 0,
+    sales_30d INTEGER NOT NULL DEFAULT 0,
+    revenue_30d_by_currency TEXT NOT NULL DEFAULT '{}',
+    top_viewed TEXT NOT NULL DEFAULT '[]',
+    top_liked TEXT NOT NULL DEFAULT '[]',
+    top_selling TEXT NOT NULL DEFAULT '[]'
+);
+
+-- Views and new likes per seller and UTC day, for the 30-day window
+CREATE TABLE seller_engagement_daily (
+    seller_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    views INTEGER NOT NULL DEFAULT 0,
+    likes INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (seller_id, day)
+) WITHOUT ROWID;
+
+-- Top-N lookups used when a top list is rebuilt
+CREATE INDEX idx_products_user_views ON products (user_id, views_count, product_id);
+CREATE INDEX idx_products_user_likes ON products (user_id, likes_count, product_id);
+
+-- Product created: totals, status/category counts and short top lists
+CREATE TRIGGER products_dashboard_insert AFTER INSERT ON products BEGIN
+    INSERT OR IGNORE INTO seller_dashboard (seller_id) VALUES (new.user_id);
+    UPDATE seller_dashboard SET
+        total_products = total_products + 1,
+        products_by_status = json_set(products_by_status, '$."' || new.status || '"',
+            COALESCE(json_extract(products_by_status, '$."' || new.status || '"'), 0) + 1),
+        products_by_category = json_set(products_by_category, '$."' || new.category || '"',
+            COALESCE(json_extract(products_by_category, '$."' || new.category || '"'), 0) + 1),
+        total_views = total_views + COALESCE(new.views_count, 0),
+        total_likes = total_likes + COALESCE(new.likes_count, 0)
+    WHERE seller_id = new.user_id;
+    -- New products fill top lists that are not yet full
+    UPDATE seller_dashboard SET
+        top_viewed = (
+            SELECT json_group_array(json_object('product_id', product_id, 'title', title, 'views_count', views_count))
+            FROM (SELECT product_id, title, views_count FROM products
+                  WHERE user_id = new.user_id AND status != 'archived'
+                  ORDER BY views_count DESC, product_id DESC LIMIT 5)
+        ),
+        top_liked = (
+            SELECT json_group_array(json_object('product_id', product_id, 'title', title, 'likes_count', likes_count))
+            FROM (SELECT product_id, title, likes_count FROM products
+                  WHERE user_id = new.user_id AND status != 'archived'
+                  ORDER BY likes_count DESC, product_id DESC LIMIT 5)
+        )
+    WHERE seller_id = new.user_id
+      AND (json_array_length(top_viewed) < 5 OR json_array_length(top_liked) < 5);
+END;
+
+-- Status or category changed: move the product between buckets. The
+-- decrement and increment are separate statements so an unchanged key
+-- nets to zero.
+CREATE TRIGGER products_dashboard_classify AFTER UPDATE OF status, category ON products
+WHEN new.status IS NOT old.status OR new.category IS NOT old.category BEGIN
+    UPDATE seller_dashboard SET
+        products_by_status = json_set(products_by_status, '$."' || old.status || '"',
+            COALESCE(json_extract(products_by_status, '$."' || old.status || '"'), 0) - 1),
+        products_by_category = json_set(products_by_category, '$."' || old.category || '"',
+            COALESCE(json_extract(products_by_category, '$."' || old.category || '"'), 0) - 1)
+    WHERE seller_id = new.user_id;
+    UPDATE seller_dashboard SET
+        products_by_status = json_set(products_by_status, '$."' || new.status || '"',
+            COALESCE(json_extract(products_by_status, '$."' || new.status || '"'), 0) + 1),
+        products_by_category = json_set(products_by_category, '$."' || new.category || '"',
+            COALESCE(json_extract(products_by_category, '$."' || new.category || '"'), 0) + 1)
+    WHERE seller_id = new.user_id;
+END;
+
+-- Rebuild the viewed/liked top lists when a product is renamed or changes
+-- status (archived products drop out)
+CREATE TRIGGER products_dashboard_tops_update AFTER UPDATE OF title, status ON products
+WHEN new.title IS NOT old.title OR new.status IS NOT old.status BEGIN
+    UPDATE seller_dashboard SET
+        top_viewed = (
+            SELECT json_group_array(json_object('product_id', product_id, 'title', title, 'views_count', views_count))
+            FROM (SELECT product_id, title, views_count FROM products
+                  WHERE user_id = new.user_id AND status != 'archived'
+                  ORDER BY views_count DESC, product_id DESC LIMIT 5)
+        ),
+        top_liked = (
+            SELECT json_group_array(json_object('product_id', product_id, 'title', title, 'likes_count', likes_count))
+            FROM (SELECT product_id, title, likes_count FROM products
+                  WHERE user_id = new.user_id AND status != 'archived'
+                  ORDER BY likes_count DESC, product_id DESC LIMIT 5)
+        ),
+        top_selling = (
+            SELECT json_group_array(CASE
+                WHEN json_extract(value, '$.product_id') = new.product_id THEN json_set(value, '$.title', new.title)
+                ELSE json(value)
+            END)
+            FROM json_each(top_selling)
+        )
+    WHERE seller_id = new.user_id;
+END;
+
+-- Views flushed by the write-behind buffer
+CREATE TRIGGER products_dashboard_views AFTER UPDATE OF views_count ON products
+WHEN new.views_count > COALESCE(old.views_count, 0) BEGIN
+    INSERT INTO seller_engagement_daily (seller_id, day, views)
+    VALUES (new.user_id, date('now'), new.views_count - COALESCE(old.views_count, 0))
+    ON CONFLICT (seller_id, day) DO UPDATE SET views = views + excluded.views;
+    INSERT OR IGNORE INTO seller_dashboard (seller_id) VALUES (new.user_id);
+    UPDATE seller_dashboard SET
+        total_views = total_views + new.views_count - COALESCE(old.views_count, 0),
+        views_30d = views_30d + new.views_count - COALESCE(old.views_count, 0),
+        top_viewed = CASE
+            WHEN new.status != 'archived' AND (
+                json_array_length(top_viewed) < 5
+                OR new.views_count >= json_extract(top_viewed, '$[#-1].views_count')
+                OR EXISTS (SELECT 1 FROM json_each(top_viewed)
+                           WHERE json_extract(value, '$.product_id') = new.product_id))
+            THEN (
+                SELECT json_group_array(json_object('product_id', product_id, 'title', title, 'views_count', views_count))
+                FROM (SELECT product_id, title, views_count FROM products
+                      WHERE user_id = new.user_id AND status != 'archived'
+                      ORDER BY views_count DESC, product_id DESC LIMIT 5)
+            )
+            ELSE top_viewed
+        END
+    WHERE seller_id = new.user_id;
+END;
+
+-- Like toggles; unlikes reduce the total but not the 30-day "new likes"
+CREATE TRIGGER products_dashboard_likes AFTER UPDATE OF likes_count ON products
+WHEN new.likes_count IS NOT old.likes_count BEGIN
+    INSERT INTO seller_engagement_daily (seller_id, day, likes)
+    SELECT new.user_id, date('now'), new.likes_count - COALESCE(old.likes_count, 0)
+    WHERE new.likes_count > COALESCE(old.likes_count, 0)
+    ON CONFLICT (seller_id, day) DO UPDATE SET likes = likes + excluded.likes;
+    INSERT OR IGNORE INTO seller_dashboard (seller_id) VALUES (new.user_id);
+    UPDATE seller_dashboard SET
+        total_likes = total_likes + new.likes_count - COALESCE(old.likes_count, 0),
+        likes_30d = likes_30d + MAX(new.likes_count - COALESCE(old.likes_count, 0), 0),
+        top_liked = CASE
+            WHEN new.status != 'archived' AND (
+                json_array_length(top_liked) < 5
+                OR new.likes_count >= json_extract(top_liked, '$[#-1].likes_count')
+                OR EXISTS (SELECT 1 FROM json_each(top_liked)
+                           WHERE json_extract(value, '$.product_id') = new.product_id))
+            THEN (
+                SELECT json_group_array(json_object('product_id', product_id, 'title', title, 'likes_count', likes_count))
+                FROM (SELECT product_id, title, likes_count FROM products
+                      WHERE user_id = new.user_id AND status != 'archived'
+                      ORDER BY likes_count DESC, product_id DESC LIMIT 5)
+            )
+            ELSE top_liked
+        END
+    WHERE seller_id = new.user_id;
+END;
+
+-- Sales arrive through the monthly rollup that record_sale upserts, so the
+-- top-selling list sees the new totals
+CREATE TRIGGER sales_monthly_dashboard_insert AFTER INSERT ON sales_monthly BEGIN
+    INSERT OR IGNORE INTO seller_dashboard (seller_id) VALUES (new.seller_id);
+    UPDATE seller_dashboard SET
+        total_sales = total_sales + new.sales_count,
+        total_items_sold = total_items_sold + new.items_sold,
+        revenue_by_currency = json_set(revenue_by_currency, '$."' || new.currency || '"',
+            COALESCE(json_extract(revenue_by_currency, '$."' || new.currency || '"'), 0) + new.revenue),
+        sales_30d = sales_30d + new.sales_count,
+        revenue_30d_by_currency = json_set(revenue_30d_by_currency, '$."' || new.currency || '"',
+            COALESCE(json_extract(revenue_30d_by_currency, '$."' || new.currency || '"'), 0) + new.revenue)
+    WHERE seller_id = new.seller_id;
+    UPDATE seller_dashboard SET
+        top_selling = (
+            SELECT json_group_array(json_object(
+                'product_id', product_id,
+                'title', (SELECT title FROM products p WHERE p.product_id = t.product_id),
+                'sales_count', sales_count, 'items_sold', items_sold))
+            FROM (SELECT product_id, SUM(sales_count) AS sales_count, SUM(items_sold) AS items_sold
+                  FROM sales_monthly WHERE seller_id = new.seller_id
+                  GROUP BY product_id ORDER BY items_sold DESC, product_id DESC LIMIT 5) t
+        )
+    WHERE seller_id = new.seller_id;
+END;
+
+CREATE TRIGGER sales_monthly_dashboard_update AFTER UPDATE ON sales_monthly BEGIN
+    UPDATE seller_dashboard SET
+        total_sales = total_sales + new.sales_count - old.sales_count,
+        total_items_sold = total_items_sold + new.items_sold - old.items_sold,
+        revenue_by_currency = json_set(revenue_by_currency, '$."' || new.currency || '"',
+            COALESCE(json_extract(revenue_by_currency, '$."' || new.currency || '"'), 0) + new.revenue - old.revenue),
+        sales_30d = sales_30d + new.sales_count - old.sales_count,
+        revenue_30d_by_currency = json_set(revenue_30d_by_currency, '$."' || new.currency || '"',
+            COALESCE(json_extract(revenue_30d_by_currency, '$."' || new.currency || '"'), 0) + new.revenue - old.revenue)
+    WHERE seller_id = new.seller_id;
+    UPDATE seller_dashboard SET
+        top_selling = (
+            SELECT json_group_array(json_object(
+                'product_id', product_id,
+                'title', (SELECT title FROM products p WHERE p.product_id = t.product_id),
+                'sales_count', sales_count, 'items_sold', items_sold))
+            FROM (SELECT product_id, SUM(sales_count) AS sales_count, SUM(items_sold) AS items_sold
+                  FROM sales_monthly WHERE seller_id = new.seller_id
+                  GROUP BY product_id ORDER BY items_sold DESC, product_id DESC LIMIT 5) t
+        )
+    WHERE seller_id = new.seller_id;
+END;
+
+-- Backfill one row per seller from existing products and sales. The
+-- 30-day counters are left for the first dashboard read to derive.
+INSERT INTO seller_dashboard (seller_id)
+SELECT user_id FROM products
+UNION
+SELECT seller_id FROM sales_monthly;
+
+UPDATE seller_dashboard SET
+    total_products = (SELECT COUNT(*) FROM products WHERE user_id = seller_id),
+    products_by_status = (
+        SELECT json_group_object(status, n) FROM
+        (SELECT status, COUNT(*) AS n FROM products WHERE user_id = seller_id GROUP BY status)
+    ),
+    products_by_category = (
+        SELECT json_group_object(category, n) FROM
+        (SELECT category, COUNT(*) AS n FROM products WHERE user_id = seller_id GROUP BY category)
+    ),
+    total_views = (SELECT COALESCE(SUM(views_count), 0) FROM products WHERE user_id = seller_id),
+    total_likes = (SELECT COALESCE(SUM(likes_count), 0) FROM products WHERE user_id = seller_id),
+    total_sales = (SELECT COALESCE(SUM(sales_count), 0) FROM sales_monthly WHERE sales_monthly.seller_id = seller_dashboard.seller_id),
+    total_items_sold = (SELECT COALESCE(SUM(items_sold), 0) FROM sales_monthly WHERE sales_monthly.seller_id = seller_dashboard.seller_id),
+    revenue_by_currency = (
+        SELECT json_group_object(currency, revenue) FROM
+        (SELECT currency, SUM(revenue) AS revenue FROM sales_monthly
+         WHERE sales_monthly.seller_id = seller_dashboard.seller_id GROUP BY currency)
+    ),
+    top_viewed = (
+        SELECT json_group_array(json_object('product_id', product_id, 'title', title, 'views_count', views_count))
+        FROM (SELECT product_id, title, views_count FROM products
+              WHERE user_id = seller_id AND status != 'archived'
+              ORDER BY views_count DESC, product_id DESC LIMIT 5)
+    ),
+    top_liked = (
+        SELECT json_group_array(json_object('product_id', product_id, 'title', title, 'likes_count', likes_count))
+        FROM (SELECT product_id, title, likes_count FROM products
+              WHERE user_id = seller_id AND status != 'archived'
+              ORDER BY likes_count DESC, product_id DESC LIMIT 5)
+    ),
+    top_selling = (
+        SELECT json_group_array(json_object(
+            'product_id', product_id,
+            'title', (SELECT title FROM products p WHERE p.product_id = t.product_id),
+            'sales_count', sales_count, 'items_sold', items_sold))
+        FROM (SELECT product_id, SUM(sales_count) AS sales_count, SUM(items_sold) AS items_sold
+              FROM sales_monthly WHERE sales_monthly.seller_id = seller_dashboard.seller_id
+              GROUP BY product_id ORDER BY items_sold DESC, product_id DESC LIMIT 5) t
+    );
@@ -0,0 +1,85 @@
+-- Per-product engagement counters in time buckets, replacing the
+-- seller-level seller_engagement_daily table from 0009. The view and like
+-- triggers write them inside the view-flush and like-toggle transactions.
+--
+-- bucket is 'YYYY-MM-DDTHH' for hourly rows and 'YYYY-MM-DD' for daily rows
+-- produced by EngagementCompactor. The two formats sort together, so a
+-- window starting on a day boundary is a single range: bucket >= 'YYYY-MM-DD'.
+
+CREATE TABLE engagement_counters (
+    product_id TEXT NOT NULL,
+    event TEXT NOT NULL,            -- view | like
+    bucket TEXT NOT NULL,
+    seller_id TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (product_id, event, bucket)
+) WITHOUT ROWID;
+
+-- Trending and compaction: WHERE event = ? AND bucket >= ?
+CREATE INDEX idx_engagement_event_bucket ON engagement_counters (event, bucket, product_id, count);
+-- Seller dashboards: WHERE seller_id = ? AND event = ? AND bucket >= ?
+CREATE INDEX idx_engagement_seller ON engagement_counters (seller_id, event, bucket, count);
+
+DROP TRIGGER products_dashboard_views;
+DROP TRIGGER products_dashboard_likes;
+
+CREATE TRIGGER products_dashboard_views AFTER UPDATE OF views_count ON products
+WHEN new.views_count > COALESCE(old.views_count, 0) BEGIN
+    INSERT INTO engagement_counters (product_id, event, bucket, seller_id, count)
+    VALUES (new.product_id, 'view', strftime('%Y-%m-%dT%H', 'now'), new.user_id,
+            new.views_count - COALESCE(old.views_count, 0))
+    ON CONFLICT (product_id, event, bucket) DO UPDATE SET count = count + excluded.count;
+    INSERT OR IGNORE INTO seller_dashboard (seller_id) VALUES (new.user_id);
+    UPDATE seller_dashboard SET
+        total_views = total_views + new.views_count - COALESCE(old.views_count, 0),
+        views_30d = views_30d + new.views_count - COALESCE(old.views_count, 0),
+        top_viewed = CASE
+            WHEN new.status != 'archived' AND (
+                json_array_length(top_viewed) < 5
+                OR new.views_count >= json_extract(top_viewed, '$[#-1].views_count')
+                OR EXISTS (SELECT 1 FROM json_each(top_viewed)
+                           WHERE json_extract(value, '$.product_id') = new.product_id))
+            THEN (
+                SELECT json_group_array(json_object('product_id', product_id, 'title', title, 'views_count', views_count))
+                FROM (SELECT product_id, title, views_count FROM products
+                      WHERE user_id = new.user_id AND status != 'archived'
+                      ORDER BY views_count DESC, product_id DESC LIMIT 5)
+            )
+            ELSE top_viewed
+        END
+    WHERE seller_id = new.user_id;
+END;
+
+-- Like toggles; unlikes reduce the total but are not engagement events
+CREATE TRIGGER products_dashboard_likes AFTER UPDATE OF likes_count ON products
+WHEN new.likes_count IS NOT old.likes_count BEGIN
+    INSERT INTO engagement_counters (product_id, event, bucket, seller_id, count)
+    SELECT new.product_id, 'like', strftime('%Y-%m-%dT%H', 'now'), new.user_id,
+           new.likes_count - COALESCE(old.likes_count, 0)
+    WHERE new.likes_count > COALESCE(old.likes_count, 0)
+    ON CONFLICT (product_id, event, bucket) DO UPDATE SET count = count + excluded.count;
+    INSERT OR IGNORE INTO seller_dashboard (seller_id) VALUES (new.user_id);
+    UPDATE seller_dashboard SET
+        total_likes = total_likes + new.likes_count - COALESCE(old.likes_count, 0),
+        likes_30d = likes_30d + MAX(new.likes_count - COALESCE(old.likes_count, 0), 0),
+        top_liked = CASE
+            WHEN new.status != 'archived' AND (
+                json_array_length(top_liked) < 5
+                OR new.likes_count >= json_extract(top_liked, '$[#-1].likes_count')
+                OR EXISTS (SELECT 1 FROM json_each(top_liked)
+                           WHERE json_extract(value, '$.product_id') = new.product_id))
+            THEN (
+                SELECT json_group_array(json_object('product_id', product_id, 'title', title, 'likes_count', likes_count))
+                FROM (SELECT product_id, title, likes_count FROM products
+                      WHERE user_id = new.user_id AND status != 'archived'
+                      ORDER BY likes_count DESC, product_id DESC LIMIT 5)
+            )
+            ELSE top_liked
+        END
+    WHERE seller_id = new.user_id;
+END;
+
+-- The seller-level history cannot be split per product, so it is dropped;
+-- seller_dashboard's 30-day counters re-derive from engagement_counters at
+-- each seller's next daily refresh.
+DROP TABLE seller_engagement_daily;
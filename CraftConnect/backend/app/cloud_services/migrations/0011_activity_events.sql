@@ -0,0 +1,24 @@
+-- Append-only seller activity feed for the dashboard's recent_activities.
+--
+-- AUTOINCREMENT keeps ids strictly increasing and never reused, so id
+-- order is append order and recent activity is a reverse range scan of
+-- idx_activity_seller.
+
+CREATE TABLE activity_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    seller_id TEXT NOT NULL,
+    activity_type TEXT NOT NULL,    -- product_created | product_updated | product_archived | view | like | sale
+    description TEXT NOT NULL,
+    metadata TEXT,                  -- JSON object
+    created_at TEXT NOT NULL
+);
+
+CREATE INDEX idx_activity_seller ON activity_events (seller_id, id DESC);
+
+-- Day partitions: first_id is the first activity_events id appended on that
+-- UTC day. Retention deletes whole days as one rowid range (id < first_id
+-- of the oldest kept day) instead of filtering on created_at.
+CREATE TABLE activity_partitions (
+    day TEXT PRIMARY KEY,           -- YYYY-MM-DD
+    first_id INTEGER NOT NULL
+) WITHOUT ROWID;
@@ -0,0 +1,21 @@
+-- copilot_cache becomes the second tier behind CopilotCache's in-memory
+-- LRU. Payloads are stored compressed (encoding = 'zlib'); rows copied
+-- from the old table keep their plain JSON text (encoding = 'json') until
+-- the compaction task recompresses them. size is the stored payload length,
+-- used to enforce COPILOT_CACHE_DB_MAX_BYTES.
+
+CREATE TABLE copilot_cache_new (
+    image_hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    encoding TEXT NOT NULL DEFAULT 'json',  -- json | zlib
+    size INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+INSERT INTO copilot_cache_new (image_hash, data, encoding, size, created_at)
+SELECT image_hash, data, 'json', length(CAST(data AS BLOB)), created_at
+FROM copilot_cache;
+DROP TABLE copilot_cache;
+ALTER TABLE copilot_cache_new RENAME TO copilot_cache;
+
+-- Expiry and oldest-first eviction both walk created_at
+CREATE INDEX idx_copilot_cache_created ON copilot_cache (created_at, size);
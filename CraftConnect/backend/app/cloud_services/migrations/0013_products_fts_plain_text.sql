@@ -0,0 +1,77 @@
+-- Rebuild the product search index over plain text.
+-- tags and materials are stored as JSON arrays with non-ASCII escaped
+-- (["café"]), so indexing the raw column made such values
+-- unsearchable; the triggers now index the array elements joined by spaces.
+-- The index also stops borrowing products.rowid, which is not a declared
+-- column of the TEXT-keyed products table and may be renumbered by VACUUM.
+-- products_fts keeps its own copy of the text (for snippets), keyed by
+-- products_fts_rows.search_rowid, a stable integer per product_id.
+
+DROP TRIGGER products_fts_insert;
+DROP TRIGGER products_fts_delete;
+DROP TRIGGER products_fts_update;
+DROP TABLE products_fts;
+
+CREATE TABLE products_fts_rows (
+    search_rowid INTEGER PRIMARY KEY,
+    product_id TEXT NOT NULL UNIQUE
+);
+
+CREATE VIRTUAL TABLE products_fts USING fts5(
+    title,
+    description,
+    tags,
+    materials,
+    story,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+CREATE TRIGGER products_fts_insert AFTER INSERT ON products BEGIN
+    INSERT INTO products_fts_rows (product_id) VALUES (new.product_id);
+    INSERT INTO products_fts (rowid, title, description, tags, materials, story)
+    VALUES (
+        (SELECT search_rowid FROM products_fts_rows WHERE product_id = new.product_id),
+        new.title,
+        new.description,
+        CASE WHEN json_valid(new.tags)
+            THEN (SELECT group_concat(value, ' ') FROM json_each(new.tags)) ELSE new.tags END,
+        CASE WHEN json_valid(new.materials)
+            THEN (SELECT group_concat(value, ' ') FROM json_each(new.materials)) ELSE new.materials END,
+        new.story
+    );
+END;
+
+CREATE TRIGGER products_fts_delete AFTER DELETE ON products BEGIN
+    DELETE FROM products_fts
+    WHERE rowid = (SELECT search_rowid FROM products_fts_rows WHERE product_id = old.product_id);
+    DELETE FROM products_fts_rows WHERE product_id = old.product_id;
+END;
+
+-- Only text columns: view/like counter updates must not touch the index
+CREATE TRIGGER products_fts_update AFTER UPDATE OF title, description, tags, materials, story ON products BEGIN
+    UPDATE products_fts SET
+        title = new.title,
+        description = new.description,
+        tags = CASE WHEN json_valid(new.tags)
+            THEN (SELECT group_concat(value, ' ') FROM json_each(new.tags)) ELSE new.tags END,
+        materials = CASE WHEN json_valid(new.materials)
+            THEN (SELECT group_concat(value, ' ') FROM json_each(new.materials)) ELSE new.materials END,
+        story = new.story
+    WHERE rowid = (SELECT search_rowid FROM products_fts_rows WHERE product_id = new.product_id);
+END;
+
+-- Index products that existed before this migration
+INSERT INTO products_fts_rows (product_id) SELECT product_id FROM products;
+
+INSERT INTO products_fts (rowid, title, description, tags, materials, story)
+SELECT
+    r.search_rowid,
+    p.title,
+    p.description,
+    CASE WHEN json_valid(p.tags)
+        THEN (SELECT group_concat(value, ' ') FROM json_each(p.tags)) ELSE p.tags END,
+    CASE WHEN json_valid(p.materials)
+        THEN (SELECT group_concat(value, ' ') FROM json_each(p.materials)) ELSE p.materials END,
+    p.story
+FROM products p JOIN products_fts_rows r ON r.product_id = p.product_id;
@@ -0,0 +1,89 @@
+"""
+Versioned schema migrations for the SQLite database.
+
+Migrations are plain SQL files in this directory named NNNN_description.sql.
+They are applied in version order, each in its own transaction, and recorded
+in the schema_version table so every file runs exactly once per database.
+"""
+import re
+import sqlite3
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d{4})_([a-z0-9_]+)\.sql$")
+
+def discover_migrations() -> List[Tuple[int, str, Path]]:
+    """Return (version, name, path) for every migration file, in order"""
+    migrations = []
+    for path in MIGRATIONS_DIR.glob("*.sql"):
+        match = MIGRATION_FILE_PATTERN.match(path.name)
+        if not match:
+            logger.warning(f"Ignoring migration with unexpected name: {path.name}")
+            continue
+        migrations.append((int(match.group(1)), match.group(2), path))
+
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError("Duplicate migration version numbers")
+    return migrations
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Highest applied migration version (0 for a fresh database)"""
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+def apply_migrations(conn: sqlite3.Connection) -> List[int]:
+    """
+    Apply every pending migration on an autocommit connection.
+    
+    Args:
+        conn: Connection opened with isolation_level=None and no open transaction
+        
+    Returns:
+        Versions applied by this call
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    """)
+    applied = {row[0] for row in conn.execute("SELECT version FROM schema_version")}
+
+    newly_applied = []
+    for version, name, path in discover_migrations():
+        if version in applied:
+            continue
+
+        # executescript() commits any open transaction before it runs, so the
+        # BEGIN/COMMIT pair has to live inside the script itself
+        script = (
+            "BEGIN IMMEDIATE;\n"
+            f"{path.read_text(encoding='utf-8')}\n"
+            "INSERT INTO schema_version (version, name, applied_at) "
+            f"VALUES ({version}, '{name}', '{datetime.utcnow().isoformat()}');\n"
+            "COMMIT;"
+        )
+        try:
+            conn.executescript(script)
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.error(f"Migration {version:04d}_{name} failed", exc_info=True)
+            raise
+
+        logger.info(f"Applied migration {version:04d}_{name}")
+        newly_applied.append(version)
+
+    if newly_applied:
+        # Refresh planner statistics so new indexes get picked up immediately
+        conn.execute("ANALYZE")
+
+    return newly_applied
@@ -3,6 +3,7 @@ from app.config.settings import settings
 import asyncio
 import logging
 from pathlib import Path
+from typing import Optional
 import aiofiles
 
 logger = logging.getLogger(__name__)
@@ -36,6 +37,22 @@ async def upload_file_to_local(file_content: bytes, destination_blob_name: str)
         logger.error(f"❌ Error saving file locally: {e}")
         raise
 
+async def find_existing_file(destination_blob_name: str) -> Optional[str]:
+    """Return the URI of an already stored blob, checking GCS then local storage"""
+    if storage_client:
+        try:
+            blob = storage_client.bucket(settings.BUCKET_NAME).blob(destination_blob_name)
+            loop = asyncio.get_event_loop()
+            if await loop.run_in_executor(None, blob.exists):
+                return f"gs://{settings.BUCKET_NAME}/{destination_blob_name}"
+        except Exception as e:
+            logger.warning(f"GCS existence check failed: {e}")
+    
+    file_name = destination_blob_name.replace("products/", "")
+    if (UPLOAD_DIR / file_name).exists():
+        return f"/uploads/products/{file_name}"
+    return None
+
 async def upload_file_async(file_content: bytes, destination_blob_name: str) -> str:
     """Uploads a file to GCS bucket, falls back to local storage if GCS fails."""
     
@@ -10,6 +10,38 @@ ENV_FILE_PATH = BACKEND_DIR / ".env"
 class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str = "sqlite:///./craftconnect.db"
+    DB_POOL_WORKERS: int = 4
+    DB_POOL_MAX_PENDING: int = 256
+    VIEW_FLUSH_INTERVAL_SECONDS: float = 5.0
+    VIEW_FLUSH_MAX_PENDING: int = 1000
+    DB_JSON_CODEC: str = "auto"  # auto | orjson | json
+    ENGAGEMENT_HOURLY_RETENTION_DAYS: int = 7
+    ENGAGEMENT_DAILY_RETENTION_DAYS: int = 365
+    ENGAGEMENT_COMPACT_INTERVAL_SECONDS: float = 3600.0
+    ACTIVITY_FLUSH_INTERVAL_SECONDS: float = 2.0
+    ACTIVITY_FLUSH_MAX_PENDING: int = 500
+    ACTIVITY_BUFFER_MAX_ROWS: int = 5000  # kept in memory during a DB outage; oldest dropped beyond
+    ACTIVITY_RETENTION_DAYS: int = 90
+    ACTIVITY_RECENT_LIMIT: int = 10
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000
+    COPILOT_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    COPILOT_CACHE_MEMORY_MAX_ENTRIES: int = 1024
+    COPILOT_CACHE_MEMORY_MAX_BYTES: int = 16 * 1024 * 1024
+    COPILOT_CACHE_DB_MAX_ENTRIES: int = 100000
+    COPILOT_CACHE_DB_MAX_BYTES: int = 256 * 1024 * 1024
+    COPILOT_CACHE_COMPACT_INTERVAL_SECONDS: float = 600.0
+    INFERENCE_WORKERS: int = 1
+    INFERENCE_TORCH_THREADS: int = 0  # 0 keeps torch's default
+    INFERENCE_MAX_QUEUE: int = 8
+    INFERENCE_TIMEOUT_SECONDS: float = 30.0
+    CAPTION_BATCH_MAX_SIZE: int = 8
+    CAPTION_BATCH_MAX_WAIT_MS: float = 20.0
+    LOCAL_VISION_BACKEND: str = "pytorch"  # pytorch | int8 | onnx
+    LOCAL_VISION_ONNX_DIR: str = "models/blip-onnx"
+    LOCAL_VISION_WARMUP: bool = False  # load BLIP at startup; /health/ready stays 503 until done
+    LOCAL_VISION_WARMUP_TIMEOUT_SECONDS: float = 600.0
+    ATTRIBUTE_VOCABULARY_PATH: Optional[str] = None  # default: app/models/data/attribute_vocabulary.tsv
     
     # Optional Google Cloud settings (for when available)
     PROJECT_ID: Optional[str] = None
@@ -1,11 +1,22 @@
+import asyncio
+import logging
 import os
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 from app.config.settings import settings
+from app.cloud_services.async_database import get_async_database_client
+from app.models.view_counter import view_buffer
+from app.models.engagement import engagement_compactor
+from app.models.activity_log import activity_log
+from app.cloud_services.copilot_cache import copilot_cache
+from app.models.inference_pool import inference_pool
+from app.models.caption_batcher import caption_batcher
+from app.models import local_vision
                      # ------  feature import ------ 
-from app.routes import storyteller, copilot, pricing, recommender, products, auth, users, sales, dashboard
+from app.routes import storyteller, copilot, pricing, recommender, products, auth, users, sales, dashboard, metrics
 try:
     from app.routes import static
     HAS_STATIC = True
@@ -16,12 +27,45 @@ except ImportError:
 
 os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = settings.GOOGLE_APPLICATION_CREDENTIALS
 
+logger = logging.getLogger(__name__)
 
 
+async def warm_up_model(app: FastAPI):
+    """Load BLIP on an inference worker, then report the API ready"""
+    try:
+        await inference_pool.run(local_vision.warm_up, timeout=settings.LOCAL_VISION_WARMUP_TIMEOUT_SECONDS)
+    except Exception as e:
+        # Requests still work without the model (fallback analysis), so do not hold readiness forever
+        logger.error(f"❌ BLIP warm-up failed: {e}")
+    app.state.ready = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background writers on startup and drain them on shutdown"""
+    await view_buffer.start()
+    await engagement_compactor.start()
+    await activity_log.start()
+    await copilot_cache.start()
+    # Warm up in the background so liveness checks pass while the model loads
+    app.state.ready = not settings.LOCAL_VISION_WARMUP
+    warmup_task = asyncio.create_task(warm_up_model(app)) if settings.LOCAL_VISION_WARMUP else None
+    yield
+    if warmup_task is not None:
+        warmup_task.cancel()
+    await copilot_cache.stop()
+    await activity_log.stop()
+    await caption_batcher.stop()
+    inference_pool.shutdown()
+    await engagement_compactor.stop()
+    await view_buffer.stop()
+    get_async_database_client().shutdown()
+
 
 app = FastAPI(
     title="CraftConnect AI API",
-    description="The backend service for the CraftConnect marketplace."
+    description="The backend service for the CraftConnect marketplace.",
+    lifespan=lifespan
 )
 
 # Configure CORS for frontend-backend communication
@@ -48,6 +92,7 @@ app.include_router(recommender.router, prefix="/recs", tags=["Recommendations"])
 app.include_router(products.router)             # Products CRUD
 app.include_router(sales.router)                # Sales tracking
 app.include_router(dashboard.router)            # Dashboard analytics
+app.include_router(metrics.router)              # Operational metrics
 if HAS_STATIC:
     app.include_router(static.router)           # Static file serving
 
@@ -59,4 +104,15 @@ app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
 
 @app.get("/")
 def read_root():
-    return {"message": "CraftConnect API is running"}
\ No newline at end of file
+    return {"message": "CraftConnect API is running"}
+
+
+@app.get("/health/ready")
+def readiness():
+    """503 until the optional model warm-up has finished"""
+    body = {
+        "ready": app.state.ready,
+        "warmup": settings.LOCAL_VISION_WARMUP,
+        "model_loaded": local_vision.is_model_loaded(),
+    }
+    return JSONResponse(body, status_code=200 if app.state.ready else 503)
\ No newline at end of file
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.cloud_services.async_database import AsyncDatabase, get_async_database_client
+from app.cloud_services.codec import codec, cursor_decoder
+from app.config.settings import settings
+from app.models.response_cache import response_cache, DASHBOARD
+
+logger = logging.getLogger(__name__)
+
+# (seller_id, activity_type, description, metadata JSON, created_at)
+ActivityRow = Tuple[str, str, str, Optional[str], str]
+
+def activity_row(
+    seller_id: str,
+    activity_type: str,
+    description: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    created_at: Optional[datetime] = None
+) -> ActivityRow:
+    """Build an activity_events row for append_activities"""
+    return (
+        seller_id,
+        activity_type,
+        description,
+        codec.dumps(metadata) if metadata is not None else None,
+        (created_at or datetime.utcnow()).isoformat(),
+    )
+
+def append_activities(conn, rows: List[ActivityRow]):
+    """
+    Append activity rows inside the caller's write transaction
+
+    Opens the current UTC day's partition first if this is its first append.
+    """
+    if not rows:
+        return
+    day = datetime.utcnow().strftime("%Y-%m-%d")
+    seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'activity_events'").fetchone()
+    conn.execute(
+        "INSERT OR IGNORE INTO activity_partitions (day, first_id) VALUES (?, ?)",
+        (day, (seq[0] if seq else 0) + 1)
+    )
+    conn.executemany("""
+        INSERT INTO activity_events (seller_id, activity_type, description, metadata, created_at)
+        VALUES (?, ?, ?, ?, ?)
+    """, rows)
+
+class ActivityLog:
+    """
+    Write-behind buffer for the activity_events feed.
+
+    Services record events as they happen; they are appended with one
+    executemany per flush_interval, or sooner once max_pending are
+    buffered. Once per UTC day the flusher also drops partitions older than
+    retention_days.
+
+    While the database is unavailable at most max_buffered activities are
+    kept; the oldest are dropped past that, so an outage cannot grow the
+    buffer (or the retry transaction) without bound.
+
+    Used from the event loop thread only.
+    """
+
+    def __init__(
+        self,
+        db: AsyncDatabase,
+        flush_interval: float = 2.0,
+        max_pending: int = 500,
+        retention_days: int = 90,
+        max_buffered: int = 5000
+    ):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.retention_days = retention_days
+        self.max_buffered = max(max_buffered, max_pending)
+        self._pending: List[ActivityRow] = []
+        self._dropped = 0
+        self._pruned_day: Optional[str] = None
+        self._wake: asyncio.Event = None
+        self._task: asyncio.Task = None
+
+    def record(
+        self,
+        seller_id: str,
+        activity_type: str,
+        description: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """Buffer one activity for a seller's feed"""
+        self._pending.append(activity_row(seller_id, activity_type, description, metadata))
+        if len(self._pending) > self.max_buffered:
+            self._drop_oldest()
+        if len(self._pending) >= self.max_pending and self._wake is not None:
+            self._wake.set()
+
+    def _drop_oldest(self):
+        """Trim the buffer to max_buffered, oldest first"""
+        excess = len(self._pending) - self.max_buffered
+        if excess > 0:
+            del self._pending[:excess]
+            self._dropped += excess
+
+    def _report_dropped(self):
+        if self._dropped:
+            logger.warning(f"Activity buffer full ({self.max_buffered}); dropped {self._dropped} oldest activities")
+            self._dropped = 0
+
+    async def flush(self) -> int:
+        """
+        Append all buffered activities in a single transaction
+
+        Returns:
+            Number of activities written
+        """
+        self._report_dropped()
+        if not self._pending:
+            return 0
+
+        batch, self._pending = self._pending, []
+
+        try:
+            await self.db.run_write(append_activities, batch)
+        except Exception as e:
+            # Put the batch back in front of anything recorded meanwhile
+            logger.error(f"Failed to flush activities: {e}", exc_info=True)
+            self._pending = batch + self._pending
+            self._drop_oldest()
+            self._report_dropped()
+            return 0
+
+        # Dashboards show the latest activities
+        for seller_id in {row[0] for row in batch}:
+            response_cache.invalidate(seller_id, DASHBOARD)
+        return len(batch)
+
+    @staticmethod
+    def _prune(conn, cutoff_day: str) -> int:
+        row = conn.execute(
+            "SELECT first_id FROM activity_partitions WHERE day >= ? ORDER BY day LIMIT 1", (cutoff_day,)
+        ).fetchone()
+        if row is None:
+            # Nothing kept: everything appended so far is older than the cutoff
+            seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'activity_events'").fetchone()
+            boundary = (seq[0] if seq else 0) + 1
+        else:
+            boundary = row[0]
+        deleted = conn.execute("DELETE FROM activity_events WHERE id < ?", (boundary,)).rowcount
+        conn.execute("DELETE FROM activity_partitions WHERE day < ?", (cutoff_day,))
+        return deleted
+
+    async def prune(self, now: Optional[datetime] = None) -> int:
+        """
+        Drop day partitions older than retention_days
+
+        Returns:
+            Number of activities deleted
+        """
+        cutoff_day = ((now or datetime.utcnow()) - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        deleted = await self.db.run_write(self._prune, cutoff_day)
+        if deleted:
+            logger.info(f"Pruned {deleted} activities before {cutoff_day}")
+        return deleted
+
+    async def recent(self, seller_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Latest activities for a seller, newest first"""
+        def _fetch(conn):
+            cursor = conn.execute("""
+                SELECT id, activity_type, description, metadata, created_at FROM activity_events
+                WHERE seller_id = ?
+                ORDER BY id DESC
+                LIMIT ?
+            """, (seller_id, limit))
+            decode = cursor_decoder(cursor, ["metadata"])
+            return [decode(row) for row in cursor.fetchall()]
+
+        return await self.db.run_read(_fetch)
+
+    async def _run(self):
+        """Flush on the interval or when the size threshold wakes us; prune daily"""
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+            today = datetime.utcnow().strftime("%Y-%m-%d")
+            if self._pruned_day != today:
+                try:
+                    await self.prune()
+                    self._pruned_day = today
+                except Exception as e:
+                    logger.error(f"Activity pruning failed: {e}", exc_info=True)
+
+    async def start(self):
+        """Start the background flusher"""
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+            logger.info("Activity log flusher started")
+
+    async def stop(self):
+        """Stop the flusher and write whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wake = None
+        written = await self.flush()
+        logger.info(f"Activity log flusher stopped ({written} activities flushed)")
+
+# Create singleton instance
+activity_log = ActivityLog(
+    get_async_database_client(),
+    flush_interval=settings.ACTIVITY_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.ACTIVITY_FLUSH_MAX_PENDING,
+    retention_days=settings.ACTIVITY_RETENTION_DAYS,
+    max_buffered=settings.ACTIVITY_BUFFER_MAX_ROWS,
+)
@@ -0,0 +1,125 @@
+"""
+Caption attribute extraction shared by the vision backends.
+
+The material, color and category vocabularies live in a data file
+(data/attribute_vocabulary.tsv, or ATTRIBUTE_VOCABULARY_PATH) and are
+compiled once into a single regex. The alternation is built from a trie of
+all terms, so matching walks shared prefixes instead of trying every term
+at every position, and a caption costs one scan however large the
+vocabulary grows.
+"""
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+VOCABULARY_PATH = Path(__file__).parent / "data" / "attribute_vocabulary.tsv"
+
+# Kinds every caller can rely on, present even if the vocabulary has no such lines
+KINDS = ("material", "color", "category")
+
+
+def _normalize(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Regex alternation for terms, factored into a trie; longer terms win"""
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}  # a term ends here
+
+    def build(node: dict) -> str:
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1:
+            body, grouped = branches[0], False
+        else:
+            body, grouped = "(?:" + "|".join(branches) + ")", True
+        if "" not in node:
+            return body
+        # Greedy "?" tries the longer continuation before stopping at this term
+        return f"{body}?" if grouped else f"(?:{body})?"
+
+    return build(trie)
+
+
+def read_vocabulary(path) -> List[Tuple[str, str, str]]:
+    """(kind, attribute, term) entries from kind<TAB>attribute<TAB>comma-separated terms lines"""
+    entries = []
+    with open(path, encoding="utf-8") as vocabulary:
+        for line_number, line in enumerate(vocabulary, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split("\t")
+            if len(fields) != 3:
+                raise ValueError(f"{path}:{line_number}: expected kind, attribute and terms separated by tabs")
+            kind, attribute, terms = (field.strip() for field in fields)
+            entries.extend((kind, attribute, term) for term in terms.split(",") if term.strip())
+    return entries
+
+
+class AttributeExtractor:
+    """
+    Finds vocabulary terms in captions and maps them to attributes by kind.
+
+    A term that contains another term from a different kind also reports
+    that kind's attributes: "stained glass" is both the glasswork category
+    and the glass material, although the regex only matches the longer term.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, str]]):
+        self._attributes: Dict[str, List[Tuple[str, str]]] = {}
+        for kind, attribute, term in entries:
+            targets = self._attributes.setdefault(_normalize(term), [])
+            if (kind, attribute) not in targets:
+                targets.append((kind, attribute))
+        self.kinds = list(dict.fromkeys([*KINDS, *(kind for targets in self._attributes.values() for kind, _ in targets)]))
+
+        # Closure over word n-grams, so a match on a long term never hides a shorter one of another kind
+        inherited = {}
+        for term, targets in self._attributes.items():
+            words = term.split()
+            own_kinds = {kind for kind, _ in targets}
+            extra = []
+            for start in range(len(words)):
+                for end in range(start + 1, len(words) + 1):
+                    for kind, attribute in self._attributes.get(" ".join(words[start:end]), ()):
+                        if kind not in own_kinds and (kind, attribute) not in extra:
+                            extra.append((kind, attribute))
+            if extra:
+                inherited[term] = extra
+        for term, extra in inherited.items():
+            self._attributes[term] = self._attributes[term] + extra
+
+        # Optional plural suffix; word boundaries keep "tan" out of "tangerine"
+        self._pattern = re.compile(rf"\b({_trie_pattern(self._attributes)})(?:e?s)?\b", re.IGNORECASE)
+        logger.info(f"✅ Attribute vocabulary compiled ({len(self._attributes)} terms)")
+
+    @classmethod
+    def from_file(cls, path) -> "AttributeExtractor":
+        return cls(read_vocabulary(path))
+
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        """Attributes per kind, in order of first mention"""
+        found: Dict[str, List[str]] = {kind: [] for kind in self.kinds}
+        for match in self._pattern.finditer(text):
+            for kind, attribute in self._attributes[_normalize(match.group(1))]:
+                if attribute not in found[kind]:
+                    found[kind].append(attribute)
+        return found
+
+# Create singleton instance
+attribute_extractor = AttributeExtractor.from_file(settings.ATTRIBUTE_VOCABULARY_PATH or VOCABULARY_PATH)
@@ -0,0 +1,173 @@
+"""
+Inference backends for the local BLIP captioning model.
+
+- pytorch: full-precision PyTorch (GPU when available)
+- int8:    PyTorch with Linear layers dynamically quantized to int8, CPU only
+- onnx:    vision encoder and text decoder exported to ONNX and run with
+           ONNX Runtime; captions are decoded greedily like model.generate
+
+Every backend exposes caption(images) -> captions, so local_vision does not
+care which one is loaded.
+"""
+import logging
+from pathlib import Path
+from typing import List
+
+import torch
+from PIL import Image
+from transformers import BlipConfig, BlipProcessor, BlipForConditionalGeneration
+
+logger = logging.getLogger(__name__)
+
+BLIP_MODEL_ID = "Salesforce/blip-image-captioning-base"
+MAX_CAPTION_LENGTH = 50
+ONNX_OPSET = 14
+
+
+class PytorchBackend:
+    """Full-precision BLIP as loaded from the Hugging Face hub"""
+    name = "pytorch"
+
+    def __init__(self):
+        self.processor = BlipProcessor.from_pretrained(BLIP_MODEL_ID)
+        self.model = BlipForConditionalGeneration.from_pretrained(BLIP_MODEL_ID).eval()
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.model = self.model.to(self.device)
+
+    def caption(self, images: List[Image.Image]) -> List[str]:
+        # BLIP resizes every image to the same resolution, so the batch needs no padding
+        inputs = self.processor(images=images, return_tensors="pt").to(self.device)
+        with torch.inference_mode():
+            out = self.model.generate(**inputs, max_length=MAX_CAPTION_LENGTH)
+        return self.processor.batch_decode(out, skip_special_tokens=True)
+
+
+class Int8Backend(PytorchBackend):
+    """BLIP with dynamic int8 quantization of every Linear layer (CPU)"""
+    name = "int8"
+
+    def __init__(self):
+        super().__init__()
+        self.device = "cpu"
+        self.model = torch.ao.quantization.quantize_dynamic(
+            self.model.to("cpu"), {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+
+class _VisionEncoder(torch.nn.Module):
+    def __init__(self, model: BlipForConditionalGeneration):
+        super().__init__()
+        self.vision_model = model.vision_model
+
+    def forward(self, pixel_values):
+        return self.vision_model(pixel_values=pixel_values)[0]
+
+
+class _TextDecoderStep(torch.nn.Module):
+    """Next-token logits for a prefix; no KV cache, captions are short"""
+    def __init__(self, model: BlipForConditionalGeneration):
+        super().__init__()
+        self.text_decoder = model.text_decoder
+
+    def forward(self, input_ids, attention_mask, image_embeds):
+        logits = self.text_decoder(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            encoder_hidden_states=image_embeds,
+            return_dict=True,
+        ).logits
+        return logits[:, -1, :]
+
+
+def export_onnx(output_dir: Path):
+    """Export BLIP's vision encoder and text decoder step to output_dir"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    model = BlipForConditionalGeneration.from_pretrained(BLIP_MODEL_ID).eval()
+    size = model.config.vision_config.image_size
+
+    pixel_values = torch.zeros(1, 3, size, size)
+    with torch.inference_mode():
+        image_embeds = model.vision_model(pixel_values=pixel_values)[0]
+
+    torch.onnx.export(
+        _VisionEncoder(model), (pixel_values,), str(output_dir / "vision_encoder.onnx"),
+        input_names=["pixel_values"], output_names=["image_embeds"],
+        dynamic_axes={"pixel_values": {0: "batch"}, "image_embeds": {0: "batch"}},
+        opset_version=ONNX_OPSET,
+    )
+
+    input_ids = torch.full((1, 2), model.config.text_config.bos_token_id, dtype=torch.long)
+    torch.onnx.export(
+        _TextDecoderStep(model), (input_ids, torch.ones_like(input_ids), image_embeds),
+        str(output_dir / "text_decoder.onnx"),
+        input_names=["input_ids", "attention_mask", "image_embeds"], output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "image_embeds": {0: "batch"},
+            "logits": {0: "batch"},
+        },
+        opset_version=ONNX_OPSET,
+    )
+    logger.info(f"✅ Exported BLIP to ONNX in {output_dir}")
+
+
+class OnnxBackend:
+    """BLIP on ONNX Runtime, exported on first use"""
+    name = "onnx"
+
+    def __init__(self, model_dir: str, intra_op_threads: int = 0):
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise RuntimeError("LOCAL_VISION_BACKEND=onnx requires the onnxruntime package") from e
+        import numpy as np
+        self.np = np
+
+        model_dir = Path(model_dir)
+        if not (model_dir / "text_decoder.onnx").exists():
+            export_onnx(model_dir)
+
+        self.processor = BlipProcessor.from_pretrained(BLIP_MODEL_ID)
+        text_config = BlipConfig.from_pretrained(BLIP_MODEL_ID).text_config
+        self.bos_token_id = text_config.bos_token_id
+        self.eos_token_id = text_config.sep_token_id
+        self.pad_token_id = text_config.pad_token_id
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        providers = ["CPUExecutionProvider"]
+        self.encoder = onnxruntime.InferenceSession(str(model_dir / "vision_encoder.onnx"), options, providers=providers)
+        self.decoder = onnxruntime.InferenceSession(str(model_dir / "text_decoder.onnx"), options, providers=providers)
+
+    def caption(self, images: List[Image.Image]) -> List[str]:
+        np = self.np
+        pixel_values = self.processor(images=images, return_tensors="np")["pixel_values"].astype(np.float32)
+        image_embeds = self.encoder.run(None, {"pixel_values": pixel_values})[0]
+
+        # Greedy decoding, matching model.generate's defaults for BLIP
+        input_ids = np.full((len(images), 1), self.bos_token_id, dtype=np.int64)
+        finished = np.zeros(len(images), dtype=bool)
+        for _ in range(MAX_CAPTION_LENGTH - 1):
+            logits = self.decoder.run(None, {
+                "input_ids": input_ids,
+                "attention_mask": np.ones_like(input_ids),
+                "image_embeds": image_embeds,
+            })[0]
+            next_ids = np.where(finished, self.pad_token_id, logits.argmax(-1))
+            input_ids = np.concatenate([input_ids, next_ids[:, None]], axis=1)
+            finished |= next_ids == self.eos_token_id
+            if finished.all():
+                break
+        return self.processor.batch_decode(input_ids, skip_special_tokens=True)
+
+
+def load_backend(name: str, onnx_dir: str = "models/blip-onnx", intra_op_threads: int = 0):
+    """Instantiate a backend by name: pytorch, int8 or onnx"""
+    if name == "pytorch":
+        return PytorchBackend()
+    if name == "int8":
+        return Int8Backend()
+    if name == "onnx":
+        return OnnxBackend(onnx_dir, intra_op_threads)
+    raise ValueError(f"Unknown LOCAL_VISION_BACKEND: {name}")
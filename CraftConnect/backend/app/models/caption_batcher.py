@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from app.config.settings import settings
+from app.models import local_vision
+from app.models.inference_pool import InferencePool, inference_pool
+
+logger = logging.getLogger(__name__)
+
+class CaptionBatcher:
+    """
+    Micro-batching front-end for the local BLIP model.
+
+    Requests are collected until max_batch_size images are waiting or
+    max_wait_ms has passed since the first one, then analyzed with one
+    batched call on the inference pool and the results scattered back to
+    each caller. The pool's admission limit applies per batch, so a shed
+    batch fails all of its requests with InferenceQueueFull.
+
+    Used from the event loop thread only.
+    """
+
+    def __init__(
+        self,
+        pool: InferencePool,
+        analyze_batch: Callable[[List[bytes]], List[dict]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 20.0
+    ):
+        self.pool = pool
+        self.analyze_batch = analyze_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: asyncio.Queue = None
+        self._task: asyncio.Task = None
+        self._dispatching: Set[asyncio.Task] = set()
+        self._batches = 0
+        self._images = 0
+
+    async def analyze(self, image_bytes: bytes) -> dict:
+        """Analyze one image as part of the next batch"""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image_bytes, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[bytes, asyncio.Future]]:
+        """Wait for one request, then gather more until the batch is full or the wait expires"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait_ms / 1000
+        try:
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # Stopping: requests already taken off the queue would never be answered
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Caption batcher stopped"))
+            raise
+        # Callers that gave up while waiting are not analyzed
+        return [(image_bytes, future) for image_bytes, future in batch if not future.done()]
+
+    async def _dispatch(self, batch: List[Tuple[bytes, asyncio.Future]]):
+        try:
+            results = await self.pool.run(self.analyze_batch, [image_bytes for image_bytes, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._batches += 1
+        self._images += len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            if batch:
+                # Keep collecting while this batch runs; the pool bounds concurrency
+                task = asyncio.create_task(self._dispatch(batch))
+                self._dispatching.add(task)
+                task.add_done_callback(self._dispatching.discard)
+
+    async def stop(self):
+        """Stop collecting; requests already dispatched still complete"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("Caption batcher stopped"))
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch counts and average batch size"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self._batches,
+            "images": self._images,
+            "avg_batch_size": round(self._images / self._batches, 2) if self._batches else 0.0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+# Create singleton instance
+caption_batcher = CaptionBatcher(
+    inference_pool,
+    local_vision.analyze_images_locally,
+    max_batch_size=settings.CAPTION_BATCH_MAX_SIZE,
+    max_wait_ms=settings.CAPTION_BATCH_MAX_WAIT_MS,
+)
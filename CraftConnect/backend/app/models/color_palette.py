@@ -0,0 +1,156 @@
+"""
+Dominant-color palette extraction for product photos.
+
+The photo is downsampled to SAMPLE_SIZE pixels per side and read as a NumPy
+view over its pixel buffer. Pixels are binned to 5 bits per channel and a
+weighted k-means runs over the distinct bins rather than every pixel, so an
+image costs a few milliseconds whatever its resolution. Cluster centres are
+named through a 32x32x32 lookup table, built once at import by nearest
+neighbour in CIELAB.
+"""
+from typing import Dict, List, Sequence
+
+import numpy as np
+from PIL import Image
+
+SAMPLE_SIZE = 64
+QUANT_BITS = 5
+LEVELS = 1 << QUANT_BITS
+BIN_WIDTH = 256 // LEVELS
+
+# Reference colors for naming; names follow the caption color vocabulary
+NAMED_COLORS: Dict[str, Sequence[int]] = {
+    "white": (245, 245, 245),
+    "cream": (240, 228, 200),
+    "beige": (214, 196, 160),
+    "silver": (192, 192, 192),
+    "gray": (128, 128, 128),
+    "black": (20, 20, 20),
+    "red": (200, 30, 35),
+    "maroon": (110, 20, 30),
+    "pink": (240, 150, 180),
+    "orange": (240, 130, 30),
+    "brown": (120, 75, 40),
+    "tan": (190, 150, 105),
+    "yellow": (245, 215, 50),
+    "gold": (200, 160, 50),
+    "olive": (120, 120, 40),
+    "green": (50, 140, 60),
+    "teal": (30, 130, 130),
+    "light blue": (150, 195, 230),
+    "blue": (40, 90, 200),
+    "navy": (15, 25, 115),
+    "purple": (120, 60, 150),
+}
+
+
+def _srgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """Convert an (N, 3) array of 0-255 sRGB values to CIELAB (D65)"""
+    c = rgb.astype(np.float64) / 255.0
+    c = np.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+    xyz = c @ np.array([
+        [0.4124, 0.3576, 0.1805],
+        [0.2126, 0.7152, 0.0722],
+        [0.0193, 0.1192, 0.9505],
+    ]).T / np.array([0.95047, 1.0, 1.08883])
+    f = np.where(xyz > 0.008856, np.cbrt(xyz), 7.787 * xyz + 16 / 116)
+    return np.stack([116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])], axis=1)
+
+
+def _build_lookup() -> np.ndarray:
+    """Index into NAMED_COLORS for the centre of every 5-bit RGB bin"""
+    centres = np.arange(LEVELS) * BIN_WIDTH + BIN_WIDTH // 2
+    grid = np.stack(np.meshgrid(centres, centres, centres, indexing="ij"), axis=-1).reshape(-1, 3)
+    named = _srgb_to_lab(np.array(list(NAMED_COLORS.values())))
+    distances = ((_srgb_to_lab(grid)[:, None, :] - named[None, :, :]) ** 2).sum(axis=-1)
+    return distances.argmin(axis=1).astype(np.uint8).reshape(LEVELS, LEVELS, LEVELS)
+
+
+_NAMES = list(NAMED_COLORS)
+_LOOKUP = _build_lookup()
+
+
+def color_name(rgb: Sequence[float]) -> str:
+    """Nearest named color for an RGB triple"""
+    r, g, b = (min(int(c), 255) >> (8 - QUANT_BITS) for c in rgb)
+    return _NAMES[_LOOKUP[r, g, b]]
+
+
+def _kmeans(colors: np.ndarray, weights: np.ndarray, k: int, iterations: int) -> tuple:
+    """Weighted k-means with deterministic farthest-point seeding; returns (centres, cluster weights)"""
+    centres = [colors[weights.argmax()]]
+    nearest = ((colors - centres[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        centres.append(colors[(nearest * weights).argmax()])
+        nearest = np.minimum(nearest, ((colors - centres[-1]) ** 2).sum(axis=1))
+    centres = np.array(centres)
+
+    for _ in range(iterations):
+        labels = ((colors[:, None, :] - centres[None, :, :]) ** 2).sum(axis=-1).argmin(axis=1)
+        totals = np.bincount(labels, weights, minlength=k)
+        sums = np.stack([np.bincount(labels, weights * colors[:, c], minlength=k) for c in range(3)], axis=1)
+        # An emptied cluster keeps its previous centre
+        updated = np.where(totals[:, None] > 0, sums / np.maximum(totals, 1)[:, None], centres)
+        converged = np.abs(updated - centres).max() < 0.5
+        centres = updated
+        if converged:
+            break
+
+    labels = ((colors[:, None, :] - centres[None, :, :]) ** 2).sum(axis=-1).argmin(axis=1)
+    return centres, np.bincount(labels, weights, minlength=k)
+
+
+def extract_palette(
+    image: Image.Image,
+    top: int = 3,
+    k: int = 6,
+    min_share: float = 0.03,
+    iterations: int = 10
+) -> List[dict]:
+    """
+    Dominant colors of an image.
+
+    Args:
+        image: Any PIL image
+        top: Number of named colors to return
+        k: Number of k-means clusters; clusters with the same name are merged
+        min_share: Drop colors covering less of the image, e.g. blended edges
+
+    Returns:
+        list: Up to top dicts with name, hex and pixel share, largest share first
+    """
+    # Downsample before converting so a large upload is never copied at full size
+    scale = SAMPLE_SIZE / max(image.size)
+    if scale < 1:
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.resize(size, Image.BILINEAR, reducing_gap=2.0)
+    pixels = np.asarray(image.convert("RGB")).reshape(-1, 3)
+
+    bins = pixels >> (8 - QUANT_BITS)
+    codes = (bins[:, 0].astype(np.int32) << (2 * QUANT_BITS)) | (bins[:, 1].astype(np.int32) << QUANT_BITS) | bins[:, 2]
+    codes, counts = np.unique(codes, return_counts=True)
+    mask = LEVELS - 1
+    colors = np.stack(
+        [codes >> (2 * QUANT_BITS), (codes >> QUANT_BITS) & mask, codes & mask], axis=1
+    ) * BIN_WIDTH + BIN_WIDTH // 2
+    colors = colors.astype(np.float64)
+
+    centres, totals = _kmeans(colors, counts.astype(np.float64), min(k, len(codes)), iterations)
+    shares = totals / totals.sum()
+
+    palette: Dict[str, dict] = {}
+    for index in np.argsort(-shares):
+        if shares[index] == 0:
+            continue
+        name = color_name(centres[index])
+        if name in palette:
+            palette[name]["share"] += float(shares[index])
+        else:
+            r, g, b = (int(round(c)) for c in centres[index])
+            palette[name] = {"name": name, "hex": f"#{r:02x}{g:02x}{b:02x}", "share": float(shares[index])}
+
+    ranked = sorted(palette.values(), key=lambda entry: entry["share"], reverse=True)
+    ranked = [entry for entry in ranked if entry["share"] >= min_share][:top] or ranked[:1]
+    for entry in ranked:
+        entry["share"] = round(entry["share"], 3)
+    return ranked
@@ -1,59 +1,141 @@
 import logging
-from typing import Dict, Any
-from app.cloud_services.database import get_database_client
-from app.schemas.dashboard import DashboardStatsResponse
+from typing import Dict, Any, Optional
+from datetime import datetime, timedelta
+
+from app.cloud_services.async_database import get_async_database_client
+from app.cloud_services.codec import cursor_decoder
+from app.config.settings import settings
+from app.models.activity_log import activity_log
+from app.models.engagement import EngagementService, window_start
+from app.models.response_cache import response_cache, DASHBOARD
+from app.schemas.dashboard import DashboardStatsResponse, RecentActivity
 
 logger = logging.getLogger(__name__)
 
+# seller_dashboard columns stored as JSON text
+SUMMARY_JSON_FIELDS = [
+    'products_by_status', 'products_by_category', 'revenue_by_currency',
+    'revenue_30d_by_currency', 'top_viewed', 'top_liked', 'top_selling',
+]
+
+WINDOW_DAYS = 30
+
 class DashboardService:
+    """
+    Reads the per-seller summary that triggers maintain on every product,
+    like, view and sale write (migration 0009), plus the latest entries of
+    the activity feed.
+    """
+    
     def __init__(self):
-        self.db = get_database_client()
+        self.db = get_async_database_client()
+    
+    @staticmethod
+    def _fetch_summary(conn, seller_id: str) -> Optional[Dict[str, Any]]:
+        cursor = conn.execute("SELECT * FROM seller_dashboard WHERE seller_id = ?", (seller_id,))
+        row = cursor.fetchone()
+        return cursor_decoder(cursor, SUMMARY_JSON_FIELDS)(row) if row else None
+    
+    @staticmethod
+    def _refresh_window(conn, seller_id: str, today: str) -> Optional[Dict[str, Any]]:
+        """
+        Re-derive the 30-day counters from engagement_counters and sales_daily
+        
+        Runs at most once per seller per UTC day, on the first dashboard read;
+        between refreshes the triggers keep the counters current.
+        """
+        start = window_start(timedelta(days=WINDOW_DAYS), datetime.strptime(today, "%Y-%m-%d"))
+        engagement = EngagementService.seller_window_counts(conn, seller_id, start)
+        cursor = conn.execute("""
+            UPDATE seller_dashboard SET
+                views_30d = :views,
+                likes_30d = :likes,
+                sales_30d = (SELECT COALESCE(SUM(sales_count), 0) FROM sales_daily
+                             WHERE seller_id = :seller AND day >= :start),
+                revenue_30d_by_currency = (
+                    SELECT json_group_object(currency, revenue) FROM
+                    (SELECT currency, SUM(revenue) AS revenue FROM sales_daily
+                     WHERE seller_id = :seller AND day >= :start GROUP BY currency)
+                ),
+                window_day = :today
+            WHERE seller_id = :seller
+            RETURNING *
+        """, {"seller": seller_id, "start": start, "today": today, **engagement})
+        rows = cursor.fetchall()
+        return cursor_decoder(cursor, SUMMARY_JSON_FIELDS)(rows[0]) if rows else None
     
     async def get_dashboard_data(self, user_id: str) -> DashboardStatsResponse:
-        """Get dashboard statistics for user"""
+        """Get dashboard statistics for user, served from the response cache"""
         try:
-            # Get product stats
-            products = self.db.query_collection("products", "user_id = ?", (user_id,))
-            
-            product_stats = {
-                "total_products": len(products),
-                "total_views": sum(p.get("views_count", 0) for p in products),
-                "total_likes": sum(p.get("likes_count", 0) for p in products)
-            }
-            
-            # Get sales stats
-            import sqlite3
-            sales_stats = {"total_sales": 0, "total_revenue": 0.0}
-            try:
-                with sqlite3.connect(self.db.db_path) as conn:
-                    cursor = conn.execute("SELECT COUNT(*), SUM(amount) FROM sales WHERE seller_id = ?", (user_id,))
-                    row = cursor.fetchone()
-                    if row:
-                        sales_stats["total_sales"] = row[0] or 0
-                        sales_stats["total_revenue"] = row[1] or 0.0
-            except:
-                pass
-            
-            return DashboardStatsResponse(
-                product_count=product_stats["total_products"],
-                total_views=product_stats["total_views"],
-                total_likes=product_stats["total_likes"],
-                total_sales=sales_stats["total_sales"],
-                total_revenue=sales_stats["total_revenue"],
-                recent_activity=[],
-                top_products=products[:5] if products else []
-            )
-            
+            return await response_cache.get_or_load(DASHBOARD, user_id, None, lambda: self._build(user_id))
         except Exception as e:
             logger.error(f"Failed to get dashboard data: {e}", exc_info=True)
-            return DashboardStatsResponse(
-                product_count=0,
-                total_views=0,
-                total_likes=0,
-                total_sales=0,
-                total_revenue=0.0,
-                recent_activity=[],
-                top_products=[]
+            return self._empty_response()
+    
+    async def _build(self, user_id: str) -> DashboardStatsResponse:
+        """Assemble the dashboard from the seller summary and activity feed"""
+        summary = await self.db.run_read(self._fetch_summary, user_id)
+        
+        today = datetime.utcnow().strftime("%Y-%m-%d")
+        if summary and summary["window_day"] != today:
+            summary = await self.db.run_write(self._refresh_window, user_id, today)
+        
+        if not summary:
+            return self._empty_response()
+        
+        # Report revenue in the seller's main currency rather than mixing currencies
+        revenue = summary["revenue_by_currency"] or {}
+        currency = max(revenue, key=revenue.get) if revenue else "USD"
+        revenue_30d = summary["revenue_30d_by_currency"] or {}
+        
+        recent_activities = [
+            RecentActivity(
+                activity_id=str(event["id"]),
+                activity_type=event["activity_type"],
+                description=event["description"],
+                timestamp=event["created_at"],
+                metadata=event["metadata"]
             )
+            for event in await activity_log.recent(user_id, settings.ACTIVITY_RECENT_LIMIT)
+        ]
+        
+        total_products = summary["total_products"]
+        total_views = summary["total_views"]
+        total_likes = summary["total_likes"]
+        total_sales = summary["total_sales"]
+        
+        return DashboardStatsResponse(
+            total_products=total_products,
+            products_by_status={k: v for k, v in summary["products_by_status"].items() if v},
+            products_by_category={k: v for k, v in summary["products_by_category"].items() if v},
+            total_views=total_views,
+            total_likes=total_likes,
+            views_last_30_days=summary["views_30d"],
+            likes_last_30_days=summary["likes_30d"],
+            total_sales=total_sales,
+            total_revenue=round(revenue.get(currency, 0.0), 2),
+            revenue_currency=currency,
+            sales_last_30_days=summary["sales_30d"],
+            revenue_last_30_days=round(revenue_30d.get(currency, 0.0), 2),
+            top_viewed_products=summary["top_viewed"],
+            top_liked_products=summary["top_liked"],
+            top_selling_products=summary["top_selling"],
+            recent_activities=recent_activities,
+            average_views_per_product=round(total_views / total_products, 2) if total_products else 0.0,
+            average_likes_per_product=round(total_likes / total_products, 2) if total_products else 0.0,
+            conversion_rate=round(total_sales / total_views * 100, 2) if total_views else 0.0
+        )
+    
+    @staticmethod
+    def _empty_response() -> DashboardStatsResponse:
+        return DashboardStatsResponse(
+            total_products=0,
+            products_by_status={},
+            products_by_category={},
+            total_views=0,
+            total_likes=0,
+            views_last_30_days=0,
+            likes_last_30_days=0
+        )
 
-dashboard_service = DashboardService()
\ No newline at end of file
+dashboard_service = DashboardService()
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.cloud_services.async_database import AsyncDatabase, get_async_database_client
+from app.cloud_services.codec import cursor_decoder
+from app.cloud_services.database import JSON_FIELDS
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Trending windows: name -> length
+TRENDING_WINDOWS = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+}
+
+# A like counts as this many views in the trending score
+LIKE_WEIGHT = 5
+
+def window_start(length: timedelta, now: Optional[datetime] = None) -> str:
+    """
+    First engagement_counters bucket inside a window ending now
+
+    Windows of whole days start at a day boundary so compacted daily
+    buckets are included whole; shorter windows start at an hour.
+    """
+    start = (now or datetime.utcnow()) - length
+    if length >= timedelta(days=1) and length % timedelta(days=1) == timedelta(0):
+        return (start + timedelta(days=1)).strftime("%Y-%m-%d")
+    return (start + timedelta(hours=1)).strftime("%Y-%m-%dT%H")
+
+class EngagementService:
+    """Windowed view/like queries over engagement_counters"""
+
+    def __init__(self, db: AsyncDatabase):
+        self.db = db
+
+    @staticmethod
+    def seller_window_counts(conn, seller_id: str, start: str) -> Dict[str, int]:
+        """Views and likes for a seller's products from bucket `start` onwards"""
+        rows = conn.execute("""
+            SELECT event, SUM(count) AS total FROM engagement_counters
+            WHERE seller_id = ? AND event IN ('view', 'like') AND bucket >= ?
+            GROUP BY event
+        """, (seller_id, start)).fetchall()
+        counts = {row["event"]: row["total"] for row in rows}
+        return {"views": counts.get("view", 0), "likes": counts.get("like", 0)}
+
+    async def trending_products(
+        self,
+        window: str = "24h",
+        category: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Tuple[dict, int]]:
+        """
+        Public products ranked by views + LIKE_WEIGHT * likes in the window
+
+        Reads only the buckets inside the window, so the cost does not grow
+        with lifetime traffic.
+
+        Returns:
+            (product document, score) pairs, best first
+        """
+        if window not in TRENDING_WINDOWS:
+            raise ValueError(f"Unsupported window: {window}")
+        start = window_start(TRENDING_WINDOWS[window])
+
+        where = ["p.status = 'public'"]
+        params: list = [LIKE_WEIGHT, start]
+        if category:
+            where.append("p.category = ?")
+            params.append(category)
+        params.append(limit)
+
+        def _fetch(conn):
+            cursor = conn.execute(f"""
+                SELECT p.*, e.score
+                FROM (
+                    SELECT product_id,
+                           SUM(CASE event WHEN 'like' THEN count * ? ELSE count END) AS score
+                    FROM engagement_counters
+                    WHERE event IN ('view', 'like') AND bucket >= ?
+                    GROUP BY product_id
+                ) e
+                JOIN products p ON p.product_id = e.product_id
+                WHERE {" AND ".join(where)}
+                ORDER BY e.score DESC, p.product_id
+                LIMIT ?
+            """, params)
+            decode = cursor_decoder(cursor, JSON_FIELDS)
+            return [decode(row) for row in cursor.fetchall()]
+
+        rows = await self.db.run_read(_fetch)
+        return [(row, row.pop("score")) for row in rows]
+
+class EngagementCompactor:
+    """
+    Retention job for engagement_counters.
+
+    Hourly buckets older than hourly_retention_days are folded into one
+    daily bucket per product and event; daily buckets older than
+    daily_retention_days are deleted. Each pass is one write transaction.
+    """
+
+    def __init__(
+        self,
+        db: AsyncDatabase,
+        hourly_retention_days: int = 7,
+        daily_retention_days: int = 365,
+        interval: float = 3600.0
+    ):
+        self.db = db
+        self.hourly_retention_days = hourly_retention_days
+        self.daily_retention_days = daily_retention_days
+        self.interval = interval
+        self._task: asyncio.Task = None
+
+    @staticmethod
+    def _compact(conn, hourly_cutoff: str, daily_cutoff: str) -> Tuple[int, int]:
+        # Only whole days before hourly_cutoff ('YYYY-MM-DD') are folded
+        conn.execute("""
+            INSERT INTO engagement_counters (product_id, event, bucket, seller_id, count)
+            SELECT product_id, event, substr(bucket, 1, 10), seller_id, SUM(count)
+            FROM engagement_counters
+            WHERE event IN ('view', 'like') AND bucket < ? AND length(bucket) = 13
+            GROUP BY product_id, event, substr(bucket, 1, 10)
+            ON CONFLICT (product_id, event, bucket) DO UPDATE SET count = count + excluded.count
+        """, (hourly_cutoff,))
+        folded = conn.execute("""
+            DELETE FROM engagement_counters
+            WHERE event IN ('view', 'like') AND bucket < ? AND length(bucket) = 13
+        """, (hourly_cutoff,)).rowcount
+        expired = conn.execute("""
+            DELETE FROM engagement_counters
+            WHERE event IN ('view', 'like') AND bucket < ?
+        """, (daily_cutoff,)).rowcount
+        return folded, expired
+
+    async def compact(self, now: Optional[datetime] = None) -> Tuple[int, int]:
+        """
+        Run one retention pass
+
+        Returns:
+            (hourly rows folded into daily rows, expired rows deleted)
+        """
+        now = now or datetime.utcnow()
+        hourly_cutoff = (now - timedelta(days=self.hourly_retention_days)).strftime("%Y-%m-%d")
+        daily_cutoff = (now - timedelta(days=self.daily_retention_days)).strftime("%Y-%m-%d")
+        folded, expired = await self.db.run_write(self._compact, hourly_cutoff, daily_cutoff)
+        if folded or expired:
+            logger.info(f"Engagement counters compacted: {folded} hourly rows folded, {expired} expired")
+        return folded, expired
+
+    async def _run(self):
+        while True:
+            try:
+                await self.compact()
+            except Exception as e:
+                logger.error(f"Engagement compaction failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        """Start the periodic compaction task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Engagement compactor started")
+
+    async def stop(self):
+        """Stop the compaction task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+# Create singleton instances
+engagement_service = EngagementService(get_async_database_client())
+engagement_compactor = EngagementCompactor(
+    get_async_database_client(),
+    hourly_retention_days=settings.ENGAGEMENT_HOURLY_RETENTION_DAYS,
+    daily_retention_days=settings.ENGAGEMENT_DAILY_RETENTION_DAYS,
+    interval=settings.ENGAGEMENT_COMPACT_INTERVAL_SECONDS,
+)
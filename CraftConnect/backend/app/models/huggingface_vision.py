@@ -9,6 +9,8 @@ from PIL import Image
 import requests
 import logging
 
+from app.models.attribute_extractor import attribute_extractor
+
 logger = logging.getLogger(__name__)
 
 # Hugging Face API endpoint for Vision-Language models
@@ -84,26 +86,10 @@ def extract_attributes_from_caption(caption: str) -> dict:
     This is a simple implementation - can be enhanced with more sophisticated NLP.
     """
     caption_lower = caption.lower()
+    attributes = attribute_extractor.extract(caption)
     
-    # Extract colors (simple keyword matching)
-    colors = []
-    color_keywords = ["white", "black", "red", "blue", "green", "yellow", "pink", "purple", "orange", "brown", "gray", "golden", "silver"]
-    for color in color_keywords:
-        if color in caption_lower:
-            colors.append(color)
-    
-    if not colors:
-        colors = ["natural", "neutral"]
-    
-    # Extract materials (simple keyword matching)
-    materials = []
-    material_keywords = ["wood", "metal", "ceramic", "clay", "fabric", "textile", "glass", "leather", "plastic", "stone"]
-    for material in material_keywords:
-        if material in caption_lower:
-            materials.append(material)
-    
-    if not materials:
-        materials = ["handcrafted", "artisan"]
+    colors = attributes["color"] or ["natural", "neutral"]
+    materials = attributes["material"] or ["handcrafted", "artisan"]
     
     # Generate title from caption
     suggested_title = caption[:60] if len(caption) > 60 else caption
@@ -118,6 +104,7 @@ def extract_attributes_from_caption(caption: str) -> dict:
         "suggested_title": suggested_title.title(),
         "seo_tags": seo_tags,
         "suggested_materials": materials,
+        "suggested_category": attributes["category"][0] if attributes["category"] else None,
         "primary_colors": colors[:3],
         "estimated_dimensions_cm": "N/A",
         "confidence_score": 0.6,  # Medium confidence for HuggingFace analysis
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class InferenceQueueFull(Exception):
+    """Raised when the pool already holds max_queue requests"""
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__(f"Inference queue is full; retry after {retry_after}s")
+
+class InferenceTimeout(Exception):
+    """Raised when a request does not finish within its timeout"""
+
+class InferencePool:
+    """
+    Dedicated worker threads for local model inference.
+
+    Model calls run here instead of on the event loop or the default
+    executor. Threads rather than processes: torch releases the GIL inside
+    its kernels, and every worker shares one loaded copy of the model.
+    torch intra-op threads are pinned per worker so concurrent requests
+    do not oversubscribe the CPU.
+
+    At most max_queue requests are admitted (queued plus running); beyond
+    that run() raises InferenceQueueFull with a Retry-After estimate. A
+    request that times out while still queued is dropped before it starts;
+    one already running finishes in the background and keeps its slot
+    until it does, so admission reflects real load.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        torch_threads: int = 0,
+        max_queue: int = 8,
+        timeout: float = 30.0
+    ):
+        self.workers = workers
+        self.torch_threads = torch_threads
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="inference", initializer=self._init_worker
+        )
+
+        self._stats_lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._busy_total = 0.0
+
+    def _init_worker(self):
+        if not self.torch_threads:
+            return
+        try:
+            import torch
+            torch.set_num_threads(self.torch_threads)
+        except ImportError:
+            pass
+
+    def _retry_after(self) -> int:
+        """Seconds until the current backlog should have drained"""
+        with self._stats_lock:
+            avg_run = self._busy_total / self._completed if self._completed else 1.0
+            backlog = self._pending
+        return max(1, math.ceil(backlog * avg_run / self.workers))
+
+    async def run(self, fn: Callable[..., T], *args, timeout: float = None) -> T:
+        """
+        Run fn(*args) on an inference worker
+
+        Raises:
+            InferenceQueueFull: If max_queue requests are already admitted
+            InferenceTimeout: If the call takes longer than timeout seconds
+        """
+        with self._stats_lock:
+            admitted = self._pending < self.max_queue
+            if admitted:
+                self._pending += 1
+            else:
+                self._rejected += 1
+        if not admitted:
+            raise InferenceQueueFull(self._retry_after())
+
+        def call():
+            started = time.perf_counter()
+            with self._stats_lock:
+                self._active += 1
+            ok = False
+            try:
+                result = fn(*args)
+                ok = True
+                return result
+            finally:
+                with self._stats_lock:
+                    self._active -= 1
+                    self._completed += 1
+                    self._failed += 0 if ok else 1
+                    self._busy_total += time.perf_counter() - started
+
+        def release(_):
+            with self._stats_lock:
+                self._pending -= 1
+
+        future = self._executor.submit(call)
+        # Runs when the call finishes or when a still-queued call is cancelled
+        future.add_done_callback(release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            with self._stats_lock:
+                self._timed_out += 1
+            raise InferenceTimeout(f"Inference did not finish within {timeout or self.timeout}s")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput and shedding counters"""
+        with self._stats_lock:
+            completed = self._completed
+            return {
+                "workers": self.workers,
+                "torch_threads": self.torch_threads,
+                "max_queue": self.max_queue,
+                "timeout_seconds": self.timeout,
+                "pending": self._pending,
+                "active": self._active,
+                "completed": completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "avg_run_ms": (self._busy_total / completed * 1000) if completed else 0.0,
+            }
+
+    def shutdown(self):
+        """Drop queued requests and stop the workers once running ones finish"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+# Create singleton instance
+inference_pool = InferencePool(
+    workers=settings.INFERENCE_WORKERS,
+    torch_threads=settings.INFERENCE_TORCH_THREADS,
+    max_queue=settings.INFERENCE_MAX_QUEUE,
+    timeout=settings.INFERENCE_TIMEOUT_SECONDS,
+)
@@ -5,38 +5,61 @@ Much more reliable than HuggingFace API
 """
 import io
 import logging
+import threading
+import time
+from typing import List
 from PIL import Image
-from transformers import BlipProcessor, BlipForConditionalGeneration
-import torch
+
+from app.config.settings import settings
+from app.models.attribute_extractor import attribute_extractor
 
 logger = logging.getLogger(__name__)
 
-# Global variables for model caching
-_processor = None
-_model = None
+# Global variable for model caching
+_backend = None
+# Inference workers and the startup warm-up may all ask for the model at once
+_load_lock = threading.Lock()
 
 def load_model():
-    """Load BLIP model (only once, cached afterwards)"""
-    global _processor, _model
+    """Load the configured BLIP backend (only once, cached afterwards)"""
+    global _backend
     
-    if _processor is None or _model is None:
-        logger.info("📥 Loading BLIP model (this may take a minute on first run)...")
-        try:
-            _processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
-            _model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base")
-            
-            # Move to GPU if available
-            if torch.cuda.is_available():
-                _model = _model.to("cuda")
-                logger.info("✅ BLIP model loaded on GPU")
-            else:
-                logger.info("✅ BLIP model loaded on CPU")
-                
-        except Exception as e:
-            logger.error(f"❌ Failed to load BLIP model: {e}")
-            raise
+    if _backend is not None:
+        return _backend
     
-    return _processor, _model
+    with _load_lock:
+        if _backend is None:
+            # torch and transformers take seconds to import; pay for them on first use, not at API startup
+            from app.models.blip_backends import load_backend
+            logger.info(f"📥 Loading BLIP model ({settings.LOCAL_VISION_BACKEND} backend, this may take a minute on first run)...")
+            try:
+                backend = load_backend(
+                    settings.LOCAL_VISION_BACKEND,
+                    onnx_dir=settings.LOCAL_VISION_ONNX_DIR,
+                    intra_op_threads=settings.INFERENCE_TORCH_THREADS,
+                )
+            except Exception as e:
+                logger.error(f"❌ Failed to load BLIP model: {e}")
+                raise
+            # Publish only the fully built backend
+            _backend = backend
+            logger.info(f"✅ BLIP model loaded ({_backend.name})")
+    
+    return _backend
+
+
+def is_model_loaded() -> bool:
+    return _backend is not None
+
+
+def warm_up():
+    """Load the model and caption a blank image so the first request runs at full speed"""
+    started = time.perf_counter()
+    load_model()
+    blank = Image.new('RGB', (384, 384), 'white')
+    caption_images([blank])
+    image_palette(blank)
+    logger.info(f"🔥 BLIP warm-up finished in {time.perf_counter() - started:.1f}s")
 
 
 def analyze_image_locally(image_bytes: bytes) -> dict:
@@ -49,60 +72,63 @@ def analyze_image_locally(image_bytes: bytes) -> dict:
     Returns:
         dict: Analysis results with product attributes
     """
-    try:
-        # Load model (cached after first load)
-        processor, model = load_model()
-        
-        # Open image
-        image = Image.open(io.BytesIO(image_bytes)).convert('RGB')
-        
-        # Generate caption
-        inputs = processor(image, return_tensors="pt")
-        
-        if torch.cuda.is_available():
-            inputs = {k: v.to("cuda") for k, v in inputs.items()}
-        
-        out = model.generate(**inputs, max_length=50)
-        caption = processor.decode(out[0], skip_special_tokens=True)
-        
-        logger.info(f"✅ Local BLIP analysis: {caption}")
-        
-        # Extract attributes from caption
-        analysis = extract_attributes_from_caption(caption, image)
-        return analysis
-        
-    except Exception as e:
-        logger.error(f"❌ Local vision analysis failed: {e}")
-        return get_fallback_analysis()
+    return analyze_images_locally([image_bytes])[0]
+
+
+def analyze_images_locally(images_bytes: List[bytes]) -> List[dict]:
+    """
+    Analyze several images with one batched BLIP generate call.
+    
+    Images that fail to decode get the fallback analysis without holding
+    back the rest of the batch.
+    
+    Args:
+        images_bytes: Image data for each request
+    
+    Returns:
+        list: One analysis dict per input, in input order
+    """
+    results = [None] * len(images_bytes)
+    images, positions = [], []
+    for position, image_bytes in enumerate(images_bytes):
+        try:
+            images.append(Image.open(io.BytesIO(image_bytes)).convert('RGB'))
+            positions.append(position)
+        except Exception as e:
+            logger.error(f"❌ Could not decode image: {e}")
+            results[position] = get_fallback_analysis()
+    
+    if images:
+        try:
+            captions = caption_images(images)
+            for position, image, caption in zip(positions, images, captions):
+                logger.info(f"✅ Local BLIP analysis: {caption}")
+                # Extract attributes from caption
+                results[position] = extract_attributes_from_caption(caption, image)
+        except Exception as e:
+            logger.error(f"❌ Local vision analysis failed: {e}")
+            for position in positions:
+                results[position] = get_fallback_analysis()
+    
+    return results
+
+
+def caption_images(images: List[Image.Image]) -> List[str]:
+    """Generate captions for a batch of RGB images in one forward pass"""
+    # Load model (cached after first load)
+    return load_model().caption(images)
 
 
 def extract_attributes_from_caption(caption: str, image: Image.Image) -> dict:
     """Extract product attributes from image caption and image analysis."""
-    caption_lower = caption.lower()
+    attributes = attribute_extractor.extract(caption)
     
     # Extract colors from caption and image
-    colors = extract_colors(caption_lower, image)
+    palette = image_palette(image)
+    colors = extract_colors(attributes["color"], palette)
     
     # Extract materials
-    materials = []
-    material_keywords = {
-        "wood": ["wood", "wooden", "timber"],
-        "metal": ["metal", "steel", "iron", "aluminum", "brass"],
-        "ceramic": ["ceramic", "pottery", "clay", "porcelain"],
-        "fabric": ["fabric", "textile", "cloth", "cotton", "silk"],
-        "glass": ["glass", "crystal"],
-        "leather": ["leather"],
-        "plastic": ["plastic"],
-        "stone": ["stone", "marble", "granite"],
-        "automotive": ["car", "vehicle", "automobile", "bmw", "mercedes", "audi"]
-    }
-    
-    for material, keywords in material_keywords.items():
-        if any(keyword in caption_lower for keyword in keywords):
-            materials.append(material)
-    
-    if not materials:
-        materials = ["handcrafted"]
+    materials = attributes["material"] or ["handcrafted"]
     
     # Generate title from caption (capitalize properly)
     words = caption.split()
@@ -118,72 +144,36 @@ def extract_attributes_from_caption(caption: str, image: Image.Image) -> dict:
         "suggested_title": suggested_title,
         "seo_tags": seo_tags,
         "suggested_materials": materials,
+        "suggested_category": attributes["category"][0] if attributes["category"] else None,
         "primary_colors": colors,
+        "color_palette": palette,
         "estimated_dimensions_cm": "N/A",
         "confidence_score": 0.75,  # Higher confidence for local model
         "description": caption
     }
 
 
-def extract_colors(caption: str, image: Image.Image) -> list:
-    """Extract colors from caption and dominant colors from image."""
-    colors = []
-    
-    # Color keywords from caption
-    color_map = {
-        "white": ["white", "ivory", "cream"],
-        "black": ["black", "dark"],
-        "red": ["red", "crimson", "scarlet"],
-        "blue": ["blue", "navy", "azure"],
-        "green": ["green", "emerald", "lime"],
-        "yellow": ["yellow", "gold", "golden"],
-        "pink": ["pink", "magenta", "rose", "cherry blossom"],
-        "purple": ["purple", "violet", "lavender"],
-        "orange": ["orange", "amber"],
-        "brown": ["brown", "tan", "beige"],
-        "gray": ["gray", "grey", "silver"],
-        "silver": ["silver", "metallic"]
-    }
-    
-    for color, keywords in color_map.items():
-        if any(keyword in caption for keyword in keywords):
-            if color not in colors:
-                colors.append(color)
+def image_palette(image: Image.Image) -> list:
+    """Dominant colors of the image with their pixel share (empty if extraction fails)"""
+    # NumPy and the color lookup table load on first use, like the model
+    from app.models.color_palette import extract_palette
+    try:
+        return extract_palette(image)
+    except Exception as e:
+        logger.warning(f"⚠️ Color extraction failed: {e}")
+        return []
+
+
+def extract_colors(caption_colors: list, palette: list) -> list:
+    """Colors named in the caption first, then the image's dominant colors."""
+    colors = list(caption_colors)
     
-    # If no colors found in caption, analyze image
-    if not colors:
-        try:
-            # Get dominant colors from image
-            img_resized = image.resize((150, 150))
-            pixels = list(img_resized.getdata())
-            
-            # Simple dominant color detection
-            r_avg = sum(p[0] for p in pixels) // len(pixels)
-            g_avg = sum(p[1] for p in pixels) // len(pixels)
-            b_avg = sum(p[2] for p in pixels) // len(pixels)
-            
-            # Determine dominant color
-            if r_avg > 200 and g_avg > 200 and b_avg > 200:
-                colors.append("white")
-            elif r_avg < 50 and g_avg < 50 and b_avg < 50:
-                colors.append("black")
-            elif r_avg > g_avg and r_avg > b_avg:
-                if r_avg > 150 and g_avg < 100:
-                    colors.append("red")
-                else:
-                    colors.append("pink")
-            elif g_avg > r_avg and g_avg > b_avg:
-                colors.append("green")
-            elif b_avg > r_avg and b_avg > g_avg:
-                colors.append("blue")
-            else:
-                colors.append("natural")
-                
-        except Exception as e:
-            logger.warning(f"⚠️ Color extraction failed: {e}")
-            colors = ["natural"]
+    # Fill the rest from the image, largest share first
+    for entry in palette:
+        if entry["name"] not in colors:
+            colors.append(entry["name"])
     
-    return colors[:3]
+    return colors[:3] or ["natural"]
 
 
 def get_fallback_analysis() -> dict:
@@ -195,5 +185,6 @@ def get_fallback_analysis() -> dict:
         "primary_colors": ["multi-color"],
         "estimated_dimensions_cm": "N/A",
         "confidence_score": 0.3,
-        "description": "Product for sale"
+        "description": "Product for sale",
+        "fallback": True  # not a model result; callers should not cache it
     }
@@ -1,13 +1,28 @@
 import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+import base64
+import html
+import json
+import re
 import uuid
 
 # Database operations handled by custom SQLite client
-from app.cloud_services.database import get_database_client
+from app.cloud_services.async_database import get_async_database_client
+from app.cloud_services.codec import cursor_decoder
+from app.cloud_services.database import JSON_FIELDS, normalize_attribute, ATTRIBUTE_TABLES
+from app.models.view_counter import view_buffer
+from app.models.engagement import engagement_service
+from app.models.activity_log import activity_log
+from app.models.response_cache import response_cache, DASHBOARD, PRODUCT_STATS, SALES_ANALYTICS
+from pydantic import ValidationError
+
 from app.schemas.product import (
     ProductCreateRequest,
     ProductUpdateRequest,
+    ProductBulkUpdateItem,
+    BulkItemResult,
+    ProductBulkResponse,
     ProductResponse,
     ProductStatus,
     ProductCategory
@@ -15,18 +30,175 @@ from app.schemas.product import (
 
 logger = logging.getLogger(__name__)
 
+# bm25 column weights for products_fts: title, description, tags, materials, story
+SEARCH_WEIGHTS = (10.0, 2.0, 5.0, 3.0, 1.0)
+
+# Private-use markers that snippet() wraps around matches; they survive
+# html.escape and are swapped for <mark> tags afterwards
+_MARK_OPEN, _MARK_CLOSE = "\ue000", "\ue001"
+
+def encode_cursor(sort_key: Any, product_id: str) -> str:
+    """Encode the sort key and ID of the last row on a page as an opaque cursor"""
+    if isinstance(sort_key, datetime):
+        sort_key = sort_key.isoformat()
+    raw = json.dumps([sort_key, product_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_key_type: type = str) -> tuple[Any, str]:
+    """
+    Decode a cursor produced by encode_cursor
+    
+    Args:
+        cursor: Cursor string from a previous response
+        sort_key_type: Expected type of the sort key (str for created_at,
+            float for search rank)
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_key, product_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if sort_key_type is float and isinstance(sort_key, int) and not isinstance(sort_key, bool):
+        sort_key = float(sort_key)
+    if not isinstance(sort_key, sort_key_type) or not isinstance(product_id, str):
+        raise ValueError("Invalid cursor")
+    return sort_key, product_id
+
+def build_fts_query(query: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression
+    
+    Each word becomes a quoted prefix term, so FTS operators in user input
+    are treated as plain text and partially typed words still match.
+    """
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms[:16])
+
+def render_snippet(raw: Optional[str]) -> Optional[str]:
+    """HTML-escape a snippet and turn match markers into <mark> tags"""
+    if not raw:
+        return None
+    escaped = html.escape(raw)
+    return escaped.replace(_MARK_OPEN, "<mark>").replace(_MARK_CLOSE, "</mark>")
+
+class ProductVersionConflict(Exception):
+    """Raised when an update's expected_version no longer matches the stored row"""
+    
+    def __init__(self, product_id: str, current_version: int):
+        self.product_id = product_id
+        self.current_version = current_version
+        super().__init__(f"Product {product_id} was modified (current version {current_version})")
+
 class ProductService:
     """Service layer for product management with security controls"""
     
     def __init__(self):
-        self.db = get_database_client()
+        self.db = get_async_database_client()
         self.collection_name = "products"
         
     def _generate_product_id(self) -> str:
         """Generate unique product ID"""
         return str(uuid.uuid4())
     
-
+    def _with_pending_views(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Add views still sitting in the write-behind buffer to the stored count"""
+        data["views_count"] = (data.get("views_count") or 0) + view_buffer.pending_views(data["product_id"])
+        return data
+    
+    def _new_product_doc(
+        self,
+        user_id: str,
+        product_data: ProductCreateRequest,
+        now: datetime
+    ) -> Dict[str, Any]:
+        """Storage document for a new product owned by user_id"""
+        return {
+            "product_id": self._generate_product_id(),
+            "user_id": user_id,  # Owner of the product
+            "title": product_data.title,
+            "description": product_data.description,
+            "category": product_data.category.value,
+            "materials": product_data.materials,
+            "colors": product_data.colors,
+            "tags": product_data.tags,
+            "story": product_data.story,
+            "images": [img.model_dump() for img in product_data.images],
+            "pricing": product_data.pricing.model_dump() if product_data.pricing else None,
+            "dimensions": product_data.dimensions.model_dump() if product_data.dimensions else None,
+            "status": product_data.status.value,
+            "created_at": now,
+            "updated_at": now,
+            "views_count": 0,
+            "likes_count": 0,
+        }
+    
+    def _update_fields(self, update_data: ProductUpdateRequest) -> Dict[str, Any]:
+        """Storage values for the fields set (non-None) on an update request"""
+        # JSON mode turns enums into their values and nested models into dicts
+        update_dict = update_data.model_dump(
+            mode="json", exclude_none=True, exclude={"product_id", "expected_version"}
+        )
+        
+        # Always update timestamp
+        update_dict["updated_at"] = datetime.utcnow()
+        return update_dict
+    
+    @staticmethod
+    def _invalidate_after_update(user_id: str, fields: Dict[str, Any]):
+        """Drop cached seller responses an update to these fields makes stale"""
+        namespaces = [DASHBOARD, PRODUCT_STATS]
+        if "title" in fields:
+            # Sales analytics shows product titles next to its top products
+            namespaces.append(SALES_ANALYTICS)
+        response_cache.invalidate(user_id, *namespaces)
+    
+    async def _fetch_page(
+        self,
+        where_conditions: List[str],
+        params: List[Any],
+        page: int,
+        page_size: int,
+        cursor: Optional[str]
+    ) -> tuple[List[ProductResponse], int, Optional[str]]:
+        """
+        Fetch one page ordered newest first, by offset or by keyset cursor
+        
+        The total is counted over the filter alone. With a cursor the page
+        starts strictly after the (created_at, product_id) it encodes, so every
+        page costs one index seek regardless of depth.
+        """
+        where_clause = " AND ".join(where_conditions)
+        total = await self.db.count_collection(self.collection_name, where_clause, tuple(params))
+        
+        offset = (page - 1) * page_size
+        if cursor:
+            created_at, product_id = decode_cursor(cursor)
+            where_conditions = where_conditions + ["(created_at, product_id) < (?, ?)"]
+            params = params + [created_at, product_id]
+            where_clause = " AND ".join(where_conditions)
+            offset = 0
+        
+        # Fetch one extra row to learn whether another page follows
+        rows = await self.db.query_collection(
+            self.collection_name,
+            where_clause,
+            tuple(params),
+            order_by="created_at DESC, product_id DESC",
+            limit=page_size + 1,
+            offset=offset
+        )
+        
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["product_id"])
+        
+        return [ProductResponse(**self._with_pending_views(data)) for data in rows], total, next_cursor
     
     async def create_product(
         self, 
@@ -48,33 +220,16 @@ class ProductService:
             Exception: If database operation fails
         """
         try:
-            # Generate unique product ID
-            product_id = self._generate_product_id()
-            
             # Prepare product document
-            now = datetime.utcnow()
-            product_doc = {
-                "product_id": product_id,
-                "user_id": user_id,  # Owner of the product
-                "title": product_data.title,
-                "description": product_data.description,
-                "category": product_data.category.value,
-                "materials": product_data.materials,
-                "colors": product_data.colors,
-                "tags": product_data.tags,
-                "story": product_data.story,
-                "images": [img.model_dump() for img in product_data.images],
-                "pricing": product_data.pricing.model_dump() if product_data.pricing else None,
-                "dimensions": product_data.dimensions.model_dump() if product_data.dimensions else None,
-                "status": product_data.status.value,
-                "created_at": now,
-                "updated_at": now,
-                "views_count": 0,
-                "likes_count": 0,
-            }
+            product_doc = self._new_product_doc(user_id, product_data, datetime.utcnow())
+            product_id = product_doc["product_id"]
             
             # Store in database
-            self.db.set_document(self.collection_name, product_id, product_doc)
+            await self.db.set_document(self.collection_name, product_id, product_doc)
+            response_cache.invalidate(user_id, DASHBOARD, PRODUCT_STATS)
+            activity_log.record(
+                user_id, "product_created", f"Added {product_doc['title']}", {"product_id": product_id}
+            )
             
             logger.info(f"Product created successfully: {product_id} by user {user_id}")
             
@@ -100,7 +255,7 @@ class ProductService:
             ProductResponse if found and authorized, None otherwise
         """
         try:
-            product_data = self.db.get_document(self.collection_name, product_id)
+            product_data = await self.db.get_document(self.collection_name, product_id)
             
             if not product_data:
                 logger.warning(f"Product not found: {product_id}")
@@ -115,12 +270,11 @@ class ProductService:
                     )
                     return None
             
-            # Increment view count (non-blocking)
+            # Increment view count (buffered, written in batches)
             if requesting_user_id != product_data["user_id"]:
-                current_views = product_data.get("views_count", 0)
-                self.db.update_document(self.collection_name, product_id, {"views_count": current_views + 1})
+                view_buffer.record_view(product_id)
             
-            return ProductResponse(**product_data)
+            return ProductResponse(**self._with_pending_views(product_data))
             
         except Exception as e:
             logger.error(f"Failed to get product {product_id}: {e}", exc_info=True)
@@ -135,59 +289,44 @@ class ProductService:
         """
         Update product with ownership verification
         
+        The ownership check, optional version check and write are one
+        UPDATE ... RETURNING statement.
+        
         Args:
             product_id: Product to update
             user_id: User making the update (must be owner)
-            update_data: Fields to update
+            update_data: Fields to update, optionally with expected_version
             
         Returns:
-            Updated ProductResponse or None if unauthorized
+            Updated ProductResponse or None if not found or unauthorized
+            
+        Raises:
+            ProductVersionConflict: If expected_version no longer matches
         """
         try:
-            product_data = self.db.get_document(self.collection_name, product_id)
+            # Prepare update dict (only non-None fields)
+            update_dict = self._update_fields(update_data)
+            conditions = {"user_id": user_id}
+            if update_data.expected_version is not None:
+                conditions["version"] = update_data.expected_version
             
-            if not product_data:
-                logger.warning(f"Product not found for update: {product_id}")
-                return None
+            updated_doc = await self.db.update_document_returning(
+                self.collection_name, product_id, update_dict, conditions
+            )
             
-            # Authorization: Only owner can update
-            if product_data["user_id"] != user_id:
-                logger.warning(
-                    f"Unauthorized update attempt on product {product_id} "
-                    f"by user {user_id}"
-                )
+            if not updated_doc:
+                await self._explain_missed_write(product_id, user_id, update_data.expected_version, "update")
                 return None
             
-            # Prepare update dict (only non-None fields)
-            update_dict = {}
-            for field, value in update_data.model_dump(exclude_none=True).items():
-                if field == "images" and value is not None:
-                    update_dict[field] = [img.model_dump() for img in value]
-                elif field == "pricing" and value is not None:
-                    # Handle both Pydantic models and dicts
-                    update_dict[field] = value.model_dump() if hasattr(value, 'model_dump') else value
-                elif field == "dimensions" and value is not None:
-                    # Handle both Pydantic models and dicts
-                    update_dict[field] = value.model_dump() if hasattr(value, 'model_dump') else value
-                elif field == "category" and value is not None:
-                    update_dict[field] = value.value
-                elif field == "status" and value is not None:
-                    update_dict[field] = value.value
-                else:
-                    update_dict[field] = value
-            
-            # Always update timestamp
-            update_dict["updated_at"] = datetime.utcnow()
-            
-            # Update in database
-            self.db.update_document(self.collection_name, product_id, update_dict)
-            
-            # Fetch updated document
-            updated_doc = self.db.get_document(self.collection_name, product_id)
-            
+            self._invalidate_after_update(user_id, update_dict)
+            activity_log.record(
+                user_id, "product_updated", f"Updated {updated_doc['title']}", {"product_id": product_id}
+            )
             logger.info(f"Product updated successfully: {product_id}")
-            return ProductResponse(**updated_doc)
+            return ProductResponse(**self._with_pending_views(updated_doc))
             
+        except ProductVersionConflict:
+            raise
         except Exception as e:
             logger.error(f"Failed to update product {product_id}: {e}", exc_info=True)
             return None
@@ -208,25 +347,22 @@ class ProductService:
             True if deleted, False otherwise
         """
         try:
-            product_data = self.db.get_document(self.collection_name, product_id)
-            
-            if not product_data:
-                return False
-            
-            # Authorization: Only owner can delete
-            if product_data["user_id"] != user_id:
-                logger.warning(
-                    f"Unauthorized delete attempt on product {product_id} "
-                    f"by user {user_id}"
-                )
+            # Soft delete: set status to ARCHIVED, owner-checked in the same statement
+            archived = await self.db.update_document_returning(
+                self.collection_name,
+                product_id,
+                {"status": ProductStatus.ARCHIVED.value, "updated_at": datetime.utcnow()},
+                {"user_id": user_id}
+            )
+            
+            if not archived:
+                await self._explain_missed_write(product_id, user_id, None, "delete")
                 return False
             
-            # Soft delete: set status to ARCHIVED
-            self.db.update_document(self.collection_name, product_id, {
-                "status": ProductStatus.ARCHIVED.value,
-                "updated_at": datetime.utcnow()
-            })
-            
+            response_cache.invalidate(user_id, DASHBOARD, PRODUCT_STATS)
+            activity_log.record(
+                user_id, "product_archived", f"Archived {archived['title']}", {"product_id": product_id}
+            )
             logger.info(f"Product archived successfully: {product_id}")
             return True
             
@@ -234,14 +370,258 @@ class ProductService:
             logger.error(f"Failed to delete product {product_id}: {e}", exc_info=True)
             return False
     
+    async def _explain_missed_write(
+        self,
+        product_id: str,
+        user_id: str,
+        expected_version: Optional[int],
+        action: str
+    ):
+        """
+        Work out why a conditional write matched no row
+        
+        Only runs on the failure path. Logs not-found and unauthorized
+        attempts, and raises ProductVersionConflict for stale versions.
+        """
+        rows = await self.db.query_collection(
+            self.collection_name, "product_id = ?", (product_id,), columns=["user_id", "version"]
+        )
+        if not rows:
+            logger.warning(f"Product not found for {action}: {product_id}")
+        elif rows[0]["user_id"] != user_id:
+            logger.warning(f"Unauthorized {action} attempt on product {product_id} by user {user_id}")
+        elif expected_version is not None and rows[0]["version"] != expected_version:
+            raise ProductVersionConflict(product_id, rows[0]["version"])
+    
+    async def _owners(self, product_ids: List[str]) -> Dict[str, Dict[str, str]]:
+        """Map each existing product ID to its owner and title"""
+        placeholders = ", ".join("?" * len(product_ids))
+        rows = await self.db.query_collection(
+            self.collection_name,
+            f"product_id IN ({placeholders})",
+            tuple(product_ids),
+            columns=["product_id", "user_id", "title"]
+        )
+        return {row["product_id"]: row for row in rows}
+    
+    async def _load_products(self, product_ids: List[str]) -> Dict[str, ProductResponse]:
+        """Fetch many products by ID in one query"""
+        placeholders = ", ".join("?" * len(product_ids))
+        rows = await self.db.query_collection(
+            self.collection_name, f"product_id IN ({placeholders})", tuple(product_ids)
+        )
+        return {row["product_id"]: ProductResponse(**self._with_pending_views(row)) for row in rows}
+    
+    @staticmethod
+    def _bulk_response(results: List[BulkItemResult]) -> ProductBulkResponse:
+        results.sort(key=lambda r: r.index)
+        succeeded = sum(1 for r in results if r.success)
+        return ProductBulkResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
+    
+    @staticmethod
+    def _validation_message(error: ValidationError) -> str:
+        first = error.errors()[0]
+        location = ".".join(str(part) for part in first["loc"])
+        return f"{location}: {first['msg']}" if location else first["msg"]
+    
+    async def bulk_create_products(self, user_id: str, items: List[Dict[str, Any]]) -> ProductBulkResponse:
+        """
+        Create many products in a single transaction
+        
+        Each item is validated on its own; invalid items are reported and
+        skipped while the rest are written together with executemany.
+        
+        Args:
+            user_id: Authenticated user ID, owner of every created product
+            items: Raw ProductCreateRequest payloads
+            
+        Returns:
+            ProductBulkResponse with one result per item
+        """
+        results: List[BulkItemResult] = []
+        docs: List[tuple[int, Dict[str, Any]]] = []
+        now = datetime.utcnow()
+        
+        for index, item in enumerate(items):
+            try:
+                product_data = ProductCreateRequest.model_validate(item)
+            except ValidationError as e:
+                results.append(BulkItemResult(index=index, success=False, error=self._validation_message(e)))
+                continue
+            docs.append((index, self._new_product_doc(user_id, product_data, now)))
+        
+        if docs:
+            try:
+                await self.db.set_documents(self.collection_name, [doc for _, doc in docs])
+            except Exception as e:
+                logger.error(f"Bulk product creation failed: {e}", exc_info=True)
+                results.extend(
+                    BulkItemResult(index=index, success=False, error="Failed to create product")
+                    for index, _ in docs
+                )
+                return self._bulk_response(results)
+            
+            response_cache.invalidate(user_id, DASHBOARD, PRODUCT_STATS)
+            for _, doc in docs:
+                activity_log.record(
+                    user_id, "product_created", f"Added {doc['title']}", {"product_id": doc["product_id"]}
+                )
+            logger.info(f"Bulk created {len(docs)} products for user {user_id}")
+            results.extend(
+                BulkItemResult(
+                    index=index, product_id=doc["product_id"], success=True, product=ProductResponse(**doc)
+                )
+                for index, doc in docs
+            )
+        
+        return self._bulk_response(results)
+    
+    async def bulk_update_products(self, user_id: str, items: List[Dict[str, Any]]) -> ProductBulkResponse:
+        """
+        Apply many partial updates in a single transaction
+        
+        Items that fail validation, repeat a product_id, target a product
+        the user does not own, or carry a stale expected_version are reported
+        individually; the rest are written together. Ownership is checked up
+        front, which is safe because products never change owner and are
+        only ever soft deleted.
+        
+        Args:
+            user_id: User making the updates (must own every product)
+            items: Raw ProductBulkUpdateItem payloads
+            
+        Returns:
+            ProductBulkResponse with one result per item
+        """
+        results: List[BulkItemResult] = []
+        pending: Dict[str, tuple[int, Dict[str, Any]]] = {}
+        versions: Dict[str, int] = {}
+        
+        for index, item in enumerate(items):
+            try:
+                update_data = ProductBulkUpdateItem.model_validate(item)
+            except ValidationError as e:
+                results.append(BulkItemResult(
+                    index=index, product_id=item.get("product_id") if isinstance(item, dict) else None,
+                    success=False, error=self._validation_message(e)
+                ))
+                continue
+            if update_data.product_id in pending:
+                results.append(BulkItemResult(
+                    index=index, product_id=update_data.product_id, success=False,
+                    error="Duplicate product_id in request"
+                ))
+                continue
+            pending[update_data.product_id] = (index, self._update_fields(update_data))
+            if update_data.expected_version is not None:
+                versions[update_data.product_id] = update_data.expected_version
+        
+        return await self._apply_bulk_updates(user_id, pending, results, include_products=True, versions=versions)
+    
+    async def bulk_archive_products(self, user_id: str, product_ids: List[str]) -> ProductBulkResponse:
+        """
+        Soft delete many products in a single transaction
+        
+        Args:
+            user_id: User requesting deletion (must own every product)
+            product_ids: Products to archive
+            
+        Returns:
+            ProductBulkResponse with one result per ID
+        """
+        results: List[BulkItemResult] = []
+        pending: Dict[str, tuple[int, Dict[str, Any]]] = {}
+        now = datetime.utcnow()
+        
+        for index, product_id in enumerate(product_ids):
+            if product_id in pending:
+                results.append(BulkItemResult(
+                    index=index, product_id=product_id, success=False, error="Duplicate product_id in request"
+                ))
+                continue
+            pending[product_id] = (index, {"status": ProductStatus.ARCHIVED.value, "updated_at": now})
+        
+        return await self._apply_bulk_updates(user_id, pending, results, include_products=False)
+    
+    async def _apply_bulk_updates(
+        self,
+        user_id: str,
+        pending: Dict[str, tuple[int, Dict[str, Any]]],
+        results: List[BulkItemResult],
+        include_products: bool,
+        versions: Optional[Dict[str, int]] = None
+    ) -> ProductBulkResponse:
+        """Drop items the user may not touch, write the rest together, and report"""
+        if not pending:
+            return self._bulk_response(results)
+        
+        owners = await self._owners(list(pending))
+        updates = []
+        for product_id, (index, fields) in pending.items():
+            if owners.get(product_id, {}).get("user_id") != user_id:
+                if product_id in owners:
+                    logger.warning(f"Unauthorized bulk update on product {product_id} by user {user_id}")
+                results.append(BulkItemResult(
+                    index=index, product_id=product_id, success=False, error="Product not found or unauthorized"
+                ))
+                continue
+            updates.append((product_id, fields))
+        
+        if not updates:
+            return self._bulk_response(results)
+        
+        try:
+            conditions = {product_id: {"version": version} for product_id, version in (versions or {}).items()}
+            applied = await self.db.update_documents(
+                self.collection_name, updates, conditions, match={"user_id": user_id}
+            )
+            products = await self._load_products(list(applied)) if include_products and applied else {}
+        except Exception as e:
+            logger.error(f"Bulk product update failed: {e}", exc_info=True)
+            results.extend(
+                BulkItemResult(index=pending[product_id][0], product_id=product_id, success=False,
+                               error="Failed to update product")
+                for product_id, _ in updates
+            )
+            return self._bulk_response(results)
+        
+        for product_id in applied:
+            fields = pending[product_id][1]
+            self._invalidate_after_update(user_id, fields)
+            if fields.get("status") == ProductStatus.ARCHIVED.value:
+                activity_type, verb = "product_archived", "Archived"
+            else:
+                activity_type, verb = "product_updated", "Updated"
+            title = fields.get("title", owners[product_id]["title"])
+            activity_log.record(user_id, activity_type, f"{verb} {title}", {"product_id": product_id})
+        logger.info(f"Bulk updated {len(applied)} products for user {user_id}")
+        results.extend(
+            BulkItemResult(
+                index=pending[product_id][0], product_id=product_id, success=True,
+                product=products.get(product_id)
+            )
+            if product_id in applied else
+            BulkItemResult(
+                index=pending[product_id][0], product_id=product_id, success=False,
+                error="Version conflict: product was modified by another request"
+                if product_id in conditions else "Product not found or unauthorized"
+            )
+            for product_id, _ in updates
+        )
+        return self._bulk_response(results)
+    
     async def list_products(
         self,
         user_id: Optional[str] = None,
         status: Optional[ProductStatus] = None,
         category: Optional[ProductCategory] = None,
         page: int = 1,
-        page_size: int = 20
-    ) -> tuple[List[ProductResponse], int]:
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        tag: Optional[str] = None,
+        material: Optional[str] = None,
+        color: Optional[str] = None
+    ) -> tuple[List[ProductResponse], int, Optional[str]]:
         """
         List products with filtering and pagination
         
@@ -249,16 +629,25 @@ class ProductService:
             user_id: Filter by user (shows all their products)
             status: Filter by status
             category: Filter by category
-            page: Page number (1-indexed)
+            tag: Filter by tag (case-insensitive)
+            material: Filter by material (case-insensitive)
+            color: Filter by color (case-insensitive)
+            page: Page number (1-indexed), ignored when cursor is given
             page_size: Items per page (max 100)
+            cursor: Opaque cursor from a previous page's next_cursor
             
         Returns:
-            Tuple of (products list, total count)
+            Tuple of (products list, total count, next cursor or None)
+            
+        Raises:
+            ValueError: If the cursor is malformed
         """
+        if cursor:
+            decode_cursor(cursor)
+        
         try:
             # Security: Limit page size
             page_size = min(page_size, 100)
-            offset = (page - 1) * page_size
             
             # Build query conditions
             where_conditions = []
@@ -281,25 +670,18 @@ class ProductService:
                 where_conditions.append("category = ?")
                 params.append(category.value)
             
-            where_clause = " AND ".join(where_conditions) if where_conditions else ""
-            
-            # Get all matching products
-            all_products = self.db.query_collection(self.collection_name, where_clause, tuple(params))
-            
-            # Sort by creation date (newest first)
-            all_products.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-            
-            total = len(all_products)
-            
-            # Apply pagination
-            paginated_data = all_products[offset:offset + page_size]
-            products = [ProductResponse(**data) for data in paginated_data]
+            # Attribute filters are answered from the junction table indexes
+            for field, value in (("tags", tag), ("materials", material), ("colors", color)):
+                if value:
+                    table, column = ATTRIBUTE_TABLES[field]
+                    where_conditions.append(f"product_id IN (SELECT product_id FROM {table} WHERE {column} = ?)")
+                    params.append(normalize_attribute(value))
             
-            return products, total
+            return await self._fetch_page(where_conditions, params, page, page_size, cursor)
             
         except Exception as e:
             logger.error(f"Failed to list products: {e}", exc_info=True)
-            return [], 0
+            return [], 0, None
     
     async def toggle_like(
         self,
@@ -317,47 +699,49 @@ class ProductService:
             Dict with {'liked': bool, 'likes_count': int} or None if product not found
         """
         try:
-            # Get product data
-            product_data = self.db.get_document(self.collection_name, product_id)
-            if not product_data:
-                return None
-            
-            # Simple like tracking using a likes table
-            import sqlite3
-            with sqlite3.connect(self.db.db_path) as conn:
-                # Check if already liked
-                cursor = conn.execute(
-                    "SELECT 1 FROM product_likes WHERE product_id = ? AND user_id = ?",
-                    (product_id, user_id)
-                )
-                already_liked = cursor.fetchone() is not None
+            def _toggle(conn):
+                # Existence check runs inside the write transaction, so the
+                # product cannot disappear between here and the counter update
+                product = conn.execute(
+                    "SELECT user_id, title FROM products WHERE product_id = ?", (product_id,)
+                ).fetchone()
+                if product is None:
+                    return None
                 
-                if already_liked:
-                    # Unlike: remove like and decrement count
-                    conn.execute(
-                        "DELETE FROM product_likes WHERE product_id = ? AND user_id = ?",
-                        (product_id, user_id)
-                    )
-                    current_likes = product_data.get("likes_count", 0)
-                    new_likes = max(0, current_likes - 1)
-                    liked = False
-                    logger.info(f"User {user_id} unliked product {product_id}")
-                else:
-                    # Like: add like and increment count
+                # Unlike if a like row was removed, otherwise like
+                removed = conn.execute(
+                    "DELETE FROM product_likes WHERE product_id = ? AND user_id = ?",
+                    (product_id, user_id)
+                ).rowcount
+                if not removed:
                     conn.execute(
-                        "INSERT OR IGNORE INTO product_likes (product_id, user_id, liked_at) VALUES (?, ?, ?)",
+                        """
+                        INSERT INTO product_likes (product_id, user_id, liked_at) VALUES (?, ?, ?)
+                        ON CONFLICT (product_id, user_id) DO NOTHING
+                        """,
                         (product_id, user_id, datetime.utcnow().isoformat())
                     )
-                    current_likes = product_data.get("likes_count", 0)
-                    new_likes = current_likes + 1
-                    liked = True
-                    logger.info(f"User {user_id} liked product {product_id}")
-                
-                # Update likes count
-                self.db.update_document(self.collection_name, product_id, {"likes_count": new_likes})
-                conn.commit()
                 
-            likes_count = new_likes
+                # Counter is adjusted in SQL, never from a value read earlier
+                rows = conn.execute(
+                    """
+                    UPDATE products SET likes_count = MAX(COALESCE(likes_count, 0) + ?, 0)
+                    WHERE product_id = ?
+                    RETURNING likes_count
+                    """,
+                    (-1 if removed else 1, product_id)
+                ).fetchall()
+                return not removed, rows[0][0], product["user_id"], product["title"]
+            
+            result = await self.db.run_write(_toggle)
+            if result is None:
+                return None
+            
+            liked, likes_count, seller_id, title = result
+            response_cache.invalidate(seller_id, DASHBOARD, PRODUCT_STATS)
+            if liked and seller_id != user_id:
+                activity_log.record(seller_id, "like", f"{title} was liked", {"product_id": product_id})
+            logger.info(f"User {user_id} {'liked' if liked else 'unliked'} product {product_id}")
             
             return {
                 "liked": liked,
@@ -368,99 +752,184 @@ class ProductService:
             logger.error(f"Failed to toggle like: {e}", exc_info=True)
             return None
     
+    async def get_liked_product_ids(self, user_id: str, product_ids: List[str]) -> set[str]:
+        """
+        Return which of the given products the user has liked, in one query
+        
+        Args:
+            user_id: User whose likes to check
+            product_ids: Products on the current page
+            
+        Returns:
+            Subset of product_ids liked by the user
+        """
+        if not product_ids:
+            return set()
+        
+        placeholders = ", ".join("?" for _ in product_ids)
+        
+        def _lookup(conn):
+            cursor = conn.execute(
+                f"SELECT product_id FROM product_likes WHERE user_id = ? AND product_id IN ({placeholders})",
+                (user_id, *product_ids)
+            )
+            return {row[0] for row in cursor}
+        
+        try:
+            return await self.db.run_read(_lookup)
+        except Exception as e:
+            logger.error(f"Failed to look up likes: {e}", exc_info=True)
+            return set()
+    
+    async def mark_liked_by(
+        self,
+        products: List[ProductResponse],
+        user_id: Optional[str]
+    ) -> List[ProductResponse]:
+        """Set liked_by_me on each product for the requesting user"""
+        if not user_id or not products:
+            return products
+        
+        liked = await self.get_liked_product_ids(user_id, [p.product_id for p in products])
+        for product in products:
+            product.liked_by_me = product.product_id in liked
+        return products
+    
     async def search_products(
         self,
         query: str,
         category: Optional[ProductCategory] = None,
         page: int = 1,
-        page_size: int = 20
-    ) -> tuple[List[ProductResponse], int]:
+        page_size: int = 20,
+        cursor: Optional[str] = None
+    ) -> tuple[List[ProductResponse], int, Optional[str]]:
         """
-        Search products by title or description
+        Full-text search over public products, best matches first
+        
+        Served from the products_fts index with BM25 ranking (title and tags
+        weigh most) and a highlighted snippet per hit.
         
         Args:
             query: Search query string
             category: Optional category filter
-            page: Page number
+            page: Page number, ignored when cursor is given
             page_size: Items per page
+            cursor: Opaque cursor from a previous page's next_cursor
             
         Returns:
-            Tuple of (products list, total count)
+            Tuple of (products list, total count, next cursor or None)
+            
+        Raises:
+            ValueError: If the cursor is malformed
         """
+        after = decode_cursor(cursor, float) if cursor else None
+        
         try:
             # Security: Limit page size
             page_size = min(page_size, 100)
+            offset = 0 if after else (page - 1) * page_size
+            
+            match = build_fts_query(query)
+            if not match:
+                return [], 0, None
             
             # Build query conditions
-            where_conditions = ["status = ?"]
-            params = [ProductStatus.PUBLIC.value]
+            where_conditions = ["products_fts MATCH ?", "p.status = ?"]
+            params = [match, ProductStatus.PUBLIC.value]
             
             if category:
-                where_conditions.append("category = ?")
+                where_conditions.append("p.category = ?")
                 params.append(category.value)
             
             where_clause = " AND ".join(where_conditions)
-            
-            # Get all matching documents
-            all_products = self.db.query_collection(self.collection_name, where_clause, tuple(params))
-            
-            # Filter by search query (case-insensitive)
-            query_lower = query.lower()
-            matching_products = []
-            
-            for data in all_products:
-                title = data.get("title", "").lower()
-                description = data.get("description", "").lower()
-                tags = [tag.lower() for tag in data.get("tags", [])] if data.get("tags") else []
+            weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+            
+            def _search(conn):
+                total = conn.execute(f"""
+                    SELECT COUNT(*)
+                    FROM products_fts
+                    JOIN products_fts_rows r ON r.search_rowid = products_fts.rowid
+                    JOIN products p ON p.product_id = r.product_id
+                    WHERE {where_clause}
+                """, params).fetchone()[0]
                 
-                # Check if query matches title, description, or tags
-                if (query_lower in title or 
-                    query_lower in description or 
-                    any(query_lower in tag for tag in tags)):
-                    matching_products.append(ProductResponse(**data))
+                page_sql = f"""
+                    SELECT * FROM (
+                        SELECT p.*,
+                               bm25(products_fts, {weights}) AS rank,
+                               snippet(products_fts, -1, '{_MARK_OPEN}', '{_MARK_CLOSE}', '…', 16) AS snippet
+                        FROM products_fts
+                        JOIN products_fts_rows r ON r.search_rowid = products_fts.rowid
+                        JOIN products p ON p.product_id = r.product_id
+                        WHERE {where_clause}
+                    )
+                """
+                page_params = list(params)
+                if after:
+                    page_sql += " WHERE (rank, product_id) > (?, ?)"
+                    page_params.extend(after)
+                page_sql += " ORDER BY rank, product_id LIMIT ? OFFSET ?"
+                page_params.extend([page_size + 1, offset])
+                
+                result = conn.execute(page_sql, page_params)
+                decode = cursor_decoder(result, JSON_FIELDS)
+                rows = [decode(row) for row in result.fetchall()]
+                return rows, total
+            
+            rows, total = await self.db.run_read(_search)
             
-            total = len(matching_products)
+            next_cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                next_cursor = encode_cursor(rows[-1]["rank"], rows[-1]["product_id"])
             
-            # Apply pagination
-            offset = (page - 1) * page_size
-            paginated_products = matching_products[offset:offset + page_size]
+            products = []
+            for data in rows:
+                data["snippet"] = render_snippet(data.get("snippet"))
+                products.append(ProductResponse(**self._with_pending_views(data)))
             
-            return paginated_products, total
+            return products, total, next_cursor
             
         except Exception as e:
             logger.error(f"Failed to search products: {e}", exc_info=True)
-            return [], 0
+            return [], 0, None
+    
+    async def trending_products(
+        self,
+        window: str = "24h",
+        category: Optional[ProductCategory] = None,
+        limit: int = 20
+    ) -> List[ProductResponse]:
+        """
+        Public products with the most views and likes in a recent window
+        
+        Ranked from the engagement_counters buckets inside the window only.
+        
+        Args:
+            window: 24h or 7d
+            category: Optional category filter
+            limit: Maximum number of products
+        """
+        try:
+            ranked = await engagement_service.trending_products(
+                window=window,
+                category=category.value if category else None,
+                limit=min(limit, 50)
+            )
+            return [ProductResponse(**self._with_pending_views(data)) for data, _ in ranked]
+        
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get trending products: {e}", exc_info=True)
+            return []
     
     async def get_user_stats(self, user_id: str) -> Dict[str, Any]:
-        """Get statistics for user's products"""
+        """Get statistics for user's products, served from the response cache"""
         try:
-            products = self.db.query_collection(self.collection_name, "user_id = ?", (user_id,))
-            
-            stats = {
-                "total_products": 0,
-                "by_status": {},
-                "by_category": {},
-                "total_views": 0,
-                "total_likes": 0
-            }
-            
-            for data in products:
-                stats["total_products"] += 1
-                
-                # Count by status
-                status = data.get("status", "draft")
-                stats["by_status"][status] = stats["by_status"].get(status, 0) + 1
-                
-                # Count by category
-                category = data.get("category", "other")
-                stats["by_category"][category] = stats["by_category"].get(category, 0) + 1
-                
-                # Aggregate views and likes
-                stats["total_views"] += data.get("views_count", 0)
-                stats["total_likes"] += data.get("likes_count", 0)
-            
-            return stats
-            
+            return await response_cache.get_or_load(
+                PRODUCT_STATS, user_id, None, lambda: self._compute_user_stats(user_id)
+            )
         except Exception as e:
             logger.error(f"Failed to get user stats: {e}", exc_info=True)
             return {
@@ -470,6 +939,45 @@ class ProductService:
                 "total_views": 0,
                 "total_likes": 0
             }
+    
+    async def _compute_user_stats(self, user_id: str) -> Dict[str, Any]:
+        """Aggregate a user's product statistics"""
+        # Aggregate in SQL so only one row per (status, category) comes back
+        def _aggregate(conn):
+            return conn.execute("""
+                SELECT status, category, COUNT(*),
+                       COALESCE(SUM(views_count), 0), COALESCE(SUM(likes_count), 0)
+                FROM products
+                WHERE user_id = ?
+                GROUP BY status, category
+            """, (user_id,)).fetchall()
+        
+        rows = await self.db.run_read(_aggregate)
+        
+        stats = {
+            "total_products": 0,
+            "by_status": {},
+            "by_category": {},
+            "total_views": 0,
+            "total_likes": 0
+        }
+        
+        for status, category, count, views, likes in rows:
+            stats["total_products"] += count
+            
+            # Count by status
+            status = status or "draft"
+            stats["by_status"][status] = stats["by_status"].get(status, 0) + count
+            
+            # Count by category
+            category = category or "other"
+            stats["by_category"][category] = stats["by_category"].get(category, 0) + count
+            
+            # Aggregate views and likes
+            stats["total_views"] += views
+            stats["total_likes"] += likes
+        
+        return stats
 
 # Create singleton instance
 product_service = ProductService()
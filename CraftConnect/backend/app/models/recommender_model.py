@@ -1,48 +1,77 @@
 import logging
 from typing import List, Dict, Any
-from app.cloud_services.database import get_database_client
+from app.cloud_services.async_database import get_async_database_client
 
 logger = logging.getLogger(__name__)
 
 class RecommenderService:
     def __init__(self):
-        self.db = get_database_client()
+        self.db = get_async_database_client()
+    
+    @staticmethod
+    def _similar_products(conn, product_id: str, category: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Rank public products in the same category by number of shared tags.
+        
+        Overlap is counted on the product_tags index, so only products that
+        share at least one tag are touched; the rest of the page is filled
+        with the newest products from the category.
+        """
+        rows = conn.execute(
+            """
+            SELECT p.product_id, p.title, p.category, COUNT(*) AS shared_tags
+            FROM product_tags AS src
+            JOIN product_tags AS other ON other.tag = src.tag AND other.product_id != src.product_id
+            JOIN products AS p ON p.product_id = other.product_id
+            WHERE src.product_id = ? AND p.category = ? AND p.status = 'public'
+            GROUP BY p.product_id
+            ORDER BY shared_tags DESC, p.created_at DESC
+            LIMIT ?
+            """,
+            (product_id, category, limit)
+        ).fetchall()
+        results = [dict(row) for row in rows]
+        
+        if len(results) < limit:
+            exclude = [product_id] + [r["product_id"] for r in results]
+            placeholders = ", ".join("?" * len(exclude))
+            rows = conn.execute(
+                f"""
+                SELECT product_id, title, category, 0 AS shared_tags
+                FROM products
+                WHERE category = ? AND status = 'public' AND product_id NOT IN ({placeholders})
+                ORDER BY created_at DESC
+                LIMIT ?
+                """,
+                (category, *exclude, limit - len(results))
+            ).fetchall()
+            results.extend(dict(row) for row in rows)
+        
+        return results
     
     async def get_recommendations(self, product_id: str, fairness_boost: bool = False) -> List[Dict[str, Any]]:
         """Get product recommendations based on category and tags"""
         try:
             # Get the source product
-            source_product = self.db.get_document("products", product_id)
+            source_product = await self.db.get_document("products", product_id)
             if not source_product:
                 return []
             
-            # Find similar products by category
-            similar_products = self.db.query_collection(
-                "products", 
-                "category = ? AND product_id != ? AND status = ?",
-                (source_product["category"], product_id, "public")
+            rows = await self.db.run_read(
+                self._similar_products, product_id, source_product["category"], 5
             )
             
-            # Simple scoring based on shared tags
-            recommendations = []
-            source_tags = set(source_product.get("tags", []))
-            
-            for product in similar_products[:10]:  # Limit to 10
-                shared_tags = len(set(product.get("tags", [])) & source_tags)
-                score = 0.5 + (shared_tags * 0.1)  # Base score + tag similarity
-                
-                recommendations.append({
-                    "product_id": product["product_id"],
-                    "title": product["title"],
-                    "category": product["category"],
-                    "score": min(score, 1.0),
-                    "reason": f"Similar {product['category']} with {shared_tags} shared tags"
-                })
-            
-            # Sort by score
-            recommendations.sort(key=lambda x: x["score"], reverse=True)
-            
-            return recommendations[:5]  # Return top 5
+            # Base score + tag similarity
+            return [
+                {
+                    "product_id": row["product_id"],
+                    "title": row["title"],
+                    "category": row["category"],
+                    "score": min(0.5 + row["shared_tags"] * 0.1, 1.0),
+                    "reason": f"Similar {row['category']} with {row['shared_tags']} shared tags"
+                }
+                for row in rows
+            ]
             
         except Exception as e:
             logger.error(f"Recommendation failed: {e}", exc_info=True)
@@ -0,0 +1,142 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Cached response families; writes name the ones they make stale
+DASHBOARD = "dashboard"
+PRODUCT_STATS = "product_stats"
+SALES_ANALYTICS = "sales_analytics"
+
+# Invalidation stamps kept before the first prune
+PRUNE_MIN_STAMPS = 1024
+
+class SellerResponseCache:
+    """
+    Read-through TTL cache for per-seller aggregate responses.
+
+    Entries are keyed by (namespace, seller_id, args) and remember the
+    value of a global invalidation clock when their load started.
+    invalidate() advances the clock and stamps the (namespace, seller_id)
+    pair, which makes every entry loaded before the stamp a miss without
+    touching other sellers or namespaces. A load that started before an
+    invalidation is returned to its caller but not stored, so a
+    concurrent write can never be masked by an older read. Stamps older
+    than every live entry and in-flight load no longer affect anything
+    and are pruned, so memory tracks the cache, not every seller who has
+    ever written.
+
+    Cached values are shared between requests and must not be mutated.
+    Used from the event loop thread only.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[int, float, Any]]" = OrderedDict()
+        self._clock = 0
+        self._invalidated: Dict[Tuple[str, str], int] = {}
+        self._loading: Dict[int, int] = {}  # clock at load start -> loads in flight
+        self._prune_at = PRUNE_MIN_STAMPS
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, namespace: str, counter: str):
+        counters = self._counters.setdefault(
+            namespace, {"hits": 0, "misses": 0, "invalidations": 0, "discarded": 0, "evictions": 0}
+        )
+        counters[counter] += 1
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        seller_id: str,
+        args: Hashable,
+        loader: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Return the cached value, or await loader() and cache its result
+
+        Exceptions from loader propagate and nothing is cached.
+        """
+        key = (namespace, seller_id, args)
+        invalidated = self._invalidated.get((namespace, seller_id), 0)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            loaded_at, expires_at, value = entry
+            if invalidated <= loaded_at and expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self._count(namespace, "hits")
+                return value
+            del self._entries[key]
+
+        self._count(namespace, "misses")
+        started = self._clock
+        self._loading[started] = self._loading.get(started, 0) + 1
+        try:
+            value = await loader()
+        finally:
+            self._loading[started] -= 1
+            if not self._loading[started]:
+                del self._loading[started]
+
+        if self._invalidated.get((namespace, seller_id), 0) > started:
+            # Invalidated while loading: the value may predate the write
+            self._count(namespace, "discarded")
+            return value
+
+        self._entries[key] = (started, time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._count(evicted_key[0], "evictions")
+        return value
+
+    def invalidate(self, seller_id: str, *namespaces: str):
+        """Make a seller's cached responses in the given namespaces stale"""
+        for namespace in namespaces:
+            self._clock += 1
+            self._invalidated[(namespace, seller_id)] = self._clock
+            self._count(namespace, "invalidations")
+        if len(self._invalidated) >= self._prune_at:
+            self._prune()
+
+    def _prune(self):
+        """Drop expired entries, then every stamp no live entry or load predates"""
+        now = time.monotonic()
+        for key in [key for key, (_, expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+        floor = min(
+            [loaded_at for loaded_at, _, _ in self._entries.values()] + list(self._loading),
+            default=self._clock
+        )
+        self._invalidated = {pair: stamp for pair, stamp in self._invalidated.items() if stamp > floor}
+        # Amortized: the next sweep waits until the map has doubled
+        self._prune_at = max(PRUNE_MIN_STAMPS, 2 * len(self._invalidated))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per namespace plus current size"""
+        hits = sum(c["hits"] for c in self._counters.values())
+        misses = sum(c["misses"] for c in self._counters.values())
+        return {
+            "entries": len(self._entries),
+            "invalidation_stamps": len(self._invalidated),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "namespaces": {name: dict(counters) for name, counters in self._counters.items()},
+        }
+
+# Create singleton instance
+response_cache = SellerResponseCache(
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+)
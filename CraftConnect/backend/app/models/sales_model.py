@@ -1,20 +1,46 @@
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime
+from typing import Optional, Dict, Any, List
+from datetime import datetime, timedelta
 import uuid
 
-from app.cloud_services.database import get_database_client
-from app.schemas.sales import SaleRecordRequest, SaleResponse, SalesAnalyticsResponse
+from app.cloud_services.async_database import get_async_database_client
+from app.models.activity_log import activity_log
+from app.models.response_cache import response_cache, DASHBOARD, SALES_ANALYTICS
+from app.schemas.sales import SaleRecordRequest, SaleResponse, SalesAnalyticsResponse, SaleStatus
 
 logger = logging.getLogger(__name__)
 
+# timeframe -> (rollup table, bucket column, number of buckets)
+# 1y reads whole calendar months: the current one plus the 11 before it
+ANALYTICS_TIMEFRAMES = {
+    "7d": ("sales_daily", "day", 7),
+    "30d": ("sales_daily", "day", 30),
+    "90d": ("sales_daily", "day", 90),
+    "1y": ("sales_monthly", "month", 12),
+}
+
+TOP_PRODUCTS_LIMIT = 5
+
+def _analytics_buckets(timeframe: str, today: datetime) -> List[str]:
+    """Bucket keys covered by a timeframe, oldest first"""
+    _, bucket, count = ANALYTICS_TIMEFRAMES[timeframe]
+    if bucket == "day":
+        return [(today - timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(count - 1, -1, -1)]
+
+    year, month = today.year, today.month
+    months = []
+    for _ in range(count):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months[::-1]
+
 class SalesService:
     def __init__(self):
-        self.db = get_database_client()
+        self.db = get_async_database_client()
         self.collection_name = "sales"
     
     async def record_sale(self, seller_id: str, sale_data: SaleRecordRequest) -> SaleResponse:
-        """Record a new sale"""
+        """Record a new sale and fold it into the daily and monthly rollups"""
         try:
             sale_id = str(uuid.uuid4())
             now = datetime.utcnow()
@@ -23,44 +49,58 @@ class SalesService:
                 "sale_id": sale_id,
                 "seller_id": seller_id,
                 "product_id": sale_data.product_id,
+                "buyer_name": sale_data.buyer_name,
                 "buyer_email": sale_data.buyer_email,
+                "buyer_phone": sale_data.buyer_phone,
                 "amount": sale_data.amount,
                 "currency": sale_data.currency,
-                "status": "completed",
+                "quantity": sale_data.quantity,
+                "payment_method": sale_data.payment_method,
+                "status": SaleStatus.COMPLETED.value,
+                "notes": sale_data.notes,
                 "created_at": now,
                 "updated_at": now
             }
             
-            # Create sales table if not exists
-            import sqlite3
-            with sqlite3.connect(self.db.db_path) as conn:
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS sales (
-                        sale_id TEXT PRIMARY KEY,
-                        seller_id TEXT NOT NULL,
-                        product_id TEXT NOT NULL,
-                        buyer_email TEXT NOT NULL,
-                        amount REAL NOT NULL,
-                        currency TEXT NOT NULL,
-                        status TEXT NOT NULL,
-                        created_at TEXT NOT NULL,
-                        updated_at TEXT NOT NULL
-                    )
-                """)
-                
+            def _insert(conn):
                 conn.execute("""
-                    INSERT INTO sales 
-                    (sale_id, seller_id, product_id, buyer_email, amount, currency, status, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO sales
+                    (sale_id, seller_id, product_id, buyer_name, buyer_email, buyer_phone, amount, currency,
+                     quantity, payment_method, status, notes, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     sale_doc["sale_id"], sale_doc["seller_id"], sale_doc["product_id"],
-                    sale_doc["buyer_email"], sale_doc["amount"], sale_doc["currency"],
-                    sale_doc["status"], sale_doc["created_at"].isoformat(), sale_doc["updated_at"].isoformat()
+                    sale_doc["buyer_name"], sale_doc["buyer_email"], sale_doc["buyer_phone"],
+                    sale_doc["amount"], sale_doc["currency"], sale_doc["quantity"],
+                    sale_doc["payment_method"], sale_doc["status"], sale_doc["notes"],
+                    sale_doc["created_at"].isoformat(), sale_doc["updated_at"].isoformat()
                 ))
-                conn.commit()
+                
+                # Rollups are keyed by UTC day and month of created_at
+                for table, bucket, key in (
+                    ("sales_daily", "day", now.strftime("%Y-%m-%d")),
+                    ("sales_monthly", "month", now.strftime("%Y-%m")),
+                ):
+                    conn.execute(f"""
+                        INSERT INTO {table} (seller_id, currency, {bucket}, product_id, sales_count, items_sold, revenue)
+                        VALUES (?, ?, ?, ?, 1, ?, ?)
+                        ON CONFLICT (seller_id, currency, {bucket}, product_id) DO UPDATE SET
+                            sales_count = sales_count + 1,
+                            items_sold = items_sold + excluded.items_sold,
+                            revenue = revenue + excluded.revenue
+                    """, (seller_id, sale_doc["currency"], key, sale_doc["product_id"],
+                          sale_doc["quantity"], sale_doc["amount"]))
             
-            return SaleResponse(**sale_doc)
+            await self.db.run_write(_insert)
+            response_cache.invalidate(seller_id, DASHBOARD, SALES_ANALYTICS)
+            activity_log.record(
+                seller_id, "sale",
+                f"Sold {sale_doc['quantity']} for {sale_doc['amount']:.2f} {sale_doc['currency']}",
+                {"sale_id": sale_id, "product_id": sale_doc["product_id"]}
+            )
             
+            return SaleResponse(**sale_doc)
+        
         except Exception as e:
             logger.error(f"Failed to record sale: {e}", exc_info=True)
             raise
@@ -68,56 +108,142 @@ class SalesService:
     async def get_sale(self, sale_id: str, seller_id: str) -> Optional[SaleResponse]:
         """Get sale by ID with ownership verification"""
         try:
-            import sqlite3
-            with sqlite3.connect(self.db.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            def _fetch(conn):
                 cursor = conn.execute(
                     "SELECT * FROM sales WHERE sale_id = ? AND seller_id = ?",
                     (sale_id, seller_id)
                 )
-                row = cursor.fetchone()
-                if row:
-                    return SaleResponse(**dict(row))
-            return None
+                return cursor.fetchone()
             
+            row = await self.db.run_read(_fetch)
+            if row:
+                return SaleResponse(**dict(row))
+            return None
+        
         except Exception as e:
             logger.error(f"Failed to get sale: {e}", exc_info=True)
             return None
     
-    async def get_sales_analytics(self, seller_id: str, timeframe: str) -> SalesAnalyticsResponse:
-        """Get sales analytics for seller"""
+    async def get_sales_analytics(
+        self,
+        seller_id: str,
+        timeframe: str,
+        currency: Optional[str] = None
+    ) -> SalesAnalyticsResponse:
+        """
+        Get sales analytics for seller from the rollup tables
+        
+        Cost is proportional to the number of buckets in the timeframe, not
+        to the number of sales, and repeated calls are served from the
+        response cache until the seller records a sale. Amounts in
+        different currencies are never summed together: without an
+        explicit currency the seller's highest-revenue currency in the
+        window is reported.
+        
+        Args:
+            seller_id: Authenticated seller
+            timeframe: One of 7d, 30d, 90d, 1y
+            currency: 3-letter currency code to report in
+        
+        Raises:
+            ValueError: If timeframe is not supported
+        """
+        if timeframe not in ANALYTICS_TIMEFRAMES:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
+        
         try:
-            import sqlite3
-            with sqlite3.connect(self.db.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute(
-                    "SELECT * FROM sales WHERE seller_id = ?",
-                    (seller_id,)
-                )
-                sales = [dict(row) for row in cursor.fetchall()]
-            
-            total_sales = len(sales)
-            total_revenue = sum(sale["amount"] for sale in sales)
-            avg_order_value = total_revenue / total_sales if total_sales > 0 else 0
-            
-            return SalesAnalyticsResponse(
-                total_sales=total_sales,
-                total_revenue=total_revenue,
-                average_order_value=avg_order_value,
-                sales_by_status={"completed": total_sales},
-                top_products=[],
-                revenue_trend=[]
+            return await response_cache.get_or_load(
+                SALES_ANALYTICS, seller_id, (timeframe, currency),
+                lambda: self._compute_sales_analytics(seller_id, timeframe, currency)
             )
-            
         except Exception as e:
             logger.error(f"Failed to get analytics: {e}", exc_info=True)
             return SalesAnalyticsResponse(
                 total_sales=0,
                 total_revenue=0.0,
+                currency=currency or "USD",
                 average_order_value=0.0,
+                total_items_sold=0,
                 sales_by_status={},
                 top_products=[],
-                revenue_trend=[]
+                revenue_trend=[],
+                period=timeframe
             )
+    
+    async def _compute_sales_analytics(
+        self,
+        seller_id: str,
+        timeframe: str,
+        currency: Optional[str]
+    ) -> SalesAnalyticsResponse:
+        """Build the analytics response from the rollup tables"""
+        table, bucket, _ = ANALYTICS_TIMEFRAMES[timeframe]
+        buckets = _analytics_buckets(timeframe, datetime.utcnow())
+        start = buckets[0]
+        
+        def _fetch(conn):
+            report_currency = currency
+            if report_currency is None:
+                row = conn.execute(f"""
+                    SELECT currency FROM {table}
+                    WHERE seller_id = ? AND {bucket} >= ?
+                    GROUP BY currency
+                    ORDER BY SUM(revenue) DESC
+                    LIMIT 1
+                """, (seller_id, start)).fetchone()
+                report_currency = row["currency"] if row else "USD"
+            
+            trend = conn.execute(f"""
+                SELECT {bucket} AS period, SUM(sales_count) AS sales, SUM(items_sold) AS items_sold,
+                       SUM(revenue) AS revenue
+                FROM {table}
+                WHERE seller_id = ? AND currency = ? AND {bucket} >= ?
+                GROUP BY {bucket}
+            """, (seller_id, report_currency, start)).fetchall()
+            
+            top = conn.execute(f"""
+                SELECT r.product_id, p.title, SUM(r.sales_count) AS sales, SUM(r.items_sold) AS items_sold,
+                       SUM(r.revenue) AS revenue
+                FROM {table} r LEFT JOIN products p ON p.product_id = r.product_id
+                WHERE r.seller_id = ? AND r.currency = ? AND r.{bucket} >= ?
+                GROUP BY r.product_id
+                ORDER BY revenue DESC, r.product_id
+                LIMIT ?
+            """, (seller_id, report_currency, start, TOP_PRODUCTS_LIMIT)).fetchall()
+            
+            return report_currency, [dict(r) for r in trend], [dict(r) for r in top]
+        
+        report_currency, trend_rows, top_products = await self.db.run_read(_fetch)
+        
+        # Zero-fill so every bucket in the window appears in the trend
+        by_period = {row["period"]: row for row in trend_rows}
+        revenue_trend = [
+            {
+                "period": key,
+                "sales": by_period[key]["sales"] if key in by_period else 0,
+                "items_sold": by_period[key]["items_sold"] if key in by_period else 0,
+                "revenue": round(by_period[key]["revenue"], 2) if key in by_period else 0.0,
+            }
+            for key in buckets
+        ]
+        
+        total_sales = sum(point["sales"] for point in revenue_trend)
+        total_revenue = sum(row["revenue"] for row in trend_rows)
+        total_items_sold = sum(point["items_sold"] for point in revenue_trend)
+        
+        for product in top_products:
+            product["revenue"] = round(product["revenue"], 2)
+        
+        return SalesAnalyticsResponse(
+            total_sales=total_sales,
+            total_revenue=round(total_revenue, 2),
+            currency=report_currency,
+            average_order_value=round(total_revenue / total_sales, 2) if total_sales else 0.0,
+            total_items_sold=total_items_sold,
+            sales_by_status={SaleStatus.COMPLETED.value: total_sales},
+            top_products=top_products,
+            revenue_trend=revenue_trend,
+            period=timeframe
+        )
 
-sales_service = SalesService()
\ No newline at end of file
+sales_service = SalesService()
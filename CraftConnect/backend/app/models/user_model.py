@@ -4,7 +4,7 @@ from datetime import datetime
 import hashlib
 import bcrypt
 
-from app.cloud_services.database import get_database_client
+from app.cloud_services.async_database import get_async_database_client
 from app.schemas.auth import UserRegisterRequest, UserUpdateRequest, UserResponse
 
 logger = logging.getLogger(__name__)
@@ -13,7 +13,7 @@ class UserService:
     """Service layer for user management"""
     
     def __init__(self):
-        self.db = get_database_client()
+        self.db = get_async_database_client()
         self.collection_name = "users"
 
     def _generate_user_id(self, email: str) -> str:
@@ -47,7 +47,7 @@ class UserService:
             user_id = self._generate_user_id(user_data.email)
             
             # Check if user already exists
-            existing_user = self.db.get_document(self.collection_name, user_id)
+            existing_user = await self.db.get_document(self.collection_name, user_id)
             if existing_user:
                 logger.warning(f"User with email {user_data.email} already exists")
                 return None
@@ -71,7 +71,7 @@ class UserService:
             }
 
             # Save to database
-            self.db.set_document(self.collection_name, user_id, user_doc)
+            await self.db.set_document(self.collection_name, user_id, user_doc)
             
             logger.info(f"Created user: {user_id}")
             
@@ -105,7 +105,7 @@ class UserService:
         """
         try:
             user_id = self._generate_user_id(email)
-            user_data = self.db.get_document(self.collection_name, user_id)
+            user_data = await self.db.get_document(self.collection_name, user_id)
             
             if not user_data:
                 logger.warning(f"User not found: {email}")
@@ -144,7 +144,7 @@ class UserService:
             UserResponse if found, None otherwise
         """
         try:
-            user_data = self.db.get_document(self.collection_name, user_id)
+            user_data = await self.db.get_document(self.collection_name, user_id)
             
             if not user_data:
                 return None
@@ -177,7 +177,7 @@ class UserService:
             Updated UserResponse or None if not found
         """
         try:
-            user_data = self.db.get_document(self.collection_name, user_id)
+            user_data = await self.db.get_document(self.collection_name, user_id)
             
             if not user_data:
                 logger.warning(f"User not found: {user_id}")
@@ -188,10 +188,10 @@ class UserService:
             update_dict["updated_at"] = datetime.utcnow()
 
             # Update in database
-            self.db.update_document(self.collection_name, user_id, update_dict)
+            await self.db.update_document(self.collection_name, user_id, update_dict)
 
             # Get updated user
-            user_data = self.db.get_document(self.collection_name, user_id)
+            user_data = await self.db.get_document(self.collection_name, user_id)
 
             return UserResponse(
                 user_id=user_data["user_id"],
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.cloud_services.async_database import AsyncDatabase, get_async_database_client
+from app.models.activity_log import activity_row, append_activities
+from app.models.response_cache import response_cache, DASHBOARD, PRODUCT_STATS
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class ViewCounterBuffer:
+    """
+    Write-behind buffer for product view counts.
+
+    Views are aggregated per product in memory and applied as one batched
+    UPDATE transaction every flush_interval seconds, or sooner once
+    max_pending views are buffered. Readers add pending_views() to the
+    stored count so numbers stay current between flushes.
+
+    Views reach the seller's activity feed as an hourly digest: the first
+    flush of each UTC hour appends one "view" activity per product viewed
+    in the previous hour, in the same transaction as the counts, so views
+    never crowd product, like and sale events out of the recent feed.
+
+    Used from the event loop thread only.
+    """
+
+    def __init__(self, db: AsyncDatabase, flush_interval: float = 5.0, max_pending: int = 1000):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[str, int] = {}
+        self._pending_total = 0
+        # Batch being written; still counted by pending_views() until it commits
+        self._inflight: Dict[str, int] = {}
+        # Written views per product in the current hour, for the digest
+        self._hour_views: Dict[str, int] = {}
+        self._digest_hour: Optional[str] = None
+        self._wake: asyncio.Event = None
+        self._task: asyncio.Task = None
+
+    def record_view(self, product_id: str):
+        """Buffer one view of a product"""
+        self._pending[product_id] = self._pending.get(product_id, 0) + 1
+        self._pending_total += 1
+        if self._pending_total >= self.max_pending and self._wake is not None:
+            self._wake.set()
+
+    def pending_views(self, product_id: str) -> int:
+        """Views recorded for a product but not yet written"""
+        return self._pending.get(product_id, 0) + self._inflight.get(product_id, 0)
+
+    async def flush(self, final: bool = False) -> int:
+        """
+        Write all buffered views in a single transaction
+
+        Args:
+            final: Also write the digest for the hour in progress (on shutdown)
+
+        Returns:
+            Number of views written
+        """
+        hour = datetime.utcnow().strftime("%Y-%m-%dT%H")
+        if self._digest_hour is None:
+            self._digest_hour = hour
+        digest_due = (final or hour != self._digest_hour) and bool(self._hour_views)
+        if not self._pending and not digest_due:
+            self._digest_hour = hour
+            return 0
+
+        batch, self._pending = self._pending, {}
+        self._pending_total = 0
+        self._inflight = batch
+        digest, self._hour_views = (self._hour_views, {}) if digest_due else ({}, self._hour_views)
+        rows = [(count, product_id) for product_id, count in batch.items()]
+
+        try:
+            sellers = await self.db.run_write(self._apply, rows, digest)
+        except Exception as e:
+            # Put the increments back so the next flush retries them
+            logger.error(f"Failed to flush view counts: {e}", exc_info=True)
+            for product_id, count in batch.items():
+                self._pending[product_id] = self._pending.get(product_id, 0) + count
+                self._pending_total += count
+            for product_id, count in digest.items():
+                self._hour_views[product_id] = self._hour_views.get(product_id, 0) + count
+            return 0
+        finally:
+            self._inflight = {}
+
+        self._digest_hour = hour
+        for product_id, count in batch.items():
+            self._hour_views[product_id] = self._hour_views.get(product_id, 0) + count
+        for seller_id in sellers:
+            response_cache.invalidate(seller_id, DASHBOARD, PRODUCT_STATS)
+        return sum(batch.values())
+
+    @staticmethod
+    def _apply(conn, rows: List[Tuple[int, str]], digest: Dict[str, int]) -> Set[str]:
+        """Apply the increments, append the digest and return the owners of the viewed products"""
+        conn.executemany(
+            "UPDATE products SET views_count = COALESCE(views_count, 0) + ? WHERE product_id = ?",
+            rows
+        )
+
+        viewed = {product_id for _, product_id in rows}
+        product_ids = tuple(viewed | set(digest))
+        placeholders = ", ".join("?" * len(product_ids))
+        products = conn.execute(
+            f"SELECT product_id, user_id, title FROM products WHERE product_id IN ({placeholders})",
+            product_ids
+        ).fetchall()
+        append_activities(conn, [
+            activity_row(
+                user_id, "view",
+                f"{digest[product_id]} view{'s' if digest[product_id] > 1 else ''} on {title} in the last hour",
+                {"product_id": product_id, "count": digest[product_id]}
+            )
+            for product_id, user_id, title in products if product_id in digest
+        ])
+        return {user_id for product_id, user_id, _ in products if product_id in viewed}
+
+    async def _run(self):
+        """Flush on the interval or when the size threshold wakes us"""
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def start(self):
+        """Start the background flusher"""
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+            logger.info("View counter flusher started")
+
+    async def stop(self):
+        """Stop the flusher and write whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wake = None
+        written = await self.flush(final=True)
+        logger.info(f"View counter flusher stopped ({written} views flushed)")
+
+# Create singleton instance
+view_buffer = ViewCounterBuffer(
+    get_async_database_client(),
+    flush_interval=settings.VIEW_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.VIEW_FLUSH_MAX_PENDING,
+)
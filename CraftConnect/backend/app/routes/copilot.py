@@ -1,11 +1,15 @@
 import hashlib
+import logging
 from fastapi import APIRouter, UploadFile, File, HTTPException, status
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
 
-from app.cloud_services import storage, firestore_db
-from app.models import local_vision  # Using LOCAL BLIP model - no external API!
+from app.cloud_services import storage
+from app.cloud_services.copilot_cache import get_cached_analysis, set_cached_analysis
+from app.models.caption_batcher import caption_batcher  # Using LOCAL BLIP model - no external API!
+from app.models.inference_pool import InferenceQueueFull, InferenceTimeout
 from app.config.settings import settings
+from app.utils.singleflight import SingleFlight
 
 #from app.models import vertex_imagen     #vertex_imagen.py       ------- image enhancement ****
 '''    import asyncio
@@ -19,36 +23,84 @@ from app.config.settings import settings
 # ------------------------------------------------------------------------- ****
 
 router = APIRouter(prefix="/copilot", tags=["Artisan Co-pilot"])
+logger = logging.getLogger(__name__)
+
+# Identical uploads in flight at the same time share one upload and model run
+analysis_flight = SingleFlight()
 
 # --- Updated Pydantic Response Model ---
+class PaletteColor(BaseModel):
+    name: str
+    hex: str
+    share: float = Field(..., description="Fraction of the image's pixels")
+
 class ImageAnalysisResponse(BaseModel):
     gcs_uri: str
     status: str = Field(..., description="e.g., 'auto_accepted', 'needs_confirmation', 'rejected'")
     suggested_title: Optional[str] = None
     seo_tags: Optional[List[str]] = None
     suggested_materials: Optional[List[str]] = None
+    suggested_category: Optional[str] = None
     primary_colors: Optional[List[str]] = None
+    color_palette: Optional[List[PaletteColor]] = None
     estimated_dimensions_cm: Optional[str] = None
     confidence_score: float
 
-@router.post("/analyze", response_model=ImageAnalysisResponse)
-async def analyze_image(image_file: UploadFile = File(...)):
-    """Analyze image using LOCAL BLIP model (runs on your machine!)."""
-    contents = await image_file.read()
-    image_hash = hashlib.sha256(contents).hexdigest()
+async def _load_analysis(contents: bytes, image_hash: str, file_extension: str) -> dict:
+    """Cached analysis for an image, or upload (if needed), analyze and cache it"""
+    cached = await get_cached_analysis(image_hash)
+    if cached is not None:
+        return cached
 
-    file_extension = image_file.filename.split('.')[-1]
+    # Blob names are content-addressed, so an existing blob is this image
     blob_name = f"products/{image_hash}.{file_extension}"
-    gcs_uri = await storage.upload_file_async(contents, blob_name)
+    gcs_uri = await storage.find_existing_file(blob_name)
+    if not gcs_uri:
+        gcs_uri = await storage.upload_file_async(contents, blob_name)
     if not gcs_uri:
         raise HTTPException(status_code=500, detail="Failed to upload image.")
 
-    # Analyze image using LOCAL model (no external API!)
+    # Analyze image using LOCAL model (no external API!), batched with concurrent uploads
     try:
-        analysis_data = local_vision.analyze_image_locally(contents)
+        analysis_data = await caption_batcher.analyze(contents)
+    except InferenceQueueFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Image analysis is busy, please retry shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except InferenceTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Image analysis failed: {e}")
 
+    result = {**analysis_data, "gcs_uri": gcs_uri}
+    if analysis_data.get("fallback"):
+        # The model failed; let the next upload retry it
+        return result
+    try:
+        await set_cached_analysis(image_hash, result)
+    except Exception as e:
+        logger.warning(f"Failed to cache analysis for {image_hash}: {e}")
+    return result
+
+@router.post("/analyze", response_model=ImageAnalysisResponse)
+async def analyze_image(image_file: UploadFile = File(...)):
+    """
+    Analyze image using LOCAL BLIP model (runs on your machine!).
+
+    Results are cached by the image's SHA-256, so re-uploads of the same
+    photo skip both the storage upload and the model.
+    """
+    contents = await image_file.read()
+    image_hash = hashlib.sha256(contents).hexdigest()
+    file_extension = image_file.filename.split('.')[-1]
+
+    analysis_data = await analysis_flight.do(
+        image_hash, lambda: _load_analysis(contents, image_hash, file_extension)
+    )
+    gcs_uri = analysis_data["gcs_uri"]
+
     # Implement Confidence Threshold Logic
     score = analysis_data.get("confidence_score", 0.0)
     status = "rejected"  # Default to rejected
@@ -71,7 +123,9 @@ async def analyze_image(image_file: UploadFile = File(...)):
         suggested_title=analysis_data.get("suggested_title"),
         seo_tags=analysis_data.get("seo_tags"),
         suggested_materials=analysis_data.get("suggested_materials"),
+        suggested_category=analysis_data.get("suggested_category"),
         primary_colors=analysis_data.get("primary_colors"),
+        color_palette=analysis_data.get("color_palette"),
         estimated_dimensions_cm=analysis_data.get("estimated_dimensions_cm"),
         confidence_score=score,
     )
@@ -0,0 +1,74 @@
+from fastapi import APIRouter
+import logging
+
+from app.cloud_services.async_database import get_async_database_client
+from app.models.response_cache import response_cache
+from app.cloud_services.copilot_cache import copilot_cache
+from app.models.inference_pool import inference_pool
+from app.models.caption_batcher import caption_batcher
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+logger = logging.getLogger(__name__)
+
+@router.get(
+    "/db",
+    summary="Database Pool Metrics",
+    description="Queue depth, in-flight queries and wait times for the database pool"
+)
+async def get_db_metrics():
+    """
+    Report database executor metrics for sizing DB_POOL_WORKERS.
+    
+    **Key fields:**
+    - queue_depth: calls waiting for a worker thread
+    - avg_wait_ms / max_wait_ms: time spent queued before running
+    - avg_run_ms: time spent executing on a worker
+    """
+    return get_async_database_client().stats()
+
+@router.get(
+    "/cache",
+    summary="Response Cache Metrics",
+    description="Hit/miss counters for the per-seller dashboard, stats and analytics cache"
+)
+async def get_cache_metrics():
+    """
+    Report response cache effectiveness.
+    
+    **Key fields:**
+    - hits / misses / hit_rate: totals across namespaces
+    - namespaces: per-namespace hits, misses, invalidations, evictions
+    - discarded: loads dropped because a write invalidated them mid-flight
+    """
+    return response_cache.stats()
+
+@router.get(
+    "/copilot-cache",
+    summary="Co-pilot Cache Metrics",
+    description="Hit rates and sizes for the in-memory and SQLite tiers of the image analysis cache"
+)
+async def get_copilot_cache_metrics():
+    """
+    Report image analysis cache effectiveness.
+    
+    **Key fields:**
+    - memory: LRU tier hits, misses, evictions and size
+    - sqlite: hits and misses that fell through to SQLite, plus the last compaction
+    """
+    return copilot_cache.stats()
+
+@router.get(
+    "/inference",
+    summary="Inference Pool Metrics",
+    description="Queue depth, run times and load shedding for local model inference"
+)
+async def get_inference_metrics():
+    """
+    Report inference pool load for sizing INFERENCE_WORKERS and INFERENCE_MAX_QUEUE.
+    
+    **Key fields:**
+    - pending / active: admitted requests and those currently running
+    - rejected: requests shed with 503 because the queue was full
+    - timed_out: requests that exceeded INFERENCE_TIMEOUT_SECONDS
+    """
+    return {**inference_pool.stats(), "batching": caption_batcher.stats()}
@@ -5,13 +5,17 @@ import logging
 from app.schemas.product import (
     ProductCreateRequest,
     ProductUpdateRequest,
+    ProductBulkCreateRequest,
+    ProductBulkUpdateRequest,
+    ProductBulkArchiveRequest,
+    ProductBulkResponse,
     ProductResponse,
     ProductListResponse,
     ProductStatsResponse,
     ProductStatus,
     ProductCategory
 )
-from app.models.product_model import product_service
+from app.models.product_model import product_service, ProductVersionConflict
 
 router = APIRouter(prefix="/products", tags=["Products"])
 logger = logging.getLogger(__name__)
@@ -74,6 +78,154 @@ async def create_product(
             detail="Failed to create product"
         )
 
+@router.post(
+    "/bulk",
+    response_model=ProductBulkResponse,
+    summary="Bulk Create Products",
+    description="Create many product listings in one transaction. Requires authentication."
+)
+async def bulk_create_products(
+    request: ProductBulkCreateRequest,
+    user_id: str = Depends(require_auth)
+) -> ProductBulkResponse:
+    """
+    Create up to 500 products owned by the authenticated user.
+    
+    **Behavior:**
+    - Each item is validated like `POST /products`
+    - Valid items are written together in a single transaction
+    - Invalid items are skipped; `results` reports success or error per item,
+      in request order
+    """
+    return await product_service.bulk_create_products(user_id, request.items)
+
+@router.patch(
+    "/bulk",
+    response_model=ProductBulkResponse,
+    summary="Bulk Update Products",
+    description="Update many products in one transaction. Only owner can update."
+)
+async def bulk_update_products(
+    request: ProductBulkUpdateRequest,
+    user_id: str = Depends(require_auth)
+) -> ProductBulkResponse:
+    """
+    Apply partial updates to up to 500 products.
+    
+    **Behavior:**
+    - Each item carries `product_id` plus the fields to change
+    - Items that fail validation, repeat a product_id, or target a product
+      the user does not own are reported and skipped
+    - The remaining updates are written together in a single transaction
+    """
+    return await product_service.bulk_update_products(user_id, request.items)
+
+@router.post(
+    "/bulk/archive",
+    response_model=ProductBulkResponse,
+    summary="Bulk Archive Products",
+    description="Soft delete many products in one transaction. Only owner can archive."
+)
+async def bulk_archive_products(
+    request: ProductBulkArchiveRequest,
+    user_id: str = Depends(require_auth)
+) -> ProductBulkResponse:
+    """
+    Set up to 500 products to ARCHIVED.
+    
+    **Security:**
+    - Requires authentication
+    - Ownership verification per product
+    - Soft delete (data retained)
+    """
+    return await product_service.bulk_archive_products(user_id, request.product_ids)
+
+@router.get(
+    "/search",
+    response_model=ProductListResponse,
+    summary="Search Products",
+    description="Full-text search over title, description, tags, materials and story"
+)
+async def search_products(
+    user_id: Optional[str] = Depends(get_current_user_id),
+    q: str = Query(..., min_length=1, description="Search query"),
+    category: Optional[ProductCategory] = Query(None, description="Filter by category"),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor")
+) -> ProductListResponse:
+    """
+    Search for products, best matches first (BM25).
+    
+    **Search includes:**
+    - Product title
+    - Product description
+    - Product tags
+    - Materials and artisan story
+    
+    **Only PUBLIC products are searchable**
+    
+    Each result carries a `snippet` with matches wrapped in `<mark>`.
+    
+    **Pagination:**
+    - Pass next_cursor back as cursor for constant-cost deep pages
+    - page is ignored when cursor is given
+    """
+    try:
+        products, total, next_cursor = await product_service.search_products(
+            query=q,
+            category=category,
+            page=page,
+            page_size=page_size,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    await product_service.mark_liked_by(products, user_id)
+    
+    has_more = next_cursor is not None if cursor else (page * page_size) < total
+    
+    return ProductListResponse(
+        products=products,
+        total=total,
+        page=page,
+        page_size=page_size,
+        has_more=has_more,
+        next_cursor=next_cursor
+    )
+
+@router.get(
+    "/trending",
+    response_model=ProductListResponse,
+    summary="Trending Products",
+    description="Public products with the most views and likes in the last 24 hours or 7 days"
+)
+async def trending_products(
+    user_id: Optional[str] = Depends(get_current_user_id),
+    window: str = Query("24h", pattern="^(24h|7d)$", description="Time window: 24h or 7d"),
+    category: Optional[ProductCategory] = Query(None, description="Filter by category"),
+    limit: int = Query(20, ge=1, le=50, description="Number of products")
+) -> ProductListResponse:
+    """
+    Trending public products, highest score first.
+    
+    Score is views plus 5x likes received inside the window.
+    """
+    products = await product_service.trending_products(window=window, category=category, limit=limit)
+    await product_service.mark_liked_by(products, user_id)
+    
+    return ProductListResponse(
+        products=products,
+        total=len(products),
+        page=1,
+        page_size=limit,
+        has_more=False
+    )
+
 @router.get(
     "/{product_id}",
     response_model=ProductResponse,
@@ -91,6 +243,7 @@ async def get_product(
     - PUBLIC products: Anyone can view
     - PRIVATE/DRAFT products: Only owner can view
     - Increments view count (except for owner)
+    - Sets liked_by_me for authenticated users
     """
     product = await product_service.get_product(product_id, user_id)
     
@@ -100,6 +253,7 @@ async def get_product(
             detail="Product not found or access denied"
         )
     
+    await product_service.mark_liked_by([product], user_id)
     return product
 
 @router.put(
@@ -121,8 +275,19 @@ async def update_product(
     - Ownership verification
     - Partial updates supported
     - Input sanitization
+    
+    **Concurrency:**
+    - Send the `version` you last read as `expected_version`; a concurrent
+      edit in between makes this request fail with 409 instead of being
+      overwritten
     """
-    product = await product_service.update_product(product_id, user_id, update_data)
+    try:
+        product = await product_service.update_product(product_id, user_id, update_data)
+    except ProductVersionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Product was modified by another request", "current_version": e.current_version}
+        )
     
     if not product:
         raise HTTPException(
@@ -171,8 +336,12 @@ async def list_products(
     owner_id: Optional[str] = Query(None, description="Filter by owner user ID"),
     status: Optional[ProductStatus] = Query(None, description="Filter by status"),
     category: Optional[ProductCategory] = Query(None, description="Filter by category"),
+    tag: Optional[str] = Query(None, max_length=50, description="Filter by tag"),
+    material: Optional[str] = Query(None, max_length=50, description="Filter by material"),
+    color: Optional[str] = Query(None, max_length=50, description="Filter by color"),
     page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(20, ge=1, le=100, description="Items per page")
+    page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor")
 ) -> ProductListResponse:
     """
     List products with flexible filtering.
@@ -181,10 +350,14 @@ async def list_products(
     - No owner_id: Returns PUBLIC products only
     - With owner_id: Returns all products owned by that user (if requesting user is owner)
     - Status/Category filters applied as specified
+    - tag/material/color match case-insensitively and can be combined
     
     **Pagination:**
     - Max page_size: 100
     - Returns total count for pagination UI
+    - Authenticated requests get liked_by_me on every product
+    - Pass next_cursor back as cursor for constant-cost deep pages
+      (infinite scroll); page is ignored when cursor is given
     """
     # If filtering by owner and user is authenticated as that owner,
     # show all their products. Otherwise, public only.
@@ -197,22 +370,35 @@ async def list_products(
             filter_user_id = None
             status = ProductStatus.PUBLIC
     
-    products, total = await product_service.list_products(
-        user_id=filter_user_id,
-        status=status,
-        category=category,
-        page=page,
-        page_size=page_size
-    )
+    try:
+        products, total, next_cursor = await product_service.list_products(
+            user_id=filter_user_id,
+            status=status,
+            category=category,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            tag=tag,
+            material=material,
+            color=color
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,  # `status` is shadowed by the query parameter here
+            detail=str(e)
+        )
     
-    has_more = (page * page_size) < total
+    await product_service.mark_liked_by(products, user_id)
+    
+    has_more = next_cursor is not None if cursor else (page * page_size) < total
     
     return ProductListResponse(
         products=products,
         total=total,
         page=page,
         page_size=page_size,
-        has_more=has_more
+        has_more=has_more,
+        next_cursor=next_cursor
     )
 
 @router.get(
@@ -267,42 +453,3 @@ async def toggle_product_like(
         )
     
     return result
-
-@router.get(
-    "/search",
-    response_model=ProductListResponse,
-    summary="Search Products",
-    description="Search products by title, description, or tags"
-)
-async def search_products(
-    q: str = Query(..., min_length=1, description="Search query"),
-    category: Optional[ProductCategory] = Query(None, description="Filter by category"),
-    page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(20, ge=1, le=100, description="Items per page")
-) -> ProductListResponse:
-    """
-    Search for products.
-    
-    **Search includes:**
-    - Product title
-    - Product description
-    - Product tags
-    
-    **Only PUBLIC products are searchable**
-    """
-    products, total = await product_service.search_products(
-        query=q,
-        category=category,
-        page=page,
-        page_size=page_size
-    )
-    
-    has_more = (page * page_size) < total
-    
-    return ProductListResponse(
-        products=products,
-        total=total,
-        page=page,
-        page_size=page_size,
-        has_more=has_more
-    )
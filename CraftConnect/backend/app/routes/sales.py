@@ -60,32 +60,6 @@ async def record_sale(
             detail="Failed to record sale"
         )
 
-@router.get(
-    "/{sale_id}",
-    response_model=SaleResponse,
-    summary="Get Sale Details",
-    description="Get details of a specific sale"
-)
-async def get_sale(
-    sale_id: str,
-    seller_id: str = Depends(require_auth)
-) -> SaleResponse:
-    """
-    Get sale details with ownership verification.
-    
-    **Authorization:**
-    - Only seller can view their own sales
-    """
-    sale = await sales_service.get_sale(sale_id, seller_id)
-    
-    if not sale:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Sale not found or access denied"
-        )
-    
-    return sale
-
 @router.get(
     "/analytics",
     response_model=SalesAnalyticsResponse,
@@ -93,7 +67,8 @@ async def get_sale(
     description="Get aggregated sales analytics for authenticated seller"
 )
 async def get_sales_analytics(
-    timeframe: str = Query("30d", description="Time period: 7d, 30d, 90d, 1y"),
+    timeframe: str = Query("30d", pattern="^(7d|30d|90d|1y)$", description="Time period: 7d, 30d, 90d, 1y"),
+    currency: Optional[str] = Query(None, pattern="^[A-Za-z]{3}$", description="Currency to report in"),
     seller_id: str = Depends(require_auth)
 ) -> SalesAnalyticsResponse:
     """
@@ -104,10 +79,16 @@ async def get_sales_analytics(
     - Average order value
     - Sales by status
     - Top products
-    - Revenue trend over time
+    - Revenue trend over time (daily buckets; monthly for 1y)
+    
+    Served from daily/monthly rollups, so cost does not grow with the
+    number of sales. Amounts are reported in one currency: the one given,
+    or the seller's highest-revenue currency in the period.
     """
     try:
-        analytics = await sales_service.get_sales_analytics(seller_id, timeframe)
+        analytics = await sales_service.get_sales_analytics(
+            seller_id, timeframe, currency.upper() if currency else None
+        )
         return analytics
     except Exception as e:
         logger.error(f"Failed to get analytics: {e}", exc_info=True)
@@ -115,3 +96,29 @@ async def get_sales_analytics(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve analytics"
         )
+
+@router.get(
+    "/{sale_id}",
+    response_model=SaleResponse,
+    summary="Get Sale Details",
+    description="Get details of a specific sale"
+)
+async def get_sale(
+    sale_id: str,
+    seller_id: str = Depends(require_auth)
+) -> SaleResponse:
+    """
+    Get sale details with ownership verification.
+    
+    **Authorization:**
+    - Only seller can view their own sales
+    """
+    sale = await sales_service.get_sale(sale_id, seller_id)
+    
+    if not sale:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sale not found or access denied"
+        )
+    
+    return sale
@@ -5,7 +5,7 @@ from datetime import datetime
 class RecentActivity(BaseModel):
     """Recent activity item"""
     activity_id: str
-    activity_type: str = Field(..., description="Type: view, sale, like, comment")
+    activity_type: str = Field(..., description="Type: product_created, product_updated, product_archived, view, like, sale")
     description: str
     timestamp: datetime
     metadata: Optional[Dict[str, Any]] = None
@@ -1,9 +1,12 @@
 from pydantic import BaseModel, Field, validator, field_validator
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
 import re
 
+# Upper bound on items accepted by one bulk request
+BULK_MAX_ITEMS = 500
+
 class ProductStatus(str, Enum):
     """Product visibility status"""
     DRAFT = "draft"
@@ -116,6 +119,9 @@ class ProductUpdateRequest(BaseModel):
     pricing: Optional[ProductPricing] = None
     dimensions: Optional[ProductDimensions] = None
     status: Optional[ProductStatus] = None
+    expected_version: Optional[int] = Field(
+        None, ge=1, description="Reject the update with 409 unless the product is still at this version"
+    )
 
     @field_validator('title', 'description', 'story')
     @classmethod
@@ -140,6 +146,28 @@ class ProductUpdateRequest(BaseModel):
                 validated.append(cleaned)
         return validated
 
+class ProductBulkUpdateItem(ProductUpdateRequest):
+    """One entry of a bulk update: the target product plus the fields to change"""
+    product_id: str = Field(..., min_length=1, max_length=100)
+
+class ProductBulkCreateRequest(BaseModel):
+    """Request model for creating many products at once"""
+    items: List[Dict[str, Any]] = Field(
+        ..., min_length=1, max_length=BULK_MAX_ITEMS,
+        description="Product payloads, each validated like ProductCreateRequest"
+    )
+
+class ProductBulkUpdateRequest(BaseModel):
+    """Request model for updating many products at once"""
+    items: List[Dict[str, Any]] = Field(
+        ..., min_length=1, max_length=BULK_MAX_ITEMS,
+        description="Update payloads, each validated like ProductBulkUpdateItem"
+    )
+
+class ProductBulkArchiveRequest(BaseModel):
+    """Request model for archiving many products at once"""
+    product_ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
 class ProductResponse(BaseModel):
     """Response model for product data"""
     product_id: str
@@ -159,6 +187,9 @@ class ProductResponse(BaseModel):
     updated_at: datetime
     views_count: int = 0
     likes_count: int = 0
+    version: int = Field(1, description="Row version; send back as expected_version to guard edits")
+    snippet: Optional[str] = Field(None, description="Search match excerpt, HTML-escaped with <mark> highlights")
+    liked_by_me: Optional[bool] = Field(None, description="Whether the requesting user liked this product")
 
     class Config:
         json_encoders = {
@@ -172,6 +203,21 @@ class ProductListResponse(BaseModel):
     page: int
     page_size: int
     has_more: bool
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page")
+
+class BulkItemResult(BaseModel):
+    """Outcome for one item of a bulk request"""
+    index: int = Field(..., description="Position of the item in the request")
+    product_id: Optional[str] = None
+    success: bool
+    error: Optional[str] = None
+    product: Optional[ProductResponse] = None
+
+class ProductBulkResponse(BaseModel):
+    """Response model for bulk product operations"""
+    results: List[BulkItemResult]
+    succeeded: int
+    failed: int
 
 class ProductStatsResponse(BaseModel):
     """Response model for product statistics"""
@@ -0,0 +1,111 @@
+"""
+Benchmark: caption attribute extraction, nested keyword loops vs compiled trie regex.
+
+The baseline is the previous local_vision approach: material and color
+dictionaries rebuilt on every call and an `in` substring check per keyword.
+The compiled path is AttributeExtractor. The vocabulary is then padded with
+synthetic terms to show how compile time and per-caption cost grow toward
+thousands of terms.
+
+Usage (from the backend directory):
+    python scripts/bench_attribute_extractor.py --captions 2000 --sizes 1000,5000
+    python scripts/bench_attribute_extractor.py --vocabulary my_terms.tsv
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+# This setup allows the script to import from our 'app' module
+sys.path.append(os.getcwd())
+
+from app.models.attribute_extractor import AttributeExtractor, VOCABULARY_PATH, read_vocabulary
+
+SUBJECTS = ["vase", "bowl", "scarf", "necklace", "wooden spoon", "brass lantern", "statue", "painting", "handbag", "rug"]
+MODIFIERS = ["red", "blue", "golden", "dark", "white", "terracotta", "silk", "glass", "leather", "carved", "small"]
+SETTINGS = ["on a table", "on a white background", "with flowers", "next to a window", "hanging on a wall"]
+
+
+def keyword_loops(caption: str) -> dict:
+    """The pre-extractor matcher, kept here as the baseline"""
+    caption_lower = caption.lower()
+    material_keywords = {
+        "wood": ["wood", "wooden", "timber"],
+        "metal": ["metal", "steel", "iron", "aluminum", "brass"],
+        "ceramic": ["ceramic", "pottery", "clay", "porcelain"],
+        "fabric": ["fabric", "textile", "cloth", "cotton", "silk"],
+        "glass": ["glass", "crystal"],
+        "leather": ["leather"],
+        "plastic": ["plastic"],
+        "stone": ["stone", "marble", "granite"],
+        "automotive": ["car", "vehicle", "automobile", "bmw", "mercedes", "audi"]
+    }
+    color_map = {
+        "white": ["white", "ivory", "cream"],
+        "black": ["black", "dark"],
+        "red": ["red", "crimson", "scarlet"],
+        "blue": ["blue", "navy", "azure"],
+        "green": ["green", "emerald", "lime"],
+        "yellow": ["yellow", "gold", "golden"],
+        "pink": ["pink", "magenta", "rose", "cherry blossom"],
+        "purple": ["purple", "violet", "lavender"],
+        "orange": ["orange", "amber"],
+        "brown": ["brown", "tan", "beige"],
+        "gray": ["gray", "grey", "silver"],
+        "silver": ["silver", "metallic"]
+    }
+    materials = [m for m, keywords in material_keywords.items() if any(k in caption_lower for k in keywords)]
+    colors = [c for c, keywords in color_map.items() if any(k in caption_lower for k in keywords)]
+    return {"material": materials, "color": colors}
+
+
+def make_captions(count: int, rng: random.Random) -> list:
+    return [
+        f"a {rng.choice(MODIFIERS)} {rng.choice(MODIFIERS)} {rng.choice(SUBJECTS)} {rng.choice(SETTINGS)}"
+        for _ in range(count)
+    ]
+
+
+def synthetic_entries(count: int, rng: random.Random) -> list:
+    """Random lowercase words, spread over a few hundred attributes per kind"""
+    kinds = ["material", "color", "category"]
+    return [
+        (rng.choice(kinds), f"synthetic{rng.randrange(300)}",
+         "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 11))))
+        for _ in range(count)
+    ]
+
+
+def per_caption_us(fn, captions: list) -> float:
+    started = time.perf_counter()
+    for caption in captions:
+        fn(caption)
+    return (time.perf_counter() - started) / len(captions) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vocabulary", default=str(VOCABULARY_PATH))
+    parser.add_argument("--captions", type=int, default=2000)
+    parser.add_argument("--sizes", default="1000,5000", help="Extra synthetic vocabulary sizes to try")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    captions = make_captions(args.captions, rng)
+    base = read_vocabulary(args.vocabulary)
+
+    print(f"{'matcher':<32} {'terms':>6} {'compile ms':>11} {'us/caption':>11}")
+    print(f"{'keyword loops (baseline)':<32} {'-':>6} {'-':>11} {per_caption_us(keyword_loops, captions):>11.1f}")
+    for extra in [0] + [int(v) for v in args.sizes.split(",") if v]:
+        entries = base + synthetic_entries(extra, rng)
+        started = time.perf_counter()
+        extractor = AttributeExtractor(entries)
+        compile_ms = (time.perf_counter() - started) * 1000
+        label = "trie regex" + (f" (+{extra} synthetic)" if extra else "")
+        print(f"{label:<32} {len(entries):>6} {compile_ms:>11.1f} {per_caption_us(extractor.extract, captions):>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
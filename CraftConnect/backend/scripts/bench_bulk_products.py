@@ -0,0 +1,92 @@
+"""
+Benchmark: single-item product inserts vs bulk executemany transactions.
+
+Writes the same products into a throwaway database once with one
+set_document call (one transaction) per product, as POST /products does, and
+once with set_documents in batches, as POST /products/bulk does. Prints
+products/second for each.
+
+Usage (from the backend directory):
+    python scripts/bench_bulk_products.py --products 5000 --batch-size 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+# This setup allows the script to import from our 'app' module
+sys.path.append(os.getcwd())
+
+from app.cloud_services.database import SQLiteDatabase
+
+
+def make_documents(count: int) -> list:
+    """Product documents shaped like ProductService._new_product_doc output"""
+    now = datetime.utcnow()
+    return [
+        {
+            "product_id": str(uuid.uuid4()),
+            "user_id": "cooperative-1",
+            "title": f"Handwoven scarf {i}",
+            "description": "A handwoven scarf from the cooperative's spring collection.",
+            "category": "textiles",
+            "materials": ["cotton", "silk"],
+            "colors": ["indigo", "white"],
+            "tags": ["handwoven", "scarf", f"batch-{i % 20}"],
+            "story": None,
+            "images": [],
+            "pricing": {"materials_cost": 8.0, "labor_hours": 3.0},
+            "dimensions": None,
+            "status": "public",
+            "created_at": now,
+            "updated_at": now,
+            "views_count": 0,
+            "likes_count": 0,
+        }
+        for i in range(count)
+    ]
+
+
+def run(label: str, fn, count: int) -> float:
+    """Time fn() and report products/second"""
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed
+    print(f"{label:<10} {elapsed * 1000:>10.0f} ms {rate:>12,.0f} products/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        single_db = SQLiteDatabase(os.path.join(tmp, "single.db"))
+        bulk_db = SQLiteDatabase(os.path.join(tmp, "bulk.db"))
+        single_docs = make_documents(args.products)
+        bulk_docs = make_documents(args.products)
+
+        def single():
+            for doc in single_docs:
+                single_db.set_document("products", doc["product_id"], doc)
+
+        def bulk():
+            for start in range(0, len(bulk_docs), args.batch_size):
+                bulk_db.set_documents("products", bulk_docs[start:start + args.batch_size])
+
+        print(f"{args.products:,} products, batch_size={args.batch_size}")
+        before = run("single", single, args.products)
+        after = run("bulk", bulk, args.products)
+        print(f"speedup    {after / before:>26.2f}x")
+        single_db.close()
+        bulk_db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: BLIP captioning throughput vs p95 latency with micro-batching.
+
+Fires N concurrent analysis requests (each client sends its next image as
+soon as the previous one returns) through CaptionBatcher and reports
+images/second and p50/p95 latency for each concurrency level. Batch size 1
+is the unbatched baseline: one generate call per image.
+
+--simulate replaces the model with a sleep of FIXED + PER_IMAGE ms per
+batch, which exercises only the scheduler; real numbers need torch,
+transformers and the BLIP weights.
+
+Usage (from the backend directory):
+    python scripts/bench_caption_batching.py --image sample.jpg --batch-sizes 1,4,8 --concurrency 1,4,8,16
+    python scripts/bench_caption_batching.py --simulate 150,40
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+
+# This setup allows the script to import from our 'app' module
+sys.path.append(os.getcwd())
+
+from app.models.inference_pool import InferencePool
+
+
+def sample_image() -> bytes:
+    """A small synthetic JPEG for runs without --image"""
+    from PIL import Image
+    image = Image.new("RGB", (384, 384))
+    for x in range(0, 384, 32):
+        for y in range(0, 384, 32):
+            image.paste((x % 256, y % 256, (x + y) % 256), (x, y, x + 32, y + 32))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def simulated_model(fixed_ms: float, per_image_ms: float):
+    def analyze_batch(images_bytes):
+        time.sleep((fixed_ms + per_image_ms * len(images_bytes)) / 1000)
+        return [{"confidence_score": 0.75} for _ in images_bytes]
+    return analyze_batch
+
+
+async def run_level(analyze_batch, image: bytes, batch_size: int, wait_ms: float,
+                    concurrency: int, requests: int) -> tuple:
+    from app.models.caption_batcher import CaptionBatcher
+
+    pool = InferencePool(workers=1, max_queue=max(concurrency, 1) * 2, timeout=600)
+    batcher = CaptionBatcher(pool, analyze_batch, max_batch_size=batch_size, max_wait_ms=wait_ms)
+    latencies = []
+    remaining = requests
+
+    async def client():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            await batcher.analyze(image)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await batcher.stop()
+    pool.shutdown()
+
+    latencies.sort()
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    return len(latencies) / elapsed, statistics.median(latencies), p95, batcher.stats()["avg_batch_size"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--image", help="Image file to caption (default: synthetic JPEG)")
+    parser.add_argument("--batch-sizes", default="1,4,8")
+    parser.add_argument("--concurrency", default="1,4,8,16")
+    parser.add_argument("--wait-ms", type=float, default=20.0)
+    parser.add_argument("--requests", type=int, default=64, help="Requests per level")
+    parser.add_argument("--simulate", metavar="FIXED,PER_IMAGE", help="Fake model cost in ms per batch")
+    args = parser.parse_args()
+
+    image = open(args.image, "rb").read() if args.image else sample_image()
+    if args.simulate:
+        fixed_ms, per_image_ms = (float(v) for v in args.simulate.split(","))
+        analyze_batch = simulated_model(fixed_ms, per_image_ms)
+    else:
+        from app.models import local_vision
+        local_vision.load_model()
+        analyze_batch = local_vision.analyze_images_locally
+
+    print(f"{'batch':>5} {'conc':>5} {'img/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'avg batch':>10}")
+    for batch_size in (int(v) for v in args.batch_sizes.split(",")):
+        for concurrency in (int(v) for v in args.concurrency.split(",")):
+            rate, p50, p95, avg_batch = asyncio.run(
+                run_level(analyze_batch, image, batch_size, args.wait_ms, concurrency, args.requests)
+            )
+            print(f"{batch_size:>5} {concurrency:>5} {rate:>9.2f} {p50 * 1000:>9.0f} {p95 * 1000:>9.0f} {avg_batch:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
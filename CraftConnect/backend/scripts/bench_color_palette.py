@@ -0,0 +1,91 @@
+"""
+Benchmark: dominant-color extraction, per-pixel Python averages vs NumPy k-means.
+
+The baseline is the previous local_vision approach: resize to 150x150, walk
+list(getdata()) for three channel averages and map them to one coarse
+color. The palette path is color_palette.extract_palette. For each image the
+script reports milliseconds per call for both and the colors each returns.
+
+Usage (from the backend directory):
+    python scripts/bench_color_palette.py --images path/to/photos --runs 20
+    python scripts/bench_color_palette.py
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# This setup allows the script to import from our 'app' module
+sys.path.append(os.getcwd())
+
+from PIL import Image
+
+from app.models.color_palette import extract_palette
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+def average_color(image: Image.Image) -> str:
+    """The pre-NumPy extractor, kept here as the baseline"""
+    pixels = list(image.resize((150, 150)).getdata())
+    r_avg = sum(p[0] for p in pixels) // len(pixels)
+    g_avg = sum(p[1] for p in pixels) // len(pixels)
+    b_avg = sum(p[2] for p in pixels) // len(pixels)
+    if r_avg > 200 and g_avg > 200 and b_avg > 200:
+        return "white"
+    if r_avg < 50 and g_avg < 50 and b_avg < 50:
+        return "black"
+    if r_avg > g_avg and r_avg > b_avg:
+        return "red" if r_avg > 150 and g_avg < 100 else "pink"
+    if g_avg > r_avg and g_avg > b_avg:
+        return "green"
+    if b_avg > r_avg and b_avg > g_avg:
+        return "blue"
+    return "natural"
+
+
+def synthetic_images() -> dict:
+    """A product-on-backdrop scene at common upload sizes"""
+    images = {}
+    for width, height in ((640, 480), (1600, 1200), (4000, 3000)):
+        image = Image.new("RGB", (width, height), (236, 232, 224))
+        image.paste((150, 82, 45), (width // 4, height // 5, width * 3 // 4, height * 4 // 5))
+        image.paste((35, 70, 160), (width // 3, height // 3, width // 2, height // 2))
+        images[f"synthetic {width}x{height}"] = image
+    return images
+
+
+def timed(fn, image: Image.Image, runs: int) -> tuple:
+    result = fn(image)  # warm-up
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(image)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", help="Directory of product photos (default: synthetic scenes)")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.images:
+        paths = sorted(p for p in Path(args.images).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+        images = {p.name: Image.open(p).convert("RGB") for p in paths}
+    else:
+        images = synthetic_images()
+
+    print(f"{'image':<24} {'baseline ms':>12} {'palette ms':>11}  palette")
+    for name, image in images.items():
+        baseline_ms, baseline = timed(average_color, image, args.runs)
+        palette_ms, palette = timed(extract_palette, image, args.runs)
+        described = ", ".join(f"{entry['name']} {entry['share']:.0%}" for entry in palette)
+        print(f"{name:<24} {baseline_ms:>12.1f} {palette_ms:>11.1f}  {described}  (baseline: {baseline})")
+
+
+if __name__ == "__main__":
+    main()
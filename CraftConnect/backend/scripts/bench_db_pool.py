@@ -0,0 +1,119 @@
+"""
+Benchmark: connect-per-call SQLite access vs the pooled SQLiteDatabase.
+
+Runs the same product lookup workload both ways against a throwaway database
+and prints requests/second for each.
+
+Usage (from the backend directory):
+    python scripts/bench_db_pool.py --products 2000 --threads 4 --seconds 5
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+# This setup allows the script to import from our 'app' module
+sys.path.append(os.getcwd())
+
+from app.cloud_services.database import SQLiteDatabase
+
+JSON_FIELDS = ['materials', 'colors', 'tags', 'images', 'pricing', 'dimensions']
+
+
+def seed(db: SQLiteDatabase, count: int) -> list:
+    """Insert `count` products and return their IDs"""
+    product_ids = []
+    now = datetime.utcnow()
+    with db.writer():
+        for i in range(count):
+            product_id = str(uuid.uuid4())
+            db.set_document("products", product_id, {
+                "product_id": product_id,
+                "user_id": f"user-{i % 50}",
+                "title": f"Handmade item {i}",
+                "description": "A handcrafted piece made by a local artisan.",
+                "category": "pottery",
+                "materials": ["clay"],
+                "colors": ["red", "brown"],
+                "tags": ["handmade", "pottery"],
+                "images": [],
+                "pricing": {"materials_cost": 10.0, "labor_hours": 2.0},
+                "dimensions": None,
+                "status": "public",
+                "created_at": now,
+                "updated_at": now,
+            })
+            product_ids.append(product_id)
+    return product_ids
+
+
+def get_document_unpooled(db_path: str, doc_id: str):
+    """The pre-pool access path: open, query, decode, close on every call"""
+    with sqlite3.connect(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("SELECT * FROM products WHERE product_id = ?", (doc_id,)).fetchone()
+        data = dict(row)
+        for field in JSON_FIELDS:
+            if field in data and data[field]:
+                try:
+                    data[field] = json.loads(data[field])
+                except Exception:
+                    pass
+    conn.close()
+    return data
+
+
+def run(label: str, fn, product_ids: list, threads: int, seconds: float) -> float:
+    """Call fn(product_id) from `threads` threads for `seconds` and report req/s"""
+    counts = [0] * threads
+    stop = time.perf_counter() + seconds
+
+    def worker(slot: int):
+        rng = random.Random(slot)
+        n = 0
+        while time.perf_counter() < stop:
+            fn(rng.choice(product_ids))
+            n += 1
+        counts[slot] = n
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    rps = sum(counts) / seconds
+    print(f"{label:<12} {rps:>12,.0f} req/s")
+    return rps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        db = SQLiteDatabase(db_path)
+        product_ids = seed(db, args.products)
+
+        print(f"{args.products} products, {args.threads} threads, {args.seconds:.0f}s per run")
+        before = run("unpooled", lambda pid: get_document_unpooled(db_path, pid),
+                     product_ids, args.threads, args.seconds)
+        after = run("pooled", lambda pid: db.get_document("products", pid),
+                    product_ids, args.threads, args.seconds)
+        print(f"speedup      {after / before:>12.2f}x")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
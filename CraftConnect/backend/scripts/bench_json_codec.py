@@ -0,0 +1,157 @@
+"""
+Benchmark: JSON column codec for product rows.
+
+Encodes and decodes 10k product documents with the old path (recursive
+datetime walk + json.dumps, dict(row) + json.loads on every JSON field) and
+with app.cloud_services.codec, for the stdlib and orjson backends where
+available. Decoding is timed for full rows and for a listing projection.
+
+Usage (from the backend directory):
+    python scripts/bench_json_codec.py --rows 10000
+"""
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+# This setup allows the script to import from our 'app' module
+sys.path.append(os.getcwd())
+
+from app.cloud_services import codec as codec_module
+from app.cloud_services.database import JSON_FIELDS
+
+COLUMNS = [
+    "product_id", "user_id", "title", "description", "category", "materials", "colors", "tags",
+    "story", "images", "pricing", "dimensions", "status", "created_at", "updated_at",
+]
+PROJECTION = ["product_id", "title", "category", "tags", "pricing"]
+
+
+def make_documents(count: int) -> list:
+    """Product documents shaped like ProductService.create_product output"""
+    start = datetime(2024, 1, 1)
+    docs = []
+    for i in range(count):
+        created = start + timedelta(minutes=i)
+        docs.append({
+            "product_id": f"product-{i}",
+            "user_id": f"user-{i % 500}",
+            "title": f"Handmade item {i}",
+            "description": "A handcrafted piece made by a local artisan.",
+            "category": "pottery",
+            "materials": ["clay", "glaze"],
+            "colors": ["red", "brown"],
+            "tags": ["handmade", "gift", "pottery"],
+            "story": None,
+            "images": [{"url": f"/uploads/{i}.jpg", "uploaded_at": created, "is_primary": True}],
+            "pricing": {"materials_cost": 10.0, "labor_hours": 2.0, "suggested_price": 45.0},
+            "dimensions": {"length": 10.0, "width": 10.0, "height": 12.0, "unit": "cm"},
+            "status": "public",
+            "created_at": created,
+            "updated_at": created,
+        })
+    return docs
+
+
+def encode_legacy(data: dict) -> dict:
+    """The pre-codec set_document serialization"""
+    def serialize_value(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        elif isinstance(value, dict):
+            return {k: serialize_value(v) for k, v in value.items()}
+        elif isinstance(value, list):
+            return [serialize_value(item) for item in value]
+        else:
+            return value
+
+    processed = {}
+    for key, value in data.items():
+        serialized = serialize_value(value)
+        if isinstance(serialized, (list, dict)):
+            processed[key] = json.dumps(serialized)
+        else:
+            processed[key] = serialized
+    return processed
+
+
+def decode_legacy(rows: list) -> list:
+    """The pre-codec decode_document, applied per row"""
+    out = []
+    for row in rows:
+        data = dict(row)
+        for field in JSON_FIELDS:
+            if field in data and data[field]:
+                try:
+                    data[field] = json.loads(data[field])
+                except Exception:
+                    pass
+        out.append(data)
+    return out
+
+
+def load_rows(conn: sqlite3.Connection, encoded: list):
+    """Store encoded documents in an in-memory products table"""
+    conn.execute("DROP TABLE IF EXISTS products")
+    conn.execute(f"CREATE TABLE products ({', '.join(COLUMNS)})")
+    conn.executemany(
+        f"INSERT INTO products VALUES ({', '.join('?' * len(COLUMNS))})",
+        [tuple(doc[c] for c in COLUMNS) for doc in encoded],
+    )
+
+
+def measure(fn, repeat: int) -> float:
+    """Median wall time in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    docs = make_documents(args.rows)
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+
+    backends = [codec_module.StdlibJSONCodec()]
+    if codec_module.orjson is not None:
+        backends.append(codec_module.OrjsonCodec())
+
+    encoded = [encode_legacy(d) for d in docs]
+    load_rows(conn, encoded)
+    full_rows = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM products").fetchall()
+    projected_rows = conn.execute(f"SELECT {', '.join(PROJECTION)} FROM products").fetchall()
+
+    print(f"{args.rows:,} product rows, median of {args.repeat} runs")
+    print(f"{'codec':<10}{'encode ms':>12}{'decode ms':>12}{'projection ms':>16}")
+    print(f"{'legacy':<10}"
+          f"{measure(lambda: [encode_legacy(d) for d in docs], args.repeat):>12.1f}"
+          f"{measure(lambda: decode_legacy(full_rows), args.repeat):>12.1f}"
+          f"{measure(lambda: decode_legacy(projected_rows), args.repeat):>16.1f}")
+
+    for backend in backends:
+        codec_module.codec = backend
+        encode = lambda: [codec_module.encode_values(d) for d in docs]
+        decode_full = lambda: list(map(codec_module.row_decoder(COLUMNS, JSON_FIELDS), full_rows))
+        decode_projection = lambda: list(map(codec_module.row_decoder(PROJECTION, JSON_FIELDS), projected_rows))
+        print(f"{backend.name:<10}"
+              f"{measure(encode, args.repeat):>12.1f}"
+              f"{measure(decode_full, args.repeat):>12.1f}"
+              f"{measure(decode_projection, args.repeat):>16.1f}")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: product listing with Python-side vs SQL-side sorting and paging.
+
+Seeds a throwaway database with public products and times one listing page
+(count + page rows + ProductResponse construction) both ways, reporting
+p50/p99 latency for the first page and for a deep page.
+
+Usage (from the backend directory):
+    python scripts/bench_product_listing.py --products 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# This setup allows the script to import from our 'app' module
+sys.path.append(os.getcwd())
+
+from app.cloud_services.database import SQLiteDatabase
+from app.schemas.product import ProductResponse
+
+CATEGORIES = ["pottery", "textiles", "woodwork", "jewelry", "metalwork"]
+WHERE = "status = ? AND category = ?"
+PARAMS = ("public", "pottery")
+
+
+def seed(db: SQLiteDatabase, count: int):
+    """Bulk insert `count` products spread over categories and owners"""
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        created = (start + timedelta(seconds=rng.randint(0, 365 * 86400))).isoformat()
+        rows.append((
+            str(uuid.uuid4()), f"user-{i % 500}", f"Handmade item {i}",
+            "A handcrafted piece made by a local artisan.", CATEGORIES[i % len(CATEGORIES)],
+            '["clay"]', '["red", "brown"]', '["handmade", "gift"]', None, "[]",
+            '{"materials_cost": 10.0, "labor_hours": 2.0}', None,
+            "public", created, created, rng.randint(0, 500), rng.randint(0, 50),
+        ))
+    with db.writer() as conn:
+        conn.executemany(
+            """
+            INSERT INTO products
+            (product_id, user_id, title, description, category, materials, colors, tags,
+             story, images, pricing, dimensions, status, created_at, updated_at, views_count, likes_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows
+        )
+        conn.execute("ANALYZE")
+
+
+def list_python_side(db: SQLiteDatabase, page: int, page_size: int):
+    """The old list_products path: fetch everything, sort and slice in Python"""
+    all_products = db.query_collection("products", WHERE, PARAMS)
+    all_products.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+    total = len(all_products)
+    offset = (page - 1) * page_size
+    return [ProductResponse(**d) for d in all_products[offset:offset + page_size]], total
+
+
+def list_sql_side(db: SQLiteDatabase, page: int, page_size: int):
+    """The new list_products path: COUNT(*) plus ORDER BY/LIMIT/OFFSET"""
+    total = db.count_collection("products", WHERE, PARAMS)
+    rows = db.query_collection(
+        "products", WHERE, PARAMS,
+        order_by="created_at DESC", limit=page_size, offset=(page - 1) * page_size
+    )
+    return [ProductResponse(**d) for d in rows], total
+
+
+def measure(fn, iterations: int) -> tuple:
+    """Return (p50, p99) latency in milliseconds"""
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return statistics.median(samples), p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=20, help="Iterations for the Python-side path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = SQLiteDatabase(os.path.join(tmp, "bench.db"))
+        seed(db, args.products)
+        matching = db.count_collection("products", WHERE, PARAMS)
+        deep_page = max(1, matching // args.page_size // 2)
+
+        print(f"{args.products:,} products, {matching:,} matching, page_size={args.page_size}")
+        print(f"{'path':<14}{'page':>8}{'p50 ms':>12}{'p99 ms':>12}")
+        for page in (1, deep_page):
+            for label, fn, iterations in (
+                ("python-side", list_python_side, args.iterations),
+                ("sql-side", list_sql_side, args.iterations * 10),
+            ):
+                p50, p99 = measure(lambda: fn(db, page, args.page_size), iterations)
+                print(f"{label:<14}{page:>8}{p50:>12.2f}{p99:>12.2f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: API startup import time.
+
+Imports app.main in a fresh interpreter under `python -X importtime` and
+reports the wall time of the import, the slowest top-level packages by
+cumulative time, and whether any module that should load lazily (torch,
+transformers, onnxruntime by default) was pulled in at startup.
+
+With --budget-ms or --forbid the script exits non-zero when the budget is
+exceeded or a forbidden module is imported, so it can gate CI.
+
+Usage (from the backend directory):
+    python scripts/bench_startup_imports.py --runs 5 --top 15
+    python scripts/bench_startup_imports.py --budget-ms 1500 --forbid torch,transformers
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+# This setup allows the script to import from our 'app' module
+sys.path.append(os.getcwd())
+
+DEFAULT_FORBIDDEN = "torch,transformers,onnxruntime"
+
+# The child times only the import of the target module, not interpreter startup
+CHILD = "import time; started = time.perf_counter(); import {module}; print(time.perf_counter() - started)"
+
+
+def run_once(module: str) -> tuple:
+    """Import module in a fresh interpreter; return (seconds, importtime lines)"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD.format(module=module)],
+        capture_output=True, text=True, cwd=os.getcwd(),
+    )
+    if completed.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{completed.stderr.strip().splitlines()[-1]}")
+    return float(completed.stdout.strip().splitlines()[-1]), completed.stderr.splitlines()
+
+
+def parse_importtime(lines: list) -> dict:
+    """Map module name -> cumulative microseconds"""
+    cumulative = {}
+    for line in lines:
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:       self |  cumulative | package", nested modules indented
+        _, cumulative_us, name = line.split(":", 1)[1].split("|", 2)
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level packages to list")
+    parser.add_argument("--budget-ms", type=float, help="Fail when the median import time exceeds this")
+    parser.add_argument("--forbid", default=DEFAULT_FORBIDDEN, help="Comma-separated modules that must load lazily")
+    args = parser.parse_args()
+
+    timings, cumulative = [], {}
+    for _ in range(args.runs):
+        seconds, lines = run_once(args.module)
+        timings.append(seconds)
+        cumulative = parse_importtime(lines)
+
+    # A package's cumulative time is that of its outermost import
+    packages = defaultdict(int)
+    for name, micros in cumulative.items():
+        top_level = name.split(".")[0]
+        packages[top_level] = max(packages[top_level], micros)
+
+    median_ms = statistics.median(timings) * 1000
+    print(f"import {args.module}: median {median_ms:.0f} ms, min {min(timings) * 1000:.0f} ms over {args.runs} runs")
+    print(f"{'package':<28} {'cumulative ms':>14}")
+    for name, micros in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{name:<28} {micros / 1000:>14.1f}")
+
+    failed = False
+    forbidden = [name for name in args.forbid.split(",") if name and name in packages]
+    if forbidden:
+        print(f"FAIL: imported at startup: {', '.join(forbidden)}")
+        failed = True
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        print(f"FAIL: median {median_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark: BLIP inference backends (pytorch, int8, onnx).
+
+Each backend runs in its own subprocess so resident memory is measured in
+isolation. For every backend the script reports load time, RSS after
+loading and after captioning, mean and p95 latency per image, and how
+often its captions agree with the full-precision pytorch backend (exact
+match and mean word-set Jaccard similarity).
+
+Usage (from the backend directory):
+    python scripts/bench_vision_backends.py --images path/to/photos --runs 3
+    python scripts/bench_vision_backends.py --backends pytorch,int8
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# This setup allows the script to import from our 'app' module
+sys.path.append(os.getcwd())
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def load_images(directory: str) -> list:
+    from PIL import Image
+    if directory:
+        paths = sorted(p for p in Path(directory).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+        return [Image.open(p).convert("RGB") for p in paths]
+    # Synthetic fallback: flat colour swatches
+    return [Image.new("RGB", (384, 384), color) for color in ("firebrick", "navy", "goldenrod", "seagreen")]
+
+
+def worker(backend_name: str, image_dir: str, runs: int, onnx_dir: str):
+    """Measure one backend and print a JSON line for the parent"""
+    from app.models.blip_backends import load_backend
+
+    images = load_images(image_dir)
+    baseline_rss = rss_mb()
+    started = time.perf_counter()
+    backend = load_backend(backend_name, onnx_dir=onnx_dir)
+    load_seconds = time.perf_counter() - started
+    loaded_rss = rss_mb()
+
+    backend.caption(images[:1])  # warm-up
+    latencies, captions = [], []
+    for _ in range(runs):
+        captions = []
+        for image in images:
+            started = time.perf_counter()
+            captions.extend(backend.caption([image]))
+            latencies.append(time.perf_counter() - started)
+
+    latencies.sort()
+    print(json.dumps({
+        "backend": backend_name,
+        "load_s": load_seconds,
+        "rss_loaded_mb": loaded_rss - baseline_rss,
+        "rss_after_mb": rss_mb() - baseline_rss,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p95_ms": latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000,
+        "captions": captions,
+    }))
+
+
+def jaccard(a: str, b: str) -> float:
+    words_a, words_b = set(a.lower().split()), set(b.lower().split())
+    return len(words_a & words_b) / len(words_a | words_b) if words_a | words_b else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="pytorch,int8,onnx")
+    parser.add_argument("--images", help="Directory of product photos (default: synthetic swatches)")
+    parser.add_argument("--runs", type=int, default=3, help="Passes over the image set per backend")
+    parser.add_argument("--onnx-dir", default="models/blip-onnx")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.images, args.runs, args.onnx_dir)
+        return
+
+    results = {}
+    for name in args.backends.split(","):
+        command = [sys.executable, __file__, "--worker", name, "--runs", str(args.runs), "--onnx-dir", args.onnx_dir]
+        if args.images:
+            command += ["--images", args.images]
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"{name}: failed\n{completed.stderr.strip().splitlines()[-1] if completed.stderr else ''}")
+            continue
+        results[name] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    reference = results.get("pytorch", {}).get("captions")
+    print(f"{'backend':<8} {'load s':>7} {'RSS MB':>8} {'peak MB':>8} {'mean ms':>8} {'p95 ms':>8} {'exact':>6} {'jaccard':>8}")
+    for name, r in results.items():
+        if reference:
+            exact = sum(a == b for a, b in zip(r["captions"], reference)) / len(reference)
+            similarity = statistics.mean(jaccard(a, b) for a, b in zip(r["captions"], reference))
+            agreement = f"{exact:>6.0%} {similarity:>8.2f}"
+        else:
+            agreement = f"{'-':>6} {'-':>8}"
+        print(f"{name:<8} {r['load_s']:>7.1f} {r['rss_loaded_mb']:>8.0f} {r['rss_after_mb']:>8.0f} "
+              f"{r['mean_ms']:>8.0f} {r['p95_ms']:>8.0f} {agreement}")
+
+
+if __name__ == "__main__":
+    main()